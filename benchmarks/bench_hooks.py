@@ -0,0 +1,69 @@
+"""
+Measures cost of the build hooks.
+
+Builds without hooks (``none``) are compared with builds with no-op callbacks
+of all the events (``noop``). Without hooks (or with empty hooks, which are
+not passed to the engines) the build only checks that hooks are not provided:
+paths of the config nodes are not tracked and no events are created.
+The numbers are reported only, as differences of a few percent are within
+noise of a machine.
+
+Usage::
+
+    python -m benchmarks.bench_hooks --max-size 1000
+"""
+import argparse
+import time
+import timeit
+
+from benchmarks import configs
+from hydra_slayer import functional as F
+from hydra_slayer.hooks import _EVENTS, BuildHooks
+
+
+def _noop(event) -> None:
+    pass
+
+
+def _timeit(builds, number: int, repeat: int) -> list:
+    timings = [[] for _ in builds]
+    # builds are interleaved and CPU time of the process is measured, so all of them
+    #  are affected by the other processes alike, and the best of the repeats is
+    #  the least affected one
+    for _ in range(repeat):
+        for build, build_timings in zip(builds, timings):
+            build_timings.append(timeit.timeit(build, number=number, timer=time.process_time))
+    return [min(build_timings) / number for build_timings in timings]
+
+
+def main(max_size: int, number: int, repeat: int) -> None:
+    """Prints build times without hooks and with no-op callbacks of all the events."""
+    noop = BuildHooks()
+    for event in _EVENTS:
+        noop.add(event, _noop)
+
+    print(f"{'config':>8} {'size':>6} {'none, ms':>9} {'noop, ms':>9} {'overhead':>9}")
+    for name, generator in configs.GENERATORS.items():
+        for size in configs.sizes(max_size):
+            config = generator(size)
+            without_hooks, with_noop = _timeit(
+                [
+                    lambda: F.get_from_params(**config),
+                    lambda: F.get_from_params(**config, hooks=noop),
+                ],
+                number=number,
+                repeat=repeat,
+            )
+            print(
+                f"{name:>8} {size:>6} {without_hooks * 1e3:>9.3f} {with_noop * 1e3:>9.3f}"
+                f" {with_noop / without_hooks - 1:>9.1%}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-size", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    main(max_size=args.max_size, number=args.number, repeat=args.repeat)
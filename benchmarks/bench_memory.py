@@ -0,0 +1,93 @@
+"""
+Measures time and peak memory of building configs with large literal payloads.
+
+Subtrees without factories and aliases are passed by reference, so the peak
+memory of the build should not depend on the size of the payloads.
+Builds are compared with the original recursive traversal (``copy``),
+which copies every dict and list of the config,
+see :py:mod:`benchmarks.reference`.
+
+Usage::
+
+    python -m benchmarks.bench_memory --max-size 100000
+"""
+from typing import Any, Callable, Dict, Tuple
+import argparse
+import sys
+import time
+import tracemalloc
+
+from benchmarks import configs
+from benchmarks.reference import recursive_get_from_params
+from hydra_slayer import functional as F
+
+
+def _payload_size(config) -> int:
+    labels, files = config["dataset"]["labels"], config["dataset"]["files"]
+    return (
+        sys.getsizeof(labels)
+        + sys.getsizeof(files)
+        + sum(sys.getsizeof(k) for k in labels)
+        + sum(sys.getsizeof(f) for f in files)
+    )
+
+
+def _copy_get_from_params(config: Dict[str, Any]) -> Any:
+    instance, _ = recursive_get_from_params(
+        factory_key=F.DEFAULT_FACTORY_KEY,
+        get_factory_func=F.get_factory,
+        params=config,
+        shared_params={},
+        var_key=F.DEFAULT_VAR_KEY,
+        attrs_delimiter=F.DEFAULT_ATTRS_DELIMITER,
+        vars_dict={},
+    )
+    return instance
+
+
+def _measure(build: Callable[[], Any], number: int) -> Tuple[float, int]:
+    # warm up caches of the factories and signatures
+    build()
+    start = time.perf_counter()
+    for _ in range(number):
+        build()
+    elapsed = (time.perf_counter() - start) / number
+
+    tracemalloc.start()
+    try:
+        build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(max_size: int, number: int) -> None:
+    """Prints peak memory and build times of the copying and copy-on-write traversals."""
+    print(
+        f"{'size':>8} {'engine':>6} {'payload, KiB':>13} {'peak, KiB':>10}"
+        f" {'time, ms':>9} {'peak ratio':>11} {'time ratio':>11}"
+    )
+    for size in configs.sizes(max_size):
+        config = configs.payload_config(size)
+        payload = _payload_size(config) / 1024
+
+        base_time, base_peak = _measure(lambda: _copy_get_from_params(config), number)
+        elapsed, peak = _measure(lambda: F.get_from_params(**config), number)
+
+        print(
+            f"{size:>8} {'copy':>6} {payload:>13.1f} {base_peak / 1024:>10.1f}"
+            f" {base_time * 1e3:>9.3f} {'':>11} {'':>11}"
+        )
+        print(
+            f"{size:>8} {'cow':>6} {payload:>13.1f} {peak / 1024:>10.1f}"
+            f" {elapsed * 1e3:>9.3f} {peak / base_peak:>11.4f} {elapsed / base_time:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-size", type=int, default=100_000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+    main(max_size=args.max_size, number=args.number)
@@ -0,0 +1,55 @@
+"""
+Compares compiled plans with the recursive traversal (reference implementation).
+
+Usage::
+
+    python -m benchmarks.bench_plan --max-size 1000
+"""
+import argparse
+import timeit
+
+from benchmarks import configs
+from benchmarks.reference import recursive_get_from_params
+from hydra_slayer import functional as F, plan as P
+
+
+def _recursive_get_from_params(config):
+    instance, _ = recursive_get_from_params(
+        factory_key=F.DEFAULT_FACTORY_KEY,
+        get_factory_func=F.get_factory,
+        params=config,
+        shared_params={},
+        var_key=F.DEFAULT_VAR_KEY,
+        attrs_delimiter=F.DEFAULT_ATTRS_DELIMITER,
+        vars_dict={},
+    )
+    return instance
+
+
+def main(max_size: int, number: int) -> None:
+    """Prints build times of the recursive traversal and of the compiled plans."""
+    print(f"{'config':>8} {'size':>6} {'recursive, ms':>14} {'plan, ms':>9} {'speedup':>8}")
+    for name, generator in configs.GENERATORS.items():
+        for size in configs.sizes(max_size):
+            config = generator(size)
+            try:
+                plan = P.compile(config)
+                recursive = timeit.timeit(
+                    lambda: _recursive_get_from_params(config), number=number
+                )
+                compiled = timeit.timeit(plan, number=number)
+            except RecursionError:
+                print(f"{name:>8} {size:>6} {'RecursionError':>14}")
+                continue
+            print(
+                f"{name:>8} {size:>6} {recursive / number * 1e3:>14.3f}"
+                f" {compiled / number * 1e3:>9.3f} {recursive / compiled:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-size", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+    main(max_size=args.max_size, number=args.number)
@@ -0,0 +1,78 @@
+"""
+Stress test of the registry shared by several threads.
+
+Reader threads resolve factories, check names and build configs with
+``_var_`` aliases, while a writer thread keeps adding and removing factories.
+Late-add callbacks must run exactly once and the builds must never
+see aliases of the other threads.
+
+Usage::
+
+    python -m benchmarks.bench_registry_threads --max-threads 8 --duration 1
+"""
+import argparse
+import threading
+import time
+
+from benchmarks import configs
+from hydra_slayer import Registry
+
+
+def _reader(registry: Registry, index: int, stop: threading.Event, counts: list) -> None:
+    config = configs.vars_config(10)
+    count = 0
+    while not stop.is_set():
+        assert registry.get("Node") is configs.Node and "Node" in registry
+        with registry.vars_scope():
+            res = registry.get_from_params(**config, shared_params={"thread": index})
+        assert res["node_0"].params["parent"].params["thread"] == index
+        count += 1
+    counts[index] = count
+
+
+def _writer(registry: Registry, stop: threading.Event) -> None:
+    i = 0
+    while not stop.is_set():
+        registry.add(configs.Node, name=f"Node_{i}")
+        del registry[f"Node_{i}"]
+        i += 1
+
+
+def main(max_threads: int, duration: float) -> None:
+    """Prints throughput of the builds and number of the late-add calls by threads."""
+    print(f"{'threads':>8} {'builds/s':>10} {'late-add calls':>15}")
+    num_threads = 1
+    while num_threads <= max_threads:
+        late_add_calls = []
+
+        def _late_add(registry: Registry) -> None:
+            late_add_calls.append(1)
+            time.sleep(0.01)
+            registry.add(configs.Node)
+
+        registry = Registry()
+        registry.late_add(_late_add)
+
+        stop, counts = threading.Event(), [0] * num_threads
+        threads = [
+            threading.Thread(target=_reader, args=(registry, i, stop, counts))
+            for i in range(num_threads)
+        ]
+        threads.append(threading.Thread(target=_writer, args=(registry, stop)))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        print(f"{num_threads:>8} {sum(counts) / duration:>10.0f} {len(late_add_calls):>15}")
+        num_threads *= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=1.0)
+    args = parser.parse_args()
+    main(max_threads=args.max_threads, duration=args.duration)
@@ -0,0 +1,211 @@
+"""
+Benchmark suite of the hot paths, timed by the public entry points
+of the library: factory resolution (``get_factory``), var params extraction
+(``get_instance``), meta factory calls (``metafactory_factory``)
+and config traversals (``get_from_params``).
+
+Every case is run at growing sizes (number of names, params or config nodes)
+and reports time of the run, throughput (items per second), peak memory
+and scaling exponent relative to the previous size (``1.0`` is linear).
+Results can be saved as a baseline and compared with it later, the script
+exits with non-zero code if time or peak memory of any case exceeds
+the baseline by more than the tolerance. Times are compared relative
+to the time of pure python calibration code measured along with every case,
+so the baseline can be compared with the runs on other machines. Relative
+times of the same tree vary by about 10% between runs, so the default
+tolerance is 30%.
+
+``benchmarks/baseline.json`` stores the results of the default run
+(``--max-size 1000``) of the current version of the library.
+
+Usage::
+
+    python -m benchmarks.bench_suite --baseline benchmarks/baseline.json --tolerance 0.3
+    python -m benchmarks.bench_suite --max-size 1000 --save benchmarks/baseline.json
+"""
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+
+from benchmarks import configs
+from hydra_slayer import functional as F, metafactory_factory
+
+# peak memory of small cases varies by a few allocations between runs
+MEMORY_SLACK = 1024
+# time (in seconds) of the shorter measurements depends on the noise too much
+MIN_MEASURE_TIME = 0.02
+
+_NAMES = ("benchmarks.configs.Node", "int", "collections.OrderedDict", "functools.partial")
+
+
+def _get_factory_case(size: int) -> Callable[[], Any]:
+    names = [_NAMES[i % len(_NAMES)] for i in range(size)]
+    return lambda: [F.get_factory(name) for name in names]
+
+
+def _get_instance_case(size: int) -> Callable[[], Any]:
+    # ``*children`` and ``**params`` are passed by names and extracted from the kwargs
+    children, params = list(range(size)), {f"param_{i}": i for i in range(size)}
+    return lambda: F.get_instance(configs.Node, children=children, params=params)
+
+
+def _metafactory_case(size: int) -> Callable[[], Any]:
+    args = tuple(range(size))
+    kwargs = {"_mode_": "call", **{f"param_{i}": i for i in range(size)}}
+    return lambda: metafactory_factory(configs.Node, args, kwargs)
+
+
+def _cases(max_size: int) -> Iterator[Tuple[str, int, Callable[[], Any]]]:
+    """Yields name, size and function to run of the cases."""
+    for name, make_case in (
+        ("get_factory", _get_factory_case),
+        ("get_instance", _get_instance_case),
+        ("metafactory", _metafactory_case),
+    ):
+        for size in configs.sizes(max_size):
+            yield name, size, make_case(size)
+
+    generators = {k: (lambda size, g=g: (g(size), {})) for k, g in configs.GENERATORS.items()}
+    generators["shared"] = configs.shared_params_config
+    for config_name, generator in generators.items():
+        for size in configs.sizes(max_size):
+            config, shared_params = generator(size)
+            yield (
+                f"get_from_params/{config_name}",
+                size,
+                lambda c=config, s=shared_params: F.get_from_params(**c, shared_params=s),
+            )
+
+
+def _calibration() -> Any:
+    # pure python work (calls, allocations, dict and string operations)
+    #  which doesn't depend on the library
+    return sorted({str(i): [i] for i in range(1000)}.items())
+
+
+def _timeit(func: Callable[[], Any], number: int) -> float:
+    return timeit.timeit(func, number=number, timer=time.process_time) / number
+
+
+def _autorange(func: Callable[[], Any], number: int) -> int:
+    """Returns number of the runs (at least ``number``) which take at least the minimal time."""
+    while _timeit(func, number=number) * number < MIN_MEASURE_TIME:
+        number *= 2
+    return number
+
+
+def _measure(func: Callable[[], Any], number: int, repeat: int) -> Dict[str, float]:
+    # the case and the calibration are interleaved, so both of them are affected
+    #  by the other processes and by the speed of the machine alike
+    number, calibration_number = _autorange(func, number), _autorange(_calibration, number)
+    timings, relative_timings = [], []
+    for _ in range(repeat):
+        elapsed = _timeit(func, number=number)
+        timings.append(elapsed)
+        relative_timings.append(elapsed / _timeit(_calibration, number=calibration_number))
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # the best of the repeats is the least affected by the other processes,
+    #  but the ratio to the adjacent calibration is more stable in the middle
+    return {
+        "time": min(timings),
+        "relative_time": statistics.median(relative_timings),
+        "peak": peak,
+    }
+
+
+def _check(
+    result: Dict[str, float], baseline: Optional[Dict[str, float]], tolerance: float
+) -> str:
+    if baseline is None:
+        return "new"
+    # times of the runs on different machines (or under different load)
+    #  are compared relative to the time of the calibration
+    slowdown = result["relative_time"] / baseline["relative_time"] - 1
+    if slowdown > tolerance:
+        return f"SLOWER {slowdown:+.0%}"
+    if result["peak"] > baseline["peak"] * (1 + tolerance) + MEMORY_SLACK:
+        return f"MEMORY {result['peak'] / max(baseline['peak'], 1) - 1:+.0%}"
+    return "ok"
+
+
+def main(
+    max_size: int,
+    number: int,
+    repeat: int,
+    baseline_path: Optional[str],
+    save_path: Optional[str],
+    tolerance: float,
+) -> int:
+    """Prints results of the cases, compares them with the baseline and saves them."""
+    baseline = {}
+    if baseline_path is not None:
+        with open(baseline_path) as stream:
+            baseline = json.load(stream)
+
+    print(
+        f"{'case':>22} {'size':>6} {'time, ms':>10} {'items/s':>11}"
+        f" {'peak, KiB':>10} {'scaling':>8}  baseline"
+    )
+    results, previous, failed = {}, {}, False
+    for name, size, func in _cases(max_size):
+        try:
+            result = _measure(func, number=number, repeat=repeat)
+        except RecursionError:
+            print(f"{name:>22} {size:>6} {'RecursionError':>10}")
+            continue
+        key = f"{name}/{size}"
+        results[key] = result
+
+        scaling = "-"
+        if name in previous:
+            prev_size, prev_time = previous[name]
+            scaling = f"{math.log(result['time'] / prev_time) / math.log(size / prev_size):.2f}"
+        previous[name] = size, result["time"]
+
+        status = _check(result, baseline.get(key), tolerance) if baseline else "-"
+        failed = failed or status not in ("ok", "new", "-")
+        print(
+            f"{name:>22} {size:>6} {result['time'] * 1e3:>10.3f} {size / result['time']:>11.0f}"
+            f" {result['peak'] / 1024:>10.1f} {scaling:>8}  {status}"
+        )
+
+    if save_path is not None:
+        with open(save_path, "w") as stream:
+            json.dump(results, stream, indent=2, sort_keys=True)
+    if failed:
+        print(f"Some cases regressed by more than {tolerance:.0%} relative to the baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-size", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--baseline", type=str, default=None, help="results to compare with")
+    parser.add_argument("--save", type=str, default=None, help="where to save the results")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    args = parser.parse_args()
+    sys.exit(
+        main(
+            max_size=args.max_size,
+            number=args.number,
+            repeat=args.repeat,
+            baseline_path=args.baseline,
+            save_path=args.save,
+            tolerance=args.tolerance,
+        )
+    )
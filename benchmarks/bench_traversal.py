@@ -0,0 +1,53 @@
+"""
+Compares iterative (explicit stack) and recursive config traversals.
+
+Usage::
+
+    python -m benchmarks.bench_traversal --max-size 10000
+"""
+import argparse
+import timeit
+
+from benchmarks import configs
+from benchmarks.reference import recursive_get_from_params
+from hydra_slayer import functional as F
+
+
+def _build(engine, config):
+    instance, _ = engine(
+        factory_key=F.DEFAULT_FACTORY_KEY,
+        get_factory_func=F.get_factory,
+        params=config,
+        shared_params={},
+        var_key=F.DEFAULT_VAR_KEY,
+        attrs_delimiter=F.DEFAULT_ATTRS_DELIMITER,
+        vars_dict={},
+    )
+    return instance
+
+
+def _timeit(engine, config, number: int) -> str:
+    try:
+        elapsed = timeit.timeit(lambda: _build(engine, config), number=number)
+    except RecursionError:
+        return "RecursionError"
+    return f"{elapsed / number * 1e3:.3f}"
+
+
+def main(max_size: int, number: int) -> None:
+    """Prints build times of the recursive and iterative traversals."""
+    print(f"{'config':>8} {'size':>6} {'recursive, ms':>15} {'iterative, ms':>14}")
+    for name, generator in configs.GENERATORS.items():
+        for size in configs.sizes(max_size):
+            config = generator(size)
+            recursive = _timeit(recursive_get_from_params, config, number=number)
+            iterative = _timeit(F._iterative_get_from_params, config, number=number)
+            print(f"{name:>8} {size:>6} {recursive:>15} {iterative:>14}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-size", type=int, default=10000)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+    main(max_size=args.max_size, number=args.number)
@@ -0,0 +1,77 @@
+"""Synthetic configs and cheap factories for the benchmarks."""
+from typing import Any, Dict, List, Tuple
+
+
+class Node:
+    """Cheap factory to instantiate in benchmarks."""
+
+    def __init__(self, *children: Any, **params: Any):
+        self.children = children
+        self.params = params
+
+
+def node(**params: Any) -> Dict[str, Any]:
+    """Returns config of the :py:class:`Node` called with ``params``."""
+    return {"_target_": "benchmarks.configs.Node", "_mode_": "call", **params}
+
+
+def wide_config(size: int) -> Dict[str, Any]:
+    """Config with ``size`` independent nodes at the top level."""
+    return {f"node_{i}": node(index=i, lr=0.1, name=f"node_{i}") for i in range(size)}
+
+
+def deep_config(size: int) -> Dict[str, Any]:
+    """Config with ``size`` nested nodes."""
+    config = node(index=0)
+    for i in range(1, size):
+        config = node(index=i, child=config)
+    return {"model": config}
+
+
+def list_config(size: int) -> Dict[str, Any]:
+    """Config with list of ``size`` nodes passed as ``*args``."""
+    return {"model": node(children=[node(index=i) for i in range(size)])}
+
+
+def vars_config(size: int) -> Dict[str, Any]:
+    """Config with ``size`` nodes referencing the aliased node."""
+    config = {"shared": node(_var_="shared", index=-1)}
+    config.update({f"node_{i}": node(index=i, parent={"_var_": "shared"}) for i in range(size)})
+    return config
+
+
+def payload_config(size: int) -> Dict[str, Any]:
+    """Config with label map and list of file paths of ``size`` entries each."""
+    labels = {f"label_{i}": i for i in range(size)}
+    files = [f"data/images/{i:08d}.jpg" for i in range(size)]
+    return {
+        "dataset": node(labels=labels, files=files),
+        "meta": {"labels": labels, "splits": {"train": files, "valid": files[: size // 10]}},
+    }
+
+
+SHARED_PARAMS_SIZE = 32
+
+
+def shared_params_config(size: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Config with ``size`` nodes and ``shared_params`` passed to every one of them."""
+    config = {f"node_{i}": node(index=i) for i in range(size)}
+    shared_params = {f"param_{i}": i for i in range(SHARED_PARAMS_SIZE)}
+    return config, shared_params
+
+
+GENERATORS = {
+    "wide": wide_config,
+    "deep": deep_config,
+    "list": list_config,
+    "vars": vars_config,
+}
+
+
+def sizes(max_size: int) -> List[int]:
+    """Returns growing sizes up to ``max_size``."""
+    result, size = [], 10
+    while size <= max_size:
+        result.append(size)
+        size *= 10
+    return result
@@ -0,0 +1,143 @@
+"""
+Reference implementation of the config traversal: the original recursive
+traversal of the library, before copy-on-write and iterative traversals.
+
+Every dict and list of the config is copied and every node is built
+by a nested call, so it is limited by the recursion depth. The library
+must create the same objects in the same order.
+"""
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
+import copy
+import inspect
+import warnings
+
+from hydra_slayer.factory import metafactory_factory
+
+
+def _extract_positional_keyword_vars(func: Callable, kwargs: Dict) -> Tuple[Iterable, Dict]:
+    # make a copy of kwargs since we don't want to modify them directly
+    kwargs = copy.copy(kwargs)
+
+    try:
+        signature = inspect.signature(func)
+        type2param = {p.kind: name for name, p in signature.parameters.items()}
+    except ValueError:
+        type2param = {}
+        warnings.warn(
+            f"No signature found for `{func}`, *args and **kwargs arguments cannot be extracted"
+        )
+
+    var_kwarg = kwargs.pop(type2param.get(inspect.Parameter.VAR_KEYWORD), {})
+    kwargs.update(var_kwarg)
+
+    args = kwargs.pop(type2param.get(inspect.Parameter.VAR_POSITIONAL), ())
+
+    return args, kwargs
+
+
+def _get_instance(factory_key: str, get_factory_func: Callable, kwargs: Dict) -> Any:
+    name = kwargs.pop(factory_key)
+    factory = get_factory_func(name)
+
+    args, kwargs = _extract_positional_keyword_vars(factory, kwargs=kwargs)
+
+    try:
+        instance = metafactory_factory(factory=factory, args=args, kwargs=kwargs)
+        return instance
+    except Exception as e:
+        raise RuntimeError(f"Factory '{name}' call failed: args={args} kwargs={kwargs}") from e
+
+
+def _get_from_params(
+    factory_key: str,
+    get_factory_func: Callable,
+    params: Dict[str, Any],
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    vars_dict: Dict[str, Any],
+) -> Tuple[Any, Dict[str, Any]]:
+    # use additional dict to handle 'multiple values for keyword argument'
+    kwargs = {**shared_params, **params}
+
+    params.pop(var_key, None)
+
+    alias = kwargs.pop(var_key, "")
+    alias, attribute_name = (
+        alias.split(attrs_delimiter) if attrs_delimiter in alias else (alias, None)
+    )
+
+    if alias and alias in vars_dict:
+        if factory_key in kwargs:
+            raise ValueError(
+                f"`{factory_key}` and `{var_key}` (in get mode) keywords are exclusive"
+            )
+
+        obj = vars_dict[alias]
+        if attribute_name is not None:
+            obj_or_callable = getattr(obj, attribute_name)
+            if callable(obj_or_callable):
+                args, kwargs = _extract_positional_keyword_vars(obj_or_callable, kwargs=kwargs)
+                obj = obj_or_callable(*args, **kwargs)
+            else:
+                obj = obj_or_callable
+    elif factory_key in kwargs:
+        obj = _get_instance(
+            factory_key=factory_key, get_factory_func=get_factory_func, kwargs=kwargs
+        )
+    else:
+        obj = params
+
+    if alias and alias not in vars_dict:
+        vars_dict[alias] = obj
+
+    return obj, vars_dict
+
+
+def recursive_get_from_params(
+    factory_key: str,
+    get_factory_func: Callable,
+    params: Union[Dict[str, Any], Any],
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    vars_dict: Dict[str, Any],
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Builds the config recursively, copies every dict and list of the config.
+
+    Args:
+        factory_key: key to extract factory name from
+        get_factory_func: function that returns factory by its name
+        params: config to build
+        shared_params: params to pass on all levels of the config
+        var_key: key to define and reference the objects by alias
+        attrs_delimiter: delimiter of the alias and attribute of the object
+        vars_dict: storage of the aliases
+
+    Returns:
+        built config and storage of the aliases
+    """
+    if not isinstance(params, (dict, list)):
+        return params, vars_dict
+
+    # make a copy of params since we don't want to modify them directly
+    params = copy.copy(params)
+    common_params = {
+        "factory_key": factory_key,
+        "get_factory_func": get_factory_func,
+        "shared_params": shared_params,
+        "var_key": var_key,
+        "attrs_delimiter": attrs_delimiter,
+    }
+
+    view = params.items() if isinstance(params, dict) else enumerate(params)
+    for key, param in view:
+        params[key], vars_dict = recursive_get_from_params(
+            params=param, vars_dict=vars_dict, **common_params
+        )
+
+    if isinstance(params, dict):
+        instance, vars_dict = _get_from_params(params=params, vars_dict=vars_dict, **common_params)
+        return instance, vars_dict
+    return params, vars_dict
@@ -5,5 +5,24 @@ from hydra_slayer.factory import (
     metafactory_factory,
     partial_meta_factory,
 )
-from hydra_slayer.functional import get_factory, get_from_params, get_instance
+from hydra_slayer.functional import (
+    aget_from_params,
+    clear_factory_cache,
+    factory_cache_info,
+    get_factory,
+    get_from_params,
+    get_instance,
+    iter_from_params,
+)
+from hydra_slayer.hooks import BuildEvent, BuildHooks
+from hydra_slayer.imports import import_report, ImportReport
+from hydra_slayer.incremental import build_graph, BuildGraph, rebuild
+from hydra_slayer.lazy import LazyProxy, materialize
+from hydra_slayer.memo import BuildMemo
+from hydra_slayer.memory import MemoryTracker
+from hydra_slayer.module_index import ModuleIndex
+from hydra_slayer.plan import Plan
+from hydra_slayer.profiler import BuildProfiler
 from hydra_slayer.registry import Registry
+from hydra_slayer.scope import ScopeCache
+from hydra_slayer.variables import VarStore
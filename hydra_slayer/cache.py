@@ -0,0 +1,141 @@
+from typing import Any, Callable, Optional, Tuple
+from collections import namedtuple, OrderedDict
+import sys
+import threading
+
+__all__ = ["CacheInfo", "ResolutionCache"]
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_NOT_FOUND = object()
+
+
+def _find_owner_module(name: str) -> Tuple[str, Tuple[str, ...]]:
+    """Returns the longest imported module prefix of ``name`` and the rest as attributes."""
+    parts = name.split(".")
+    for n in range(len(parts), 0, -1):
+        module_name = ".".join(parts[:n])
+        if module_name in sys.modules:
+            return module_name, tuple(parts[n:])
+    return "builtins", tuple(parts)
+
+
+def _get_attribute(obj: Any, attrs: Tuple[str, ...]) -> Any:
+    for attr in attrs:
+        obj = getattr(obj, attr, _NOT_FOUND)
+        if obj is _NOT_FOUND:
+            break
+    return obj
+
+
+def _is_same(obj: Any, other: Any) -> bool:
+    # bound methods are created on every attribute access, but are equal
+    try:
+        return obj is other or bool(obj == other)
+    except Exception:
+        return False
+
+
+class ResolutionCache:
+    """
+    Bounded LRU cache of ``dotted path -> object`` lookups.
+
+    Lookups remember the longest imported module prefix of the name
+    and are revalidated on every hit. Successful lookups are discarded if
+    the module was removed from (or replaced in) ``sys.modules`` or the object
+    was replaced in the module (e.g. by ``mock.patch``). Failed lookups are
+    cached as well (negative caching) and discarded if a longer prefix
+    of the name was imported, the module was replaced or the object was added
+    to the module, as the name can be resolvable now.
+
+    Note:
+        Failed lookups are not discarded if a module was created (or made
+        importable) without importing it, so :py:meth:`clear` must be called
+        after that to resolve its names.
+
+    Args:
+        maxsize: maximum number of entries to store, ``0`` disables caching
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _lookup(self, name: str) -> Any:
+        entry = self._cache.get(name, None)
+        if entry is None:
+            return _NOT_FOUND, False
+
+        obj, module_name, module, attrs = entry
+        if (
+            sys.modules.get(module_name) is not module
+            or (attrs is not None and not _is_same(_get_attribute(module, attrs), obj))
+            or (obj is _NOT_FOUND and _find_owner_module(name)[0] != module_name)
+        ):
+            # the module was reloaded or removed or the object was replaced (or added),
+            #  or a submodule was imported, the entry is stale
+            del self._cache[name]
+            return _NOT_FOUND, False
+
+        self._cache.move_to_end(name)
+        return obj, True
+
+    def get(self, name: str, resolve: Callable[[str], Any]) -> Optional[Any]:
+        """
+        Returns an object by its dotted path, resolves and caches it on a miss.
+
+        Args:
+            name: dotted path to the object
+            resolve: function to resolve the object on a cache miss,
+                must return ``None`` (or any falsy value) if nothing was found
+
+        Returns:
+            resolved object or ``None`` if the name cannot be resolved
+        """
+        if self.maxsize <= 0:
+            self._misses += 1
+            return resolve(name) or None
+
+        with self._lock:
+            obj, found = self._lookup(name)
+            if found:
+                self._hits += 1
+                return None if obj is _NOT_FOUND else obj
+            self._misses += 1
+
+        # resolve outside of the lock as it may import arbitrary modules
+        obj = resolve(name) or _NOT_FOUND
+        module_name, attrs = _find_owner_module(name)
+        module = sys.modules.get(module_name)
+        if not _is_same(_get_attribute(module, attrs), obj):
+            # the object is not an attribute of the module (e.g. custom resolver), don't check it
+            attrs = None
+
+        with self._lock:
+            self._cache[name] = (obj, module_name, module, attrs)
+            self._cache.move_to_end(name)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return None if obj is _NOT_FOUND else obj
+
+    def clear(self) -> None:
+        """Removes all entries and resets statistics."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """Returns hit/miss statistics of the cache."""
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._cache))
+
+    def __contains__(self, name: str) -> bool:
+        """Checks if a lookup result for the ``name`` is cached."""
+        return name in self._cache
+
+    def __len__(self) -> int:
+        """Returns number of cached lookups."""
+        return len(self._cache)
@@ -1,7 +1,7 @@
 from typing import Any, Callable, Mapping, Tuple, Type, Union
 import copy
 import functools
-import inspect
+import types
 
 __all__ = [
     "metafactory_factory",
@@ -61,10 +61,12 @@ def metafactory_factory(factory: Factory, args: Tuple, kwargs: Mapping):
         >>> hex_to_dec('2A')
         42
     """
-    # make a copy of kwargs since we don't want to modify them directly
-    kwargs = copy.copy(kwargs)
-    meta_factory = kwargs.pop(DEFAULT_META_FACTORY_KEY, None)
-    meta_factory_name = kwargs.pop(DEFAULT_CALL_MODE_KEY, "auto")
+    meta_factory, meta_factory_name = None, "auto"
+    if DEFAULT_META_FACTORY_KEY in kwargs or DEFAULT_CALL_MODE_KEY in kwargs:
+        # make a copy of kwargs since we don't want to modify them directly
+        kwargs = copy.copy(kwargs)
+        meta_factory = kwargs.pop(DEFAULT_META_FACTORY_KEY, None)
+        meta_factory_name = kwargs.pop(DEFAULT_CALL_MODE_KEY, "auto")
 
     # legacy, for the compatibility with the Catalyst library
     if hasattr(factory, DEFAULT_FROM_PARAMS_KEY):
@@ -156,9 +158,11 @@ def default_meta_factory(factory: Factory, args: Tuple, kwargs: Mapping):
         >>> get_answer_to_life()
         42
     """
-    if inspect.isclass(factory):
+    # same as `inspect.isclass`, `inspect.ismethod` and `inspect.isfunction`,
+    # but without importing `inspect`
+    if isinstance(factory, type):
         obj = call_meta_factory(factory, args, kwargs)
-    elif inspect.ismethod(factory) or inspect.isfunction(factory):
+    elif isinstance(factory, (types.MethodType, types.FunctionType)):
         obj = partial_meta_factory(factory, args, kwargs)
     else:
         raise ValueError(f"factory '{factory}' is not callable")
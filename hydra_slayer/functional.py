@@ -1,18 +1,74 @@
-from typing import Any, Callable, Dict, Iterable, Optional, Tuple, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+)
+import contextlib
 import copy
-import inspect
-import pydoc
+import functools
+import sys
+import types
 import warnings
+import weakref
 
+from hydra_slayer.cache import CacheInfo, ResolutionCache
 from hydra_slayer.factory import Factory, metafactory_factory
-
-__all__ = ["get_factory", "get_instance", "get_from_params"]
+from hydra_slayer.hooks import BuildHooks, ON_VAR_STORE
+from hydra_slayer.lazy import LazyProxy
+from hydra_slayer.memo import BuildMemo
+from hydra_slayer.resolver import locate
+from hydra_slayer.scope import _NOT_FOUND, DEFAULT_SCOPE_KEY, ScopeCache
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from hydra_slayer.memory import MemoryTracker
+    from hydra_slayer.profiler import BuildProfiler
+
+__all__ = [
+    "get_factory",
+    "get_instance",
+    "get_from_params",
+    "iter_from_params",
+    "aget_from_params",
+    "factory_cache_info",
+    "clear_factory_cache",
+]
 
 T = TypeVar("T")
 
 DEFAULT_FACTORY_KEY = "_target_"
 DEFAULT_VAR_KEY = "_var_"
 DEFAULT_ATTRS_DELIMITER = "."
+DEFAULT_LAZY_KEY = "_lazy_"
+DEFAULT_FACTORY_CACHE_SIZE = 1024
+
+_SINGLE_OBJECT_ERROR = (
+    "Config with top-level `{factory_key}` or `{var_key}` can't be built by parts,"
+    " use `get_from_params` instead"
+)
+
+_NOT_MEMOIZED = object()
+
+_factory_cache = ResolutionCache(maxsize=DEFAULT_FACTORY_CACHE_SIZE)
+# factory -> names of its var-positional and var-keyword parameters,
+# weak keys let factories defined at runtime to be garbage collected
+_var_params_cache = weakref.WeakKeyDictionary()
+
+
+def _join_path(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
 
 
 def _extract_factory_name_arg(
@@ -27,9 +83,18 @@ def _extract_factory_name_arg(
     return factory_name, args, kwargs
 
 
-def _extract_positional_keyword_vars(func: Callable, kwargs: Dict) -> Tuple[Iterable, Dict]:
-    # make a copy of kwargs since we don't want to modify them directly
-    kwargs = copy.copy(kwargs)
+def _get_caller_stacklevel() -> int:
+    """Returns ``stacklevel`` of the first frame outside of the library for the warnings."""
+    # level 1 is the function which calls `warnings.warn()`
+    frame, level = sys._getframe(1), 1
+    while frame is not None and frame.f_globals.get("__name__", "").startswith("hydra_slayer"):
+        frame, level = frame.f_back, level + 1
+    return level
+
+
+def _inspect_var_params(func: Callable) -> Tuple[Optional[str], Optional[str]]:
+    # `inspect` is heavy to import, so postpone it until the first instantiation
+    import inspect
 
     try:
         signature = inspect.signature(func)
@@ -37,13 +102,48 @@ def _extract_positional_keyword_vars(func: Callable, kwargs: Dict) -> Tuple[Iter
     except ValueError:
         type2param = {}
         warnings.warn(
-            f"No signature found for `{func}`, *args and **kwargs arguments cannot be extracted"
+            f"No signature found for `{func}`, *args and **kwargs arguments cannot be extracted",
+            stacklevel=_get_caller_stacklevel(),
         )
 
-    var_kwarg = kwargs.pop(type2param.get(inspect.Parameter.VAR_KEYWORD), {})
+    return (
+        type2param.get(inspect.Parameter.VAR_POSITIONAL),
+        type2param.get(inspect.Parameter.VAR_KEYWORD),
+    )
+
+
+def _get_var_params(func: Callable) -> Tuple[Optional[str], Optional[str]]:
+    # bound methods are created on every attribute access,
+    #  but share the parameters with the underlying function
+    key = func.__func__ if isinstance(func, types.MethodType) else func
+
+    try:
+        return _var_params_cache[key]
+    except (KeyError, TypeError):  # TypeError: object cannot be weakly referenced
+        pass
+
+    var_params = _inspect_var_params(func)
+    try:
+        _var_params_cache[key] = var_params
+    except TypeError:
+        pass
+    return var_params
+
+
+def _extract_positional_keyword_vars(func: Callable, kwargs: Dict) -> Tuple[Iterable, Dict]:
+    var_positional, var_keyword = _get_var_params(func)
+    if (var_positional is None or var_positional not in kwargs) and (
+        var_keyword is None or var_keyword not in kwargs
+    ):
+        return (), kwargs
+
+    # make a copy of kwargs since we don't want to modify them directly
+    kwargs = copy.copy(kwargs)
+
+    var_kwarg = kwargs.pop(var_keyword, {})
     kwargs.update(var_kwarg)
 
-    args = kwargs.pop(type2param.get(inspect.Parameter.VAR_POSITIONAL), ())
+    args = kwargs.pop(var_positional, ())
 
     return args, kwargs
 
@@ -60,13 +160,17 @@ def get_factory(name_or_object: Union[str, T]) -> Union[Factory, T]:
     Raises:
         LookupError: if no factory with provided name was registered
 
+    Note:
+        Lookups by name are cached (including the failed ones),
+        see :py:func:`factory_cache_info` and :py:func:`clear_factory_cache`.
+
     Examples:
         >>> to_int = get_factory("int")
         >>> to_int("42")
         42
     """
     if isinstance(name_or_object, str):
-        factory = pydoc.locate(name_or_object)
+        factory = _factory_cache.get(name_or_object, resolve=locate)
         if not factory:
             raise LookupError(f"No factory with name '{name_or_object}' was registered")
 
@@ -74,11 +178,49 @@ def get_factory(name_or_object: Union[str, T]) -> Union[Factory, T]:
     return name_or_object
 
 
+def factory_cache_info() -> CacheInfo:
+    """Returns hit/miss statistics of the :py:func:`get_factory` lookups cache.
+
+    Returns:
+        named tuple with ``hits``, ``misses``, ``maxsize`` and ``currsize`` fields
+
+    Examples:
+        >>> clear_factory_cache()
+        >>> _ = get_factory("int"), get_factory("int")
+        >>> factory_cache_info()
+        CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+    """
+    return _factory_cache.info()
+
+
+def clear_factory_cache() -> None:
+    """Clears the :py:func:`get_factory` lookups cache.
+
+    Should be called after reloading modules or changing ``sys.path``
+    without importing or removing any module.
+    """
+    _factory_cache.clear()
+
+
+def _call_unscoped(factory: Factory, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+    """Calls the factory without scope cache, which is provided by the registry only."""
+    if DEFAULT_SCOPE_KEY in kwargs:
+        raise ValueError(
+            f"'{DEFAULT_SCOPE_KEY}' key is supported by Registry only,"
+            " use Registry.get_from_params() to create objects in scopes"
+        )
+    return metafactory_factory(factory=factory, args=args, kwargs=kwargs)
+
+
 def _get_instance(
     factory_key: str = DEFAULT_FACTORY_KEY,
     get_factory_func: Callable = None,
     args: Optional[Iterable] = None,
     kwargs: Optional[Dict] = None,
+    scopes: Optional[ScopeCache] = None,
+    hooks: Optional[BuildHooks] = None,
+    path: str = "",
+    config: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
 ) -> Any:
     """Creates instance by calling specified factory with ``instantiate_fn``.
 
@@ -92,6 +234,13 @@ def _get_instance(
             Default: :py:func:`.functional.get_factory`
         args: positional arguments to be passed into the factory
         kwargs: keyword arguments to be passed into the factory
+        scopes: if provided, the instance is created (or taken)
+            in the scope of the factory, see :py:class:`.scope.ScopeCache`
+        hooks: if provided, callbacks of the resolve and call events,
+            see :py:class:`.hooks.BuildHooks`
+        path: path of the config node to pass to the ``hooks``
+        config: function which returns config subtree of the instance
+            to identify it by in the ``scopes``, see :py:meth:`.scope.ScopeCache.call`
 
     Returns:
         created instance
@@ -111,13 +260,21 @@ def _get_instance(
     if name is None:
         raise TypeError(f"get_instance() missing at least 1 required argument: '{factory_key}'")
 
-    factory = get_factory_func(name)
+    if hooks is None:
+        factory = get_factory_func(name)
+    else:
+        factory = hooks.resolve(get_factory_func, name, path)
 
     args_, kwargs = _extract_positional_keyword_vars(factory, kwargs=kwargs)
     args = *args, *args_
 
     try:
-        instance = metafactory_factory(factory=factory, args=args, kwargs=kwargs)
+        create = scopes.call if scopes is not None else _call_unscoped
+        if scopes is not None and config is not None and scopes._is_scoped(factory, kwargs):
+            create = functools.partial(scopes.call, config=config())
+        if hooks is not None:
+            return hooks.call(create, name, factory, args=args, kwargs=kwargs, path=path)
+        instance = create(factory=factory, args=args, kwargs=kwargs)
         return instance
     except Exception as e:
         raise RuntimeError(f"Factory '{name}' call failed: args={args} kwargs={kwargs}") from e
@@ -153,11 +310,24 @@ def _get_from_params(
     var_key: str,
     attrs_delimiter: str,
     vars_dict: Dict[str, Any],
+    lazy_key: str = DEFAULT_LAZY_KEY,
+    lazy: bool = False,
+    scopes: Optional[ScopeCache] = None,
+    hooks: Optional[BuildHooks] = None,
+    path: str = "",
+    config: Optional[Dict[str, Any]] = None,
 ) -> Tuple[Any, Dict[str, Any]]:
     # use additional dict to handle 'multiple values for keyword argument'
     kwargs = {**shared_params, **params}
+    if scopes is not None and config is not None and scopes._may_be_scoped(kwargs):
+        # config of the node before its children were built
+        config = functools.partial(_get_scope_config, config, shared_params, var_key)
+    else:
+        config = None
 
     params.pop(var_key, None)
+    params.pop(lazy_key, None)
+    lazy = kwargs.pop(lazy_key, lazy)
 
     alias = kwargs.pop(var_key, "")
     alias, attribute_name = (
@@ -178,23 +348,75 @@ def _get_from_params(
                 obj = obj_or_callable(*args, **kwargs)
             else:
                 obj = obj_or_callable
+    elif factory_key in kwargs and lazy:
+        # the factory is not even resolved until the first access
+        # name is passed as positional argument, so `kwargs` are not modified
+        #  by the call and the call can be repeated if it fails
+        name = kwargs.pop(factory_key)
+        obj = LazyProxy(
+            functools.partial(
+                _get_instance,
+                factory_key=factory_key,
+                get_factory_func=get_factory_func,
+                args=(name,),
+                kwargs=kwargs,
+                scopes=scopes,
+                hooks=hooks,
+                path=path,
+                config=config,
+            ),
+            name=name,
+        )
     elif factory_key in kwargs:
         obj = _get_instance(
             factory_key=factory_key,
             get_factory_func=get_factory_func,
             args=(),
             kwargs=kwargs,
+            scopes=scopes,
+            hooks=hooks,
+            path=path,
+            config=config,
         )
     else:
         obj = params
 
     if alias and alias not in vars_dict:
         vars_dict[alias] = obj
+        if hooks is not None:
+            hooks.emit(ON_VAR_STORE, path, alias, value=obj)
 
     return obj, vars_dict
 
 
-def _recursive_get_from_params(
+def _get_scope_config(
+    node: Dict[str, Any], shared_params: Dict[str, Any], var_key: str
+) -> Optional[Dict[str, Any]]:
+    """Returns config subtree to identify the scoped instance by, ``None`` if it has aliases."""
+    if var_key in shared_params:
+        return None
+    # aliases might refer to other objects in other builds
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if var_key in current:
+                return None
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return {**shared_params, **node}
+
+
+def _memo_scope(
+    memo: Optional[BuildMemo], shared_params: Dict[str, Any], var_key: str
+) -> ContextManager:
+    if memo is None:
+        return contextlib.nullcontext()
+    return memo._build(shared_params=shared_params, var_key=var_key)
+
+
+def _iterative_get_from_params(
     factory_key: str,
     get_factory_func: Callable,
     params: Union[Dict[str, Any], Any],
@@ -202,33 +424,192 @@ def _recursive_get_from_params(
     var_key: str,
     attrs_delimiter: str,
     vars_dict: Dict[str, Any],
+    lazy_key: str = DEFAULT_LAZY_KEY,
+    lazy: bool = False,
+    memo: Optional[BuildMemo] = None,
+    scopes: Optional[ScopeCache] = None,
+    hooks: Optional[BuildHooks] = None,
+    path: str = "",
 ) -> Tuple[Any, Dict[str, Any]]:
+    """Builds the config bottom-up with explicit stack, so configs of any depth can be built."""
     if not isinstance(params, (dict, list)):
         return params, vars_dict
 
-    # make a copy of params since we don't want to modify them directly
-    params = copy.copy(params)
     common_params = {
         "factory_key": factory_key,
         "get_factory_func": get_factory_func,
         "shared_params": shared_params,
         "var_key": var_key,
         "attrs_delimiter": attrs_delimiter,
+        "lazy_key": lazy_key,
+        "lazy": lazy,
+        "memo": memo,
+        "scopes": scopes,
+        "hooks": hooks,
     }
 
-    view = params.items() if isinstance(params, dict) else enumerate(params)
-    for key, param in view:
-        params[key], vars_dict = _recursive_get_from_params(
-            params=param, vars_dict=vars_dict, **common_params
-        )
+    # scoped instances are reused before their children are built, but not with hooks,
+    #  as the callbacks of the resolve and call events are expected for every node
+    scope_key = scopes.scope_key if scopes is not None and hooks is None else None
+    # instances of the nodes without scope key can be scoped by the factories
+    any_scoped = scope_key is not None and scopes._may_be_scoped(shared_params)
+
+    def _scope_lookup(node: Dict[str, Any]) -> Any:
+        kwargs = {**shared_params, **node}
+        if kwargs.get(lazy_key, lazy) or not scopes._may_be_scoped(kwargs):
+            return _NOT_MEMOIZED
+        name = kwargs[factory_key]
+        try:
+            factory = get_factory_func(name) if not isinstance(name, (dict, list)) else None
+        except Exception:
+            # the error is reported by the build
+            return _NOT_MEMOIZED
+        if factory is None or not scopes._is_scoped(factory, kwargs):
+            return _NOT_MEMOIZED
+        config = _get_scope_config(node, shared_params, var_key)
+        instance = scopes._lookup(factory, config) if config is not None else _NOT_FOUND
+        return _NOT_MEMOIZED if instance is _NOT_FOUND else instance
+
+    def _memo_lookup(node: Dict[str, Any]) -> Tuple[Any, Any]:
+        key = memo.key(node, var_key=var_key)
+        if key is not None and key in memo:
+            return key, memo.get(key, node)
+        return key, _NOT_MEMOIZED
+
+    # frame: [params, iterator over items, copy of params or None, memo key, current key, path]
+    def _make_frame(node: Union[Dict[str, Any], List], node_path: str) -> List:
+        items = iter(node.items()) if isinstance(node, dict) else enumerate(node)
+        return [node, items, None, None, None, node_path]
+
+    root = _make_frame(params, path)
+    if memo is not None and isinstance(params, dict) and factory_key in params:
+        root[3], instance = _memo_lookup(params)
+        if instance is not _NOT_MEMOIZED:
+            return instance, vars_dict
+    if (
+        scope_key is not None
+        and isinstance(params, dict)
+        and factory_key in params
+        and (any_scoped or scope_key in params)
+    ):
+        instance = _scope_lookup(params)
+        if instance is not _NOT_MEMOIZED:
+            return instance, vars_dict
+
+    stack = [root]
+    while True:
+        frame = stack[-1]
+        node, items, new_params = frame[0], frame[1], frame[2]
+        for key, param in items:
+            if not isinstance(param, (dict, list)):
+                # leaves are never rebuilt
+                continue
+
+            # paths are used only by hooks
+            child = _make_frame(param, _join_path(frame[5], key) if hooks is not None else "")
+            value = _NOT_MEMOIZED
+            if isinstance(param, dict) and factory_key in param:
+                if memo is not None:
+                    child[3], value = _memo_lookup(param)
+                if value is _NOT_MEMOIZED and scope_key is not None:
+                    if any_scoped or scope_key in param:
+                        value = _scope_lookup(param)
+            if value is not _NOT_MEMOIZED:
+                if new_params is None and value is not param:
+                    new_params = frame[2] = copy.copy(node)
+                if new_params is not None:
+                    new_params[key] = value
+                continue
+            # postpone the rest of the items until the child is built
+            frame[4] = key
+            stack.append(child)
+            break
+        else:
+            # all items are built, build the node itself
+            stack.pop()
+            value, vars_dict = _finish_node(
+                params=node,
+                new_params=new_params,
+                memo_key=frame[3],
+                vars_dict=vars_dict,
+                path=frame[5],
+                **common_params,
+            )
+            if not stack:
+                return value, vars_dict
 
-    if isinstance(params, dict):
-        instance, vars_dict = _get_from_params(params=params, vars_dict=vars_dict, **common_params)
-        return instance, vars_dict
-    return params, vars_dict
+            parent = stack[-1]
+            if parent[2] is None and value is not node:
+                parent[2] = copy.copy(parent[0])
+            if parent[2] is not None:
+                parent[2][parent[4]] = value
 
 
-def get_from_params(*, shared_params: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+def _finish_node(
+    params: Union[Dict[str, Any], List],
+    new_params: Optional[Union[Dict[str, Any], List]],
+    memo_key: Optional[Any],
+    factory_key: str,
+    get_factory_func: Callable,
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    vars_dict: Dict[str, Any],
+    lazy_key: str,
+    lazy: bool,
+    memo: Optional[BuildMemo],
+    scopes: Optional[ScopeCache] = None,
+    hooks: Optional[BuildHooks] = None,
+    path: str = "",
+) -> Tuple[Any, Dict[str, Any]]:
+    """Builds the node from the already built items (``new_params`` if any was rebuilt)."""
+    if isinstance(params, list):
+        return params if new_params is None else new_params, vars_dict
+
+    reserved_keys = (factory_key, var_key)
+    if (
+        not any(k in params or k in shared_params for k in reserved_keys)
+        and lazy_key not in params
+        and (memo is None or memo.copy_key not in params)
+    ):
+        return params if new_params is None else new_params, vars_dict
+
+    # make a copy of params since we don't want to modify them directly
+    config, params = params, copy.copy(params) if new_params is None else new_params
+    if memo is not None:
+        params.pop(memo.copy_key, None)
+    instance, vars_dict = _get_from_params(
+        params=params,
+        config=config,
+        vars_dict=vars_dict,
+        factory_key=factory_key,
+        get_factory_func=get_factory_func,
+        shared_params=shared_params,
+        var_key=var_key,
+        attrs_delimiter=attrs_delimiter,
+        lazy_key=lazy_key,
+        lazy=lazy,
+        scopes=scopes,
+        hooks=hooks,
+        path=path,
+    )
+    if memo_key is not None:
+        memo.add(memo_key, instance)
+    return instance, vars_dict
+
+
+def get_from_params(
+    *,
+    shared_params: Optional[Dict[str, Any]] = None,
+    executor: Optional["Executor"] = None,
+    max_workers: Optional[int] = None,
+    lazy: bool = False,
+    memo: Optional[BuildMemo] = None,
+    profiler: Optional["BuildProfiler"] = None,
+    hooks: Optional[BuildHooks] = None,
+    memory: Optional["MemoryTracker"] = None,
+    **kwargs,
+) -> Any:
     """
     Creates instance based in configuration dict with ``instantiation_fn``.
 
@@ -236,25 +617,269 @@ def get_from_params(*, shared_params: Optional[Dict[str, Any]] = None, **kwargs)
         The name of the factory to use should be provided
         by ``'_target_'`` keyword.
 
+    Note:
+        Objects can be created lazily: ``'_lazy_': True`` makes
+        the ``'_target_'`` node a :py:class:`.lazy.LazyProxy`, which resolves
+        and calls the factory only on the first access to the object,
+        ``'_lazy_': False`` makes the node eager in the ``lazy`` mode.
+        Use :py:func:`.lazy.materialize` to force creation of the objects.
+
+    Note:
+        Scopes of the objects (``'_scope_'`` key) are supported
+        by :py:class:`.registry.Registry` only, which owns the cache
+        of the scoped instances, config nodes with the key are rejected.
+
     Args:
         shared_params: params to pass on all levels in case of
             recursive creation
+        executor: thread pool executor to build independent config subtrees
+            in parallel, ``_var_`` aliases are defined before they are used
+            and the result is the same as of the serial build
+        max_workers: if provided (and ``executor`` is not), new thread pool
+            with ``max_workers`` threads is used to build independent
+            config subtrees in parallel
+        lazy: if ``True``, all the ``'_target_'`` nodes are created lazily
+            (except the ones with ``'_lazy_': False``)
+        memo: if provided, identical ``'_target_'`` subtrees are built once,
+            see :py:class:`.memo.BuildMemo`, ``memo.info().hits``
+            is the number of the saved builds
+        profiler: if provided, build times of every config node
+            are recorded by the profiler, see :py:class:`.profiler.BuildProfiler`
+        hooks: callbacks of the build events (e.g. to collect metrics),
+            see :py:class:`.hooks.BuildHooks`
+        memory: if provided, memory allocated by every factory call
+            is recorded by the tracker, see :py:class:`.memory.MemoryTracker`
         **kwargs: named parameters for factory
 
     Returns:
         result of calling ``instantiate_fn(factory, **sub_kwargs)``
 
+    Raises:
+        ValueError: if ``memo`` is used with ``executor`` or ``max_workers``,
+            or ``profiler`` is used with any of them,
+            or ``memory`` is used with ``executor`` or ``max_workers``
+
     Examples:
         >>> get_from_params(_target_="torch.nn.Linear", in_features=20, out_features=30)
         Linear(in_features=20, out_features=30, bias=True)
     """
-    instance, _ = _recursive_get_from_params(
+    if memory is not None:
+        if executor is not None or max_workers is not None:
+            raise ValueError("`memory` can't be used with `executor` or `max_workers`")
+        # memory is measured around the factory calls by the hooks of the tracker
+        with memory._tracing():
+            return get_from_params(
+                shared_params=shared_params,
+                lazy=lazy,
+                memo=memo,
+                profiler=profiler,
+                hooks=memory._merge_hooks(hooks),
+                **kwargs,
+            )
+    if memo is not None and (executor is not None or max_workers is not None):
+        raise ValueError("`memo` can't be used with `executor` or `max_workers`")
+    if profiler is not None:
+        if memo is not None or executor is not None or max_workers is not None:
+            raise ValueError("`profiler` can't be used with `memo`, `executor` or `max_workers`")
+        return profiler._build(
+            factory_key=DEFAULT_FACTORY_KEY,
+            get_factory_func=get_factory,
+            params=kwargs,
+            shared_params=shared_params or {},
+            var_key=DEFAULT_VAR_KEY,
+            attrs_delimiter=DEFAULT_ATTRS_DELIMITER,
+            vars_dict={},
+            lazy=lazy,
+            hooks=hooks or None,
+        )
+    if executor is not None or max_workers is not None:
+        # compiled plan knows dependencies between the subtrees,
+        #  imported here to avoid circular imports
+        from hydra_slayer import plan as P
+
+        return P._get_from_params(
+            factory_key=DEFAULT_FACTORY_KEY,
+            get_factory_func=get_factory,
+            params=kwargs,
+            shared_params=shared_params or {},
+            var_key=DEFAULT_VAR_KEY,
+            attrs_delimiter=DEFAULT_ATTRS_DELIMITER,
+            vars_dict={},
+            executor=executor,
+            max_workers=max_workers,
+            lazy=lazy,
+            hooks=hooks or None,
+        )
+
+    shared_params = shared_params or {}
+    with _memo_scope(memo, shared_params=shared_params, var_key=DEFAULT_VAR_KEY):
+        instance, _ = _iterative_get_from_params(
+            factory_key=DEFAULT_FACTORY_KEY,
+            get_factory_func=get_factory,
+            params=kwargs,
+            shared_params=shared_params,
+            var_key=DEFAULT_VAR_KEY,
+            vars_dict={},
+            attrs_delimiter=DEFAULT_ATTRS_DELIMITER,
+            lazy=lazy,
+            memo=memo,
+            # empty hooks are not passed, so builds without callbacks don't track paths
+            hooks=hooks or None,
+        )
+    return instance
+
+
+def iter_from_params(
+    *,
+    shared_params: Optional[Dict[str, Any]] = None,
+    lazy: bool = False,
+    memo: Optional[BuildMemo] = None,
+    hooks: Optional[BuildHooks] = None,
+    **kwargs,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Creates instances of the top-level config entries one by one.
+
+    Entries are built in the order of the config as the results are consumed,
+    so the first components can be used while the rest are not built yet.
+    ``_var_`` aliases defined by the entries are available to the next ones.
+    Raw config of the entry is released by the function as soon as
+    the entry is built.
+
+    Args:
+        shared_params: params to pass on all levels in case of
+            recursive creation
+        lazy: if ``True``, all the ``'_target_'`` nodes are created lazily,
+            see :py:func:`get_from_params`
+        memo: if provided, identical ``'_target_'`` subtrees are built once,
+            see :py:class:`.memo.BuildMemo`
+        hooks: callbacks of the build events, see :py:class:`.hooks.BuildHooks`
+        **kwargs: top-level config entries
+
+    Returns:
+        iterator over keys of the entries and their instances
+
+    Raises:
+        ValueError: if the config has top-level ``'_target_'`` or ``'_var_'``,
+            as such config is a single object
+
+    Examples:
+        >>> config = {
+        ...     "a": {"_target_": "tests.foobar.foo", "_mode_": "call", "a": 1, "b": 2},
+        ...     "b": [1, 2],
+        ... }
+        >>> for key, instance in iter_from_params(**config):
+        ...     print(key, instance)
+        a {'a': 1, 'b': 2}
+        b [1, 2]
+    """
+    shared_params = shared_params or {}
+    if _is_single_object(kwargs, shared_params, DEFAULT_FACTORY_KEY, DEFAULT_VAR_KEY):
+        raise ValueError(
+            _SINGLE_OBJECT_ERROR.format(factory_key=DEFAULT_FACTORY_KEY, var_key=DEFAULT_VAR_KEY)
+        )
+    return _iter_from_params(
         factory_key=DEFAULT_FACTORY_KEY,
         get_factory_func=get_factory,
         params=kwargs,
-        shared_params=shared_params or {},
+        shared_params=shared_params,
         var_key=DEFAULT_VAR_KEY,
+        attrs_delimiter=DEFAULT_ATTRS_DELIMITER,
         vars_dict={},
+        lazy=lazy,
+        memo=memo,
+        hooks=hooks or None,
+    )
+
+
+def _is_single_object(
+    params: Dict[str, Any], shared_params: Dict[str, Any], factory_key: str, var_key: str
+) -> bool:
+    """Checks if the config has top-level factory or alias, so it is a single object."""
+    return any(k in params or k in shared_params for k in (factory_key, var_key))
+
+
+def _iter_from_params(
+    factory_key: str,
+    get_factory_func: Callable,
+    params: Dict[str, Any],
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    vars_dict: Dict[str, Any],
+    lazy_key: str = DEFAULT_LAZY_KEY,
+    lazy: bool = False,
+    memo: Optional[BuildMemo] = None,
+    scopes: Optional[ScopeCache] = None,
+    hooks: Optional[BuildHooks] = None,
+) -> Iterator[Tuple[str, Any]]:
+    """Builds top-level entries one by one, built entries are removed from the ``params``."""
+    with _memo_scope(memo, shared_params=shared_params, var_key=var_key):
+        while params:
+            key = next(iter(params))
+            # release the raw config of the entry as soon as it is built
+            param = params.pop(key)
+            instance, vars_dict = _iterative_get_from_params(
+                factory_key=factory_key,
+                get_factory_func=get_factory_func,
+                params=param,
+                shared_params=shared_params,
+                var_key=var_key,
+                attrs_delimiter=attrs_delimiter,
+                vars_dict=vars_dict,
+                lazy_key=lazy_key,
+                lazy=lazy,
+                memo=memo,
+                scopes=scopes,
+                hooks=hooks,
+                path=_join_path("", key) if hooks is not None else "",
+            )
+            del param
+            yield key, instance
+
+
+async def aget_from_params(
+    *,
+    shared_params: Optional[Dict[str, Any]] = None,
+    hooks: Optional[BuildHooks] = None,
+    **kwargs,
+) -> Any:
+    """
+    Creates instance based in configuration dict in the event loop.
+
+    Coroutine functions (and any other factories returning awaitables)
+    are awaited, independent config subtrees are built concurrently
+    and ``_var_`` aliases are defined before they are used.
+    Regular factories are called directly in the event loop.
+
+    Args:
+        shared_params: params to pass on all levels in case of
+            recursive creation
+        hooks: callbacks of the build events, see :py:class:`.hooks.BuildHooks`
+        **kwargs: named parameters for factory
+
+    Returns:
+        result of calling ``instantiate_fn(factory, **sub_kwargs)``
+        with all coroutines awaited
+
+    Examples:
+        >>> import asyncio
+        >>> config = {"_target_": "asyncio.sleep", "_mode_": "call", "delay": 0, "result": 42}
+        >>> asyncio.run(aget_from_params(**config))
+        42
+    """
+    # compiled plan knows dependencies between the subtrees,
+    #  imported here to avoid circular imports
+    from hydra_slayer import plan as P
+
+    instance = await P._aget_from_params(
+        factory_key=DEFAULT_FACTORY_KEY,
+        get_factory_func=get_factory,
+        params=kwargs,
+        shared_params=shared_params or {},
+        var_key=DEFAULT_VAR_KEY,
         attrs_delimiter=DEFAULT_ATTRS_DELIMITER,
+        vars_dict={},
+        hooks=hooks or None,
     )
     return instance
@@ -0,0 +1,185 @@
+from typing import Any, Callable, Dict, Mapping, Tuple
+from collections import namedtuple
+import threading
+import time
+
+from hydra_slayer.factory import Factory
+
+__all__ = [
+    "BuildHooks",
+    "BuildEvent",
+    "BEFORE_RESOLVE",
+    "AFTER_RESOLVE",
+    "BEFORE_CALL",
+    "AFTER_CALL",
+    "ON_ERROR",
+    "ON_VAR_STORE",
+]
+
+BEFORE_RESOLVE = "before_resolve"
+AFTER_RESOLVE = "after_resolve"
+BEFORE_CALL = "before_call"
+AFTER_CALL = "after_call"
+ON_ERROR = "on_error"
+ON_VAR_STORE = "on_var_store"
+
+_EVENTS = (BEFORE_RESOLVE, AFTER_RESOLVE, BEFORE_CALL, AFTER_CALL, ON_ERROR, ON_VAR_STORE)
+
+# event: name of the event
+# path: path of the config node, e.g. ``model.layers[3]``, ``''`` for the root node
+# name: name of the factory (value of the ``_target_`` key) or alias for ``on_var_store``
+# factory: resolved factory, if known
+# value: created instance, stored object for ``on_var_store`` or exception for ``on_error``
+# duration: time (in seconds) of the resolution or of the call for ``after_*`` and ``on_error``
+BuildEvent = namedtuple("BuildEvent", ["event", "path", "name", "factory", "value", "duration"])
+
+HookCallback = Callable[[BuildEvent], None]
+
+
+class BuildHooks:
+    """
+    Callbacks called on the events of the config builds, e.g. to collect metrics.
+
+    Events are:
+
+        * ``before_resolve`` and ``after_resolve`` - before and after
+          the factory is looked up by its name
+        * ``before_call`` and ``after_call`` - before and after
+          the factory is called
+        * ``on_error`` - if the factory can't be resolved or its call fails
+        * ``on_var_store`` - when the object is stored by ``_var_`` alias
+
+    Every callback gets :py:class:`BuildEvent` with path of the config node
+    and the factory. Exceptions raised by callbacks are propagated
+    and fail the build. Builds without hooks don't track paths
+    of the config nodes and don't check for callbacks at all.
+
+    Note:
+        Compiled plans resolve factories once, on compilation,
+        so resolve events are emitted by :py:func:`.plan.compile`
+        (except for lazy nodes, which resolve factories on the first access).
+
+    Examples:
+        >>> from hydra_slayer import Registry
+        >>> r = Registry()
+        >>> r.hooks.add("after_call", lambda event: print(event.path, event.name))
+        >>> config = {"a": {"_target_": "tests.foobar.foo", "a": 1, "b": 2, "_mode_": "call"}}
+        >>> r.get_from_params(**config)
+        a tests.foobar.foo
+        {'a': {'a': 1, 'b': 2}}
+    """
+
+    def __init__(self):
+        # callbacks are replaced on change, so events are emitted without the lock
+        self._callbacks: Dict[str, Tuple[HookCallback, ...]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _check_event(event: str) -> None:
+        if event not in _EVENTS:
+            raise ValueError(f"Unknown event '{event}', expected one of {_EVENTS}")
+
+    def add(self, event: str, callback: HookCallback) -> None:
+        """
+        Adds callback of the event.
+
+        Args:
+            event: name of the event
+            callback: function to call with :py:class:`BuildEvent`
+
+        Raises:
+            ValueError: if the event is unknown
+        """  # noqa: DAR402
+        self._check_event(event)
+        with self._lock:
+            self._callbacks[event] = (*self._callbacks.get(event, ()), callback)
+
+    def remove(self, event: str, callback: HookCallback) -> None:
+        """
+        Removes callback of the event.
+
+        Args:
+            event: name of the event
+            callback: callback to remove
+
+        Raises:
+            ValueError: if the event is unknown or the callback was not added
+        """
+        self._check_event(event)
+        with self._lock:
+            callbacks = list(self._callbacks.get(event, ()))
+            if callback not in callbacks:
+                raise ValueError(f"Callback {callback!r} is not added to '{event}' event")
+            callbacks.remove(callback)
+            self._callbacks[event] = tuple(callbacks)
+
+    def update(self, other: "BuildHooks") -> None:
+        """
+        Adds all the callbacks of the other hooks.
+
+        Args:
+            other: hooks to take callbacks from
+        """
+        for event, callbacks in other._callbacks.items():
+            for callback in callbacks:
+                self.add(event, callback)
+
+    def emit(
+        self,
+        event: str,
+        path: str,
+        name: Any,
+        factory: Factory = None,
+        value: Any = None,
+        duration: float = None,
+    ) -> None:
+        """Calls callbacks of the event, see :py:class:`BuildEvent` for the arguments."""
+        callbacks = self._callbacks.get(event, None)
+        if callbacks:
+            record = BuildEvent(event, path, name, factory, value, duration)
+            for callback in callbacks:
+                callback(record)
+
+    def resolve(
+        self, get_factory_func: Callable, name: Any, path: str, report_error: bool = True
+    ) -> Factory:
+        """Returns ``get_factory_func(name)``, emits resolve events."""
+        self.emit(BEFORE_RESOLVE, path, name)
+        start = time.perf_counter()
+        try:
+            factory = get_factory_func(name)
+        except Exception as e:
+            if report_error:
+                self.emit(ON_ERROR, path, name, value=e, duration=time.perf_counter() - start)
+            raise
+        self.emit(AFTER_RESOLVE, path, name, factory, duration=time.perf_counter() - start)
+        return factory
+
+    def call(
+        self,
+        create: Callable,
+        name: Any,
+        factory: Factory,
+        args: Tuple,
+        kwargs: Mapping[str, Any],
+        path: str,
+    ) -> Any:
+        """Returns ``create(factory=factory, args=args, kwargs=kwargs)``, emits call events."""
+        self.emit(BEFORE_CALL, path, name, factory)
+        start = time.perf_counter()
+        try:
+            instance = create(factory=factory, args=args, kwargs=kwargs)
+        except Exception as e:
+            self.emit(ON_ERROR, path, name, factory, e, time.perf_counter() - start)
+            raise
+        self.emit(AFTER_CALL, path, name, factory, instance, time.perf_counter() - start)
+        return instance
+
+    def __len__(self) -> int:
+        """Returns number of the callbacks of all the events."""
+        return sum(len(callbacks) for callbacks in self._callbacks.values())
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the hooks."""
+        events = {k: len(v) for k, v in self._callbacks.items() if v}
+        return f"{type(self).__name__}({events})"
@@ -0,0 +1,157 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from collections import namedtuple
+import sys
+import time
+
+from hydra_slayer import functional as F
+from hydra_slayer.profiler import _format_table, _ROOT_PATH
+
+__all__ = ["import_report", "ImportCost", "ImportReport"]
+
+# name: name of the factory (value of the ``_target_`` key)
+# paths: paths of the config nodes with the factory, e.g. ``('model', 'heads[0]')``
+# duration: time (in seconds) of the factory resolution, including imports
+# modules: names of the modules imported by the resolution
+# error: exception raised by the resolution, if any
+ImportCost = namedtuple("ImportCost", ["name", "paths", "duration", "modules", "error"])
+
+
+def _iter_targets(config: Any, factory_key: str) -> Iterator[Tuple[str, str]]:
+    """Yields path and name of the factory of every config node, in order of the config."""
+    stack = [("", config)]
+    while stack:
+        path, params = stack.pop()
+        if isinstance(params, dict):
+            name = params.get(factory_key, None)
+            if isinstance(name, str):
+                yield path, name
+            children = [(F._join_path(path, k), v) for k, v in params.items() if k != factory_key]
+        elif isinstance(params, (list, tuple)):
+            children = [(F._join_path(path, i), v) for i, v in enumerate(params)]
+        else:
+            continue
+        stack.extend(reversed(children))
+
+
+class ImportReport:
+    """
+    Import costs of the factories of the config, the most expensive first.
+
+    Modules imported by several factories are attributed to the first
+    of them (in order of the config), so moving the factory behind lazy
+    registration may just pass the cost to the next one.
+
+    Args:
+        targets: import costs of the factories
+    """
+
+    def __init__(self, targets: List[ImportCost]):
+        self._targets = tuple(sorted(targets, key=lambda target: target.duration, reverse=True))
+
+    @property
+    def targets(self) -> Tuple[ImportCost, ...]:
+        """Import costs of the factories, the most expensive first."""
+        return self._targets
+
+    @property
+    def duration(self) -> float:
+        """Time (in seconds) of the resolution of all the factories."""
+        return sum(target.duration for target in self._targets)
+
+    @property
+    def modules(self) -> Tuple[str, ...]:
+        """Names of all the imported modules."""
+        return tuple(module for target in self._targets for module in target.modules)
+
+    def summary(self, limit: Optional[int] = None) -> str:
+        """
+        Returns text table of the factories, the most expensive first.
+
+        Args:
+            limit: maximum number of factories to show, all of them by default
+
+        Returns:
+            table with paths of the config nodes, top-level packages
+            of the imported modules (or resolution error) and times in milliseconds
+        """
+        header = ("factory", "paths", "packages", "time (ms)", "modules")
+        rows = []
+        for target in self._targets[:limit]:
+            if target.error is not None:
+                packages = f"{type(target.error).__name__}: {target.error}"
+            else:
+                packages = ", ".join(sorted({m.partition(".")[0] for m in target.modules}))
+            rows.append(
+                (
+                    target.name,
+                    ", ".join(path or _ROOT_PATH for path in target.paths),
+                    packages or "-",
+                    f"{target.duration * 1e3:.3f}",
+                    str(len(target.modules)),
+                )
+            )
+        return _format_table(header, rows, num_text_columns=3)
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the report."""
+        return (
+            f"{type(self).__name__}(targets={len(self._targets)},"
+            f" modules={len(self.modules)}, duration={self.duration:.3f}s)"
+        )
+
+
+def _import_report(
+    config: Dict[str, Any], factory_key: str, get_factory_func: Callable
+) -> ImportReport:
+    paths: Dict[str, List[str]] = {}
+    costs: Dict[str, Tuple[float, Tuple[str, ...], Optional[Exception]]] = {}
+    for path, name in _iter_targets(config, factory_key=factory_key):
+        paths.setdefault(name, []).append(path)
+        if name in costs:
+            continue
+
+        loaded = set(sys.modules)
+        error = None
+        start = time.perf_counter()
+        try:
+            get_factory_func(name)
+        except Exception as e:
+            error = e
+        duration = time.perf_counter() - start
+        # `sys.modules` preserves order of the imports
+        modules = tuple(module for module in sys.modules if module not in loaded)
+        costs[name] = (duration, modules, error)
+
+    return ImportReport(
+        [ImportCost(name, tuple(paths[name]), *cost) for name, cost in costs.items()]
+    )
+
+
+def import_report(
+    config: Dict[str, Any], factory_key: str = F.DEFAULT_FACTORY_KEY
+) -> ImportReport:
+    """
+    Resolves factories of the config (without calling them)
+    and measures time and modules imported by every factory.
+
+    Resolution errors are recorded in the report instead of being raised.
+    Factories which were resolved (and cached) before are not imported again,
+    so the report should be made in a fresh process.
+
+    Args:
+        config: config to resolve factories of
+        factory_key: key of the factory names in the config
+
+    Returns:
+        import costs of the factories
+
+    Examples:
+        >>> config = {
+        ...     "model": {"_target_": "collections.OrderedDict"},
+        ...     "heads": [{"_target_": "collections.OrderedDict"}],
+        ... }
+        >>> report = import_report(config)
+        >>> report.targets[0].name, report.targets[0].paths, report.targets[0].modules
+        ('collections.OrderedDict', ('model', 'heads[0]'), ())
+    """
+    return _import_report(config, factory_key=factory_key, get_factory_func=F.get_factory)
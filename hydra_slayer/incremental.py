@@ -0,0 +1,240 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from hydra_slayer import functional as F, plan as P
+
+__all__ = ["BuildGraph", "build_graph", "rebuild"]
+
+DisposeCallback = Callable[[str, Any], None]
+
+
+def _leaf_fingerprint(value: Any) -> Hashable:
+    try:
+        hash(value)
+    except TypeError:
+        # objects which can't be hashed are compared by identity,
+        #  the config of the graph keeps them alive
+        return "id", id(value)
+    return type(value), value
+
+
+class _Fingerprints:
+    """Computes fingerprints of the plan steps: content of the node and its dependencies."""
+
+    def __init__(self, plan: P.Plan):
+        self.slots: Dict[int, Hashable] = {}
+        for slot, value in enumerate(plan._slots):
+            self.slots[slot] = _leaf_fingerprint(value)
+        # alias -> fingerprint of the node which defines it
+        self.definitions: Dict[str, Hashable] = {}
+
+    def inputs(self, step: P.Step) -> Tuple[Hashable, ...]:
+        return tuple(self.slots[i] for i in step.inputs)
+
+    def call(self, step: P.CallStep) -> Hashable:
+        name = step.name if step.name_input == P._NO_SLOT else self.slots[step.name_input]
+        factory = _leaf_fingerprint(step.factory) if step.factory is not None else None
+        return "call", _leaf_fingerprint(name), factory, step.keys, step.lazy, self.inputs(step)
+
+    def step(self, step: P.Step) -> Hashable:
+        if isinstance(step, P.ListStep):
+            fingerprint = "list", step.list_type, self.inputs(step)
+        elif isinstance(step, P.DictStep):
+            fingerprint = "dict", step.dict_type, step.keys, self.inputs(step)
+        elif isinstance(step, P.CallStep):
+            fingerprint = self.call(step)
+        elif isinstance(step, P.VarStep):
+            define = self.step(step.define)
+            # the first occurrence of the alias defines it, the other ones depend on it
+            definition = self.definitions.setdefault(step.alias, define)
+            fingerprint = (
+                "var",
+                step.alias,
+                step.attribute_name,
+                step.keys,
+                self.inputs(step),
+                define,
+                definition,
+            )
+        else:
+            raise TypeError(f"Unknown step type: {type(step)}")
+        self.slots[step.out] = fingerprint
+        return fingerprint
+
+
+class BuildGraph:
+    """
+    Result of the config build which remembers object of every config node,
+    so the config can be rebuilt incrementally with :py:func:`rebuild`.
+
+    Args:
+        config: config the graph was built from
+        result: result of the build
+        plan: compiled config
+        values: values of the plan slots after the build
+        fingerprints: fingerprints of the nodes by path
+        rebuilt: paths of the nodes built (not reused) by the last build
+    """
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        result: Any,
+        plan: P.Plan,
+        values: List[Any],
+        fingerprints: Dict[str, Hashable],
+        rebuilt: List[str],
+    ):
+        self.config = config
+        self.result = result
+        self._plan = plan
+        self._values = values
+        self._fingerprints = fingerprints
+        self.rebuilt = rebuilt
+
+    @property
+    def objects(self) -> Dict[str, Any]:
+        """Objects created by the factories (or taken by ``_var_``) by path of the node."""
+        return {
+            step.path: self._values[step.out]
+            for step in self._plan.steps
+            if isinstance(step, (P.CallStep, P.VarStep))
+        }
+
+    def _created_objects(self) -> Dict[str, Any]:
+        """Objects created by the factories by path of the node."""
+        objects, aliases = {}, set()
+        for step in self._plan.steps:
+            if isinstance(step, P.VarStep):
+                # only the first occurrence of the alias creates the object
+                is_definition = step.alias not in aliases
+                aliases.add(step.alias)
+                if not is_definition or not isinstance(step.define, P.CallStep):
+                    continue
+            elif not isinstance(step, P.CallStep):
+                continue
+            objects[step.path] = self._values[step.out]
+        return objects
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the graph."""
+        return f"BuildGraph(nodes={len(self._plan)}, rebuilt={len(self.rebuilt)})"
+
+
+def _build(
+    config: Dict[str, Any],
+    shared_params: Dict[str, Any],
+    previous: Optional[BuildGraph],
+) -> BuildGraph:
+    plan = P._compile(
+        factory_key=F.DEFAULT_FACTORY_KEY,
+        get_factory_func=F.get_factory,
+        config=config,
+        shared_params=shared_params,
+        var_key=F.DEFAULT_VAR_KEY,
+        attrs_delimiter=F.DEFAULT_ATTRS_DELIMITER,
+        vars_dict=None,
+    )
+    fingerprints = _Fingerprints(plan)
+    old_fingerprints = previous._fingerprints if previous is not None else {}
+    old_values = (
+        {step.path: previous._values[step.out] for step in previous._plan.steps}
+        if previous is not None
+        else {}
+    )
+
+    values, vars_dict = list(plan._slots), {}
+    paths, rebuilt = {}, []
+    for step in plan.steps:
+        fingerprint = fingerprints.step(step)
+        paths[step.path] = fingerprint
+        if step.path in old_values and old_fingerprints.get(step.path) == fingerprint:
+            # the node and all its dependencies are the same, reuse the object
+            values[step.out] = old_values[step.path]
+            if isinstance(step, P.VarStep) and step.alias not in vars_dict:
+                vars_dict[step.alias] = values[step.out]
+            continue
+
+        step.run(values, vars_dict)
+        rebuilt.append(step.path)
+
+    return BuildGraph(
+        config=config,
+        result=values[plan._root],
+        plan=plan,
+        values=values,
+        fingerprints=paths,
+        rebuilt=rebuilt,
+    )
+
+
+def build_graph(
+    config: Dict[str, Any], shared_params: Optional[Dict[str, Any]] = None
+) -> BuildGraph:
+    """
+    Builds the config like :py:func:`.functional.get_from_params`,
+    but remembers object of every node to rebuild the config incrementally.
+
+    Args:
+        config: config to build
+        shared_params: params to pass on all levels in case of
+            recursive creation
+
+    Returns:
+        build graph, ``graph.result`` is the result of the build
+
+    Examples:
+        >>> graph = build_graph({"_target_": "tests.foobar.foo", "_mode_": "call", "a": 1, "b": 2})
+        >>> graph.result
+        {'a': 1, 'b': 2}
+    """
+    return _build(config, shared_params=shared_params or {}, previous=None)
+
+
+def rebuild(
+    graph: BuildGraph,
+    config: Dict[str, Any],
+    shared_params: Optional[Dict[str, Any]] = None,
+    dispose: Optional[DisposeCallback] = None,
+) -> BuildGraph:
+    """
+    Rebuilds only the changed nodes of the config.
+
+    Nodes are matched by path, a node is reused if its own parameters
+    (including factory and shared params) and all its dependencies
+    (nested nodes and nodes referenced by ``_var_``) are the same,
+    otherwise it is built again.
+
+    Args:
+        graph: graph of the previous build
+        config: new config
+        shared_params: params to pass on all levels in case of
+            recursive creation
+        dispose: callback called with path and object for every object
+            created by the factories of the previous build which is not used
+            by the new one, called only after the new config is built
+
+    Returns:
+        new build graph, ``graph.rebuilt`` contains paths of the rebuilt nodes
+
+    Examples:
+        >>> config = {
+        ...     "db": {"_target_": "tests.foobar.grault", "a": "localhost"},
+        ...     "lr": {"_target_": "tests.foobar.grault", "a": 0.1},
+        ... }
+        >>> graph = build_graph(config)
+        >>> new_config = {**config, "lr": {"_target_": "tests.foobar.grault", "a": 0.01}}
+        >>> new_graph = rebuild(graph, new_config)
+        >>> new_graph.rebuilt
+        ['lr', '']
+        >>> new_graph.result["db"] is graph.result["db"]
+        True
+    """
+    new_graph = _build(config, shared_params=shared_params or {}, previous=graph)
+
+    if dispose is not None:
+        used = {id(obj) for obj in new_graph.objects.values()}
+        for path, obj in graph._created_objects().items():
+            if id(obj) not in used:
+                used.add(id(obj))
+                dispose(path, obj)
+    return new_graph
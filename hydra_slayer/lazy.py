@@ -0,0 +1,199 @@
+from typing import Any, Callable
+import operator
+import threading
+
+__all__ = ["LazyProxy", "is_built", "materialize"]
+
+_NOT_BUILT = object()
+
+
+def _build(proxy: "LazyProxy") -> Any:
+    """Returns the proxied object, creates it on the first call."""
+    instance = proxy._LazyProxy__instance
+    if instance is _NOT_BUILT:
+        with proxy._LazyProxy__lock:
+            instance = proxy._LazyProxy__instance
+            if instance is _NOT_BUILT:
+                instance = proxy._LazyProxy__factory()
+                object.__setattr__(proxy, "_LazyProxy__instance", instance)
+                # release the arguments of the factory
+                object.__setattr__(proxy, "_LazyProxy__factory", None)
+    return instance
+
+
+def _forward(func: Callable) -> Callable:
+    def method(self, *args):
+        return func(_build(self), *args)
+
+    return method
+
+
+def _forward_reflected(func: Callable) -> Callable:
+    def method(self, other):
+        return func(other, _build(self))
+
+    return method
+
+
+class LazyProxy:
+    """
+    Transparent proxy of the object which is created on the first access.
+
+    Any attribute access, call or operator applied to the proxy creates
+    the object (exactly once, even if accessed from several threads)
+    and is forwarded to it. ``isinstance`` checks are forwarded as well,
+    use ``type(obj) is LazyProxy`` to check if the object is a proxy.
+
+    If the factory fails, the error is raised to the caller
+    and the object will be created again on the next access.
+
+    Args:
+        factory: function without arguments which creates the object
+        name: name of the object to show until it is created
+
+    Examples:
+        >>> proxy = LazyProxy(lambda: [1, 2, 3], name="list")
+        >>> proxy
+        <LazyProxy of 'list' (not built)>
+        >>> len(proxy)
+        3
+        >>> proxy
+        [1, 2, 3]
+    """
+
+    __slots__ = ("__factory", "__lock", "__instance", "__name", "__weakref__")
+
+    def __init__(self, factory: Callable[[], Any], name: Any = None):
+        object.__setattr__(self, "_LazyProxy__factory", factory)
+        # re-entrant, so a factory accessing its own proxy fails instead of deadlock
+        object.__setattr__(self, "_LazyProxy__lock", threading.RLock())
+        object.__setattr__(self, "_LazyProxy__instance", _NOT_BUILT)
+        object.__setattr__(self, "_LazyProxy__name", name)
+
+    @property
+    def __class__(self):
+        """Returns class of the object, so ``isinstance`` checks are forwarded."""
+        return type(_build(self))
+
+    def __getattr__(self, name: str) -> Any:
+        """Returns attribute of the object."""
+        return getattr(_build(self), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Sets attribute of the object."""
+        setattr(_build(self), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        """Deletes attribute of the object."""
+        delattr(_build(self), name)
+
+    def __dir__(self):
+        """Returns attributes of the object."""
+        return dir(_build(self))
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the object, or of the proxy until it is built."""
+        if self.__instance is _NOT_BUILT:
+            return f"<LazyProxy of {self.__name!r} (not built)>"
+        return repr(self.__instance)
+
+    def __reduce_ex__(self, protocol: int):
+        """Returns pickle state of the object, so the proxy is copied and pickled as the object."""
+        return _build(self).__reduce_ex__(protocol)
+
+    def __call__(self, *args, **kwargs):
+        """Calls the object."""
+        return _build(self)(*args, **kwargs)
+
+    def __setitem__(self, key, value) -> None:
+        """Sets item of the object."""
+        _build(self)[key] = value
+
+    def __delitem__(self, key) -> None:
+        """Deletes item of the object."""
+        del _build(self)[key]
+
+    def __exit__(self, *args):
+        """Exits the runtime context of the object."""
+        return _build(self).__exit__(*args)
+
+    __str__ = _forward(str)
+    __bytes__ = _forward(bytes)
+    __format__ = _forward(format)
+    __hash__ = _forward(hash)
+    __bool__ = _forward(bool)
+    __len__ = _forward(len)
+    __iter__ = _forward(iter)
+    __next__ = _forward(next)
+    __reversed__ = _forward(reversed)
+    __contains__ = _forward(operator.contains)
+    __getitem__ = _forward(operator.getitem)
+    __index__ = _forward(operator.index)
+    __int__ = _forward(int)
+    __float__ = _forward(float)
+    __neg__ = _forward(operator.neg)
+    __pos__ = _forward(operator.pos)
+    __abs__ = _forward(abs)
+    __invert__ = _forward(operator.invert)
+    __enter__ = _forward(lambda obj: obj.__enter__())
+    __eq__ = _forward(operator.eq)
+    __ne__ = _forward(operator.ne)
+    __lt__ = _forward(operator.lt)
+    __le__ = _forward(operator.le)
+    __gt__ = _forward(operator.gt)
+    __ge__ = _forward(operator.ge)
+
+    __add__, __radd__ = _forward(operator.add), _forward_reflected(operator.add)
+    __sub__, __rsub__ = _forward(operator.sub), _forward_reflected(operator.sub)
+    __mul__, __rmul__ = _forward(operator.mul), _forward_reflected(operator.mul)
+    __matmul__, __rmatmul__ = _forward(operator.matmul), _forward_reflected(operator.matmul)
+    __truediv__, __rtruediv__ = _forward(operator.truediv), _forward_reflected(operator.truediv)
+    __floordiv__ = _forward(operator.floordiv)
+    __rfloordiv__ = _forward_reflected(operator.floordiv)
+    __mod__, __rmod__ = _forward(operator.mod), _forward_reflected(operator.mod)
+    __pow__, __rpow__ = _forward(operator.pow), _forward_reflected(operator.pow)
+    __lshift__, __rlshift__ = _forward(operator.lshift), _forward_reflected(operator.lshift)
+    __rshift__, __rrshift__ = _forward(operator.rshift), _forward_reflected(operator.rshift)
+    __and__, __rand__ = _forward(operator.and_), _forward_reflected(operator.and_)
+    __or__, __ror__ = _forward(operator.or_), _forward_reflected(operator.or_)
+    __xor__, __rxor__ = _forward(operator.xor), _forward_reflected(operator.xor)
+
+
+def is_built(obj: Any) -> bool:
+    """Checks if the object is not a :py:class:`LazyProxy` or its object is already created."""
+    return type(obj) is not LazyProxy or obj._LazyProxy__instance is not _NOT_BUILT
+
+
+def materialize(obj: Any) -> Any:
+    """
+    Forces creation of the lazy objects.
+
+    Proxies are replaced by the objects they proxy, lists, tuples and dicts
+    are traversed recursively (and copied only if they contain proxies).
+    Objects created by the proxies are returned as is, so proxies passed
+    to them as arguments stay lazy.
+
+    Args:
+        obj: proxy or container with proxies
+
+    Returns:
+        object or container without proxies
+
+    Examples:
+        >>> materialize({"a": [LazyProxy(lambda: 42)], "b": 1})
+        {'a': [42], 'b': 1}
+    """
+    if type(obj) is LazyProxy:
+        return _build(obj)
+
+    if type(obj) in (list, tuple):
+        items = [materialize(v) for v in obj]
+        if all(new is old for new, old in zip(items, obj)):
+            return obj
+        return items if type(obj) is list else tuple(items)
+    if type(obj) is dict:
+        items = {k: materialize(v) for k, v in obj.items()}
+        if all(items[k] is v for k, v in obj.items()):
+            return obj
+        return items
+    return obj
@@ -0,0 +1,168 @@
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+import contextlib
+import copy
+
+from hydra_slayer.cache import CacheInfo
+
+__all__ = ["BuildMemo"]
+
+
+class BuildMemo:
+    """
+    Memo of the objects built from the config subtrees.
+
+    Subtrees are identified by content: factory name and canonicalized
+    parameters (order of the dict keys doesn't matter, ``1`` and ``True``
+    are different values, objects which can't be hashed are compared
+    by identity). Each distinct subtree is built once, later occurrences
+    reuse the object built first or get its shallow copy if
+    the subtree has ``'_copy_': True`` key.
+
+    Subtrees with ``_var_`` aliases (anywhere inside) are never memoized,
+    as aliases are defined or retrieved in the order of the config.
+
+    The memo keeps the objects between the builds, so the same memo
+    can be used to share objects between several configs.
+
+    Args:
+        copy_key: key to use to mark subtrees to copy the memoized objects for
+
+    Examples:
+        >>> from hydra_slayer import get_from_params
+        >>> memo = BuildMemo()
+        >>> norm = {"_target_": "tests.foobar.grault", "a": 0.5}
+        >>> res = get_from_params(a=norm, b=dict(norm), memo=memo)
+        >>> res["a"] is res["b"]
+        True
+        >>> memo.info()  # hits are the saved builds
+        CacheInfo(hits=1, misses=1, maxsize=None, currsize=1)
+    """
+
+    def __init__(self, copy_key: str = "_copy_"):
+        self.copy_key = copy_key
+        self._objects: Dict[Hashable, Any] = {}
+        # id of the config node -> (node, key), nodes are stored to keep ids unique
+        self._keys: Dict[int, Tuple[Any, Optional[Hashable]]] = {}
+        self._pinned: Dict[int, Any] = {}
+        self._shared_key: Optional[Hashable] = None
+        self._hits = 0
+        self._misses = 0
+
+    def _leaf_key(self, value: Any) -> Hashable:
+        try:
+            hash(value)
+        except TypeError:
+            # keep the object alive while its id is used by the keys
+            self._pinned[id(value)] = value
+            return "id", id(value)
+        return type(value), value
+
+    def _child_key(self, value: Any) -> Optional[Hashable]:
+        if isinstance(value, (dict, list)):
+            return self._keys[id(value)][1]
+        return self._leaf_key(value)
+
+    def _node_key(self, node: Any, var_key: str) -> Optional[Hashable]:
+        if not isinstance(node, (dict, list)):
+            return self._leaf_key(node)
+
+        # post-order traversal with explicit stack, so configs of any depth are supported
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in self._keys:
+                continue
+
+            values = current.values() if isinstance(current, dict) else current
+            if not expanded:
+                stack.append((current, True))
+                stack.extend(
+                    (v, False)
+                    for v in values
+                    if isinstance(v, (dict, list)) and id(v) not in self._keys
+                )
+                continue
+
+            key = None
+            if isinstance(current, list):
+                items = tuple(self._child_key(v) for v in current)
+                if all(item is not None for item in items):
+                    key = type(current), items
+            elif var_key not in current:
+                items = {
+                    (self._leaf_key(k), self._child_key(v))
+                    for k, v in current.items()
+                    if k != self.copy_key
+                }
+                if all(item[1] is not None for item in items):
+                    key = type(current), frozenset(items)
+            self._keys[id(current)] = (current, key)
+        return self._keys[id(node)][1]
+
+    @contextlib.contextmanager
+    def _build(self, shared_params: Dict[str, Any], var_key: str) -> Iterator[None]:
+        """Prepares the memo for the build with given shared params, releases the config after."""
+        self._shared_key = self._node_key(shared_params, var_key)
+        try:
+            yield
+        finally:
+            self._keys.clear()
+            self._shared_key = None
+
+    def key(self, node: Dict[str, Any], var_key: str) -> Optional[Hashable]:
+        """
+        Returns content key of the config subtree.
+
+        Args:
+            node: config subtree
+            var_key: key of the aliases
+
+        Returns:
+            key or ``None`` if the subtree can't be memoized
+        """
+        key = self._node_key(node, var_key)
+        if key is None or self._shared_key is None:
+            return None
+        return self._shared_key, key
+
+    def get(self, key: Hashable, node: Dict[str, Any]) -> Any:
+        """
+        Returns the object built for the ``key``.
+
+        Args:
+            key: content key of the config subtree
+            node: config subtree, the object is copied
+                if the subtree has ``copy_key`` set
+
+        Returns:
+            memoized object or its shallow copy
+
+        Raises:
+            KeyError: if there is no object for the ``key``
+        """  # noqa: DAR402
+        obj = self._objects[key]
+        self._hits += 1
+        return copy.copy(obj) if node.get(self.copy_key, False) else obj
+
+    def add(self, key: Hashable, obj: Any) -> None:
+        """Stores the object built for the ``key``."""
+        self._misses += 1
+        self._objects[key] = obj
+
+    def info(self) -> CacheInfo:
+        """Returns number of the saved builds (hits) and of the distinct builds (misses)."""
+        return CacheInfo(self._hits, self._misses, None, len(self._objects))
+
+    def clear(self) -> None:
+        """Removes all the objects and resets statistics."""
+        self._objects.clear()
+        self._pinned.clear()
+        self._hits = self._misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Checks if the object for the ``key`` is memoized."""
+        return key in self._objects
+
+    def __len__(self) -> int:
+        """Returns number of memoized objects."""
+        return len(self._objects)
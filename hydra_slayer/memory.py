@@ -0,0 +1,223 @@
+from typing import Any, Iterator, List, Optional, Tuple
+from collections import namedtuple
+import contextlib
+import os
+import threading
+
+from hydra_slayer.hooks import AFTER_CALL, BEFORE_CALL, BuildEvent, BuildHooks, ON_ERROR
+from hydra_slayer.profiler import _format_table, _ROOT_PATH
+
+__all__ = ["MemoryTracker", "NodeMemory"]
+
+# sizes are in bytes:
+# retained: memory allocated by the call and still alive after it (size of the instance)
+# peak: maximum memory allocated during the call
+# rss: change of the resident set size of the process, ``None`` if not measured
+NodeMemory = namedtuple("NodeMemory", ["path", "name", "retained", "peak", "rss"])
+
+_SORT_KEYS = ("peak", "retained", "rss")
+
+
+def _get_rss() -> Optional[int]:
+    """Returns resident set size of the process, ``None`` if it is unknown."""
+    try:
+        with open("/proc/self/statm") as stream:
+            return int(stream.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+class MemoryTracker:
+    """
+    Per-node memory accounting of the config builds.
+
+    Memory allocated by every factory call is traced by :py:mod:`tracemalloc`
+    and attributed to the path of the config node, e.g. ``data.train.cache``.
+    Children of the node are built before the node, so their memory
+    is not attributed to the node. Allocations made by the factory in other
+    threads are traced as well. Records of several builds are accumulated.
+    The tracker can be shared by the builds of several threads, but
+    allocations are traced for the whole process, so the records of
+    concurrent builds include allocations of each other.
+
+    Note:
+        Tracing slows the build down, so the tracker should be used
+        only to find the memory consuming nodes. ``tracemalloc`` is started
+        for the build if it was not started yet, so lazy objects created
+        after the build are not accounted unless ``tracemalloc`` is started
+        by the user. Peak memory is measured with ``tracemalloc.reset_peak``
+        and is ``None`` on python < 3.9.
+
+    Args:
+        budget: maximum peak memory (in bytes) of the node (or retained one
+            on python < 3.9), the build is aborted with ``MemoryError``
+            (as a cause of ``RuntimeError``) right after the factory call
+            which exceeded it
+        rss: if ``True``, change of the resident set size of the process
+            is measured as well (on Linux only, ``None`` otherwise)
+
+    Examples:
+        >>> from hydra_slayer import get_from_params
+        >>> tracker = MemoryTracker()
+        >>> cache = {"_target_": "secrets.token_bytes", "_mode_": "call", "nbytes": 2 ** 20}
+        >>> config = {"data": {"cache": cache}}
+        >>> _ = get_from_params(**config, memory=tracker)
+        >>> node = tracker.nodes[0]
+        >>> node.path, node.name, node.retained >= 2 ** 20
+        ('data.cache', 'secrets.token_bytes', True)
+    """
+
+    def __init__(self, budget: Optional[int] = None, rss: bool = False):
+        self.budget = budget
+        self.rss = rss
+        self._nodes: List[NodeMemory] = []
+        # calls in progress of every thread, see `_calls`
+        self._local = threading.local()
+        # number of the builds in progress and whether `tracemalloc` was started by them
+        self._builds = 0
+        self._started = False
+        self._lock = threading.Lock()
+        self._hooks = BuildHooks()
+        self._hooks.add(BEFORE_CALL, self._before_call)
+        self._hooks.add(AFTER_CALL, self._after_call)
+        self._hooks.add(ON_ERROR, self._on_error)
+
+    @property
+    def _calls(self) -> List[Optional[List[Any]]]:
+        """Stack of the calls in progress in the current thread."""
+        # [traced memory before the call, peak of the call, rss before the call] of the calls,
+        #  calls are nested if factories build configs or materialize lazy objects
+        calls = getattr(self._local, "calls", None)
+        if calls is None:
+            calls = self._local.calls = []
+        return calls
+
+    @property
+    def nodes(self) -> Tuple[NodeMemory, ...]:
+        """Memory records of the called factories, in order of the calls completion."""
+        return tuple(self._nodes)
+
+    def _before_call(self, event: BuildEvent) -> None:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            self._calls.append(None)
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if self._calls and self._calls[-1] is not None:
+            # peak is reset for the nested call, so the outer call keeps its own peak
+            self._calls[-1][1] = max(self._calls[-1][1], peak)
+        if hasattr(tracemalloc, "reset_peak"):  # python 3.9+
+            tracemalloc.reset_peak()
+        self._calls.append([current, current, _get_rss() if self.rss else None])
+
+    def _finish_call(self, event: BuildEvent) -> Optional[NodeMemory]:
+        import tracemalloc
+
+        call = self._calls.pop()
+        if call is None or not tracemalloc.is_tracing():
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        start, call_peak, start_rss = call
+        call_peak = max(call_peak, peak)
+        if self._calls and self._calls[-1] is not None:
+            self._calls[-1][1] = max(self._calls[-1][1], call_peak)
+
+        rss = None
+        if start_rss is not None:
+            end_rss = _get_rss()
+            rss = end_rss - start_rss if end_rss is not None else None
+        node = NodeMemory(
+            path=event.path,
+            name=event.name if isinstance(event.name, str) else repr(event.name),
+            retained=current - start,
+            peak=call_peak - start if hasattr(tracemalloc, "reset_peak") else None,
+            rss=rss,
+        )
+        with self._lock:
+            self._nodes.append(node)
+        return node
+
+    def _after_call(self, event: BuildEvent) -> None:
+        node = self._finish_call(event)
+        if node is None:
+            return
+        used = node.peak if node.peak is not None else node.retained
+        if self.budget is not None and used > self.budget:
+            raise MemoryError(
+                f"Node '{node.path or _ROOT_PATH}' ({node.name}) exceeded memory budget:"
+                f" {used} > {self.budget} bytes"
+            )
+
+    def _on_error(self, event: BuildEvent) -> None:
+        # errors of the resolution are not preceded by `before_call`
+        if event.factory is not None and self._calls:
+            self._finish_call(event)
+
+    def _merge_hooks(self, hooks: Optional[BuildHooks]) -> BuildHooks:
+        """Returns hooks with the callbacks of the ``hooks`` and of the tracker."""
+        merged = BuildHooks()
+        if hooks:
+            merged.update(hooks)
+        merged.update(self._hooks)
+        return merged
+
+    @contextlib.contextmanager
+    def _tracing(self) -> Iterator[None]:
+        """Starts ``tracemalloc`` for the build if it is not started yet."""
+        # `tracemalloc` imports `pickle`, so import it only if needed
+        import tracemalloc
+
+        with self._lock:
+            if self._builds == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started = True
+            self._builds += 1
+        try:
+            yield
+        finally:
+            self._calls.clear()
+            with self._lock:
+                self._builds -= 1
+                # tracing is stopped by the last of the concurrent builds
+                if self._builds == 0 and self._started:
+                    tracemalloc.stop()
+                    self._started = False
+
+    def summary(self, limit: Optional[int] = None, sort_by: str = "peak") -> str:
+        """
+        Returns text table of the node records, the most memory consuming nodes first.
+
+        Args:
+            limit: maximum number of nodes to show, all of them by default
+            sort_by: size to sort nodes by, one of ``'peak'``, ``'retained'`` or ``'rss'``
+
+        Returns:
+            table with sizes in KiB
+
+        Raises:
+            ValueError: if ``sort_by`` is unknown
+        """
+        if sort_by not in _SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort_by}', expected one of {_SORT_KEYS}")
+        nodes = sorted(self.nodes, key=lambda node: getattr(node, sort_by) or 0, reverse=True)
+        nodes = nodes[:limit]
+
+        header = ("path", "factory", *(f"{k} (KiB)" for k in _SORT_KEYS))
+        rows = [
+            (
+                node.path or _ROOT_PATH,
+                node.name,
+                *(
+                    f"{getattr(node, k) / 1024:.1f}" if getattr(node, k) is not None else "-"
+                    for k in _SORT_KEYS
+                ),
+            )
+            for node in nodes
+        ]
+        return _format_table(header, rows, num_text_columns=2)
+
+    def clear(self) -> None:
+        """Removes all the records."""
+        with self._lock:
+            self._nodes.clear()
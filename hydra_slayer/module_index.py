@@ -0,0 +1,331 @@
+from typing import Any, Dict, List, Optional
+import functools
+import importlib
+import os
+import sys
+import types
+
+from hydra_slayer.cache import CacheInfo
+
+__all__ = ["get_module_names", "ModuleIndex"]
+
+# should be increased on any change of the file format
+INDEX_FORMAT_VERSION = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _get_package_distributions() -> Dict[str, List[str]]:
+    """Returns names of the distributions by top-level import names."""
+    try:
+        from importlib import metadata  # python 3.8+
+
+        return metadata.packages_distributions()  # python 3.10+
+    except (ImportError, AttributeError):
+        return {}
+
+
+def _get_package_version(package: str) -> Optional[str]:
+    """
+    Returns version of the distribution(s) providing top-level import package.
+
+    Args:
+        package: name of the top-level import package, e.g. ``yaml``
+
+    Returns:
+        version of the distribution, e.g. of ``PyYAML`` for ``yaml``,
+        or ``None`` if there is no such distribution
+    """
+    try:
+        from importlib import metadata  # python 3.8+
+    except ImportError:
+        return None
+
+    distributions = _get_package_distributions().get(package, None) or [package]
+    versions = []
+    for distribution in sorted(set(distributions)):
+        try:
+            versions.append((distribution, metadata.version(distribution)))
+        except metadata.PackageNotFoundError:
+            pass
+    if not versions:
+        return None
+    if len(versions) == 1:
+        return versions[0][1]
+    # namespace packages can be provided by several distributions
+    return ",".join(f"{distribution}=={version}" for distribution, version in versions)
+
+
+def _get_module_mtime(filename: Optional[str]) -> Optional[int]:
+    try:
+        return os.stat(filename).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+def _get_file_stat(filename: Optional[str]) -> Optional[List[int]]:
+    try:
+        stat = os.stat(filename)
+    except (OSError, TypeError):
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _literal_string(node) -> Optional[str]:
+    """Returns value of the string literal, ``None`` for any other expression."""
+    import ast
+
+    if isinstance(node, ast.Constant):
+        return node.value if isinstance(node.value, str) else None
+    # python 3.7 parses string literals as `ast.Str` (deprecated since python 3.8)
+    if sys.version_info < (3, 8) and isinstance(node, ast.Str):
+        return node.s
+    return None
+
+
+def _literal_names(node) -> Optional[List[str]]:
+    """Returns strings of the list or tuple literal, ``None`` for any other expression."""
+    import ast
+
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _literal_names(node.left), _literal_names(node.right)
+        return left + right if left is not None and right is not None else None
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return None
+
+    names = [_literal_string(element) for element in node.elts]
+    return names if all(name is not None for name in names) else None
+
+
+def _scan_all(source: str) -> Optional[List[str]]:
+    """Returns static value of the module ``__all__`` or ``None`` if it's computed or missing."""
+    import ast
+
+    names = None
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign):
+            targets, value, extend = node.targets, node.value, False
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign)):
+            targets, value = [node.target], node.value
+            extend = isinstance(node, ast.AugAssign)
+        elif any(isinstance(n, ast.Name) and n.id == "__all__" for n in ast.walk(node)):
+            # e.g. `__all__.extend(...)` or conditional definition
+            return None
+        else:
+            continue
+
+        if not any(isinstance(t, ast.Name) and t.id == "__all__" for t in targets):
+            continue
+        values = _literal_names(value) if value is not None else None
+        if values is None or (extend and names is None):
+            return None
+        names = names + values if extend else values
+    return names
+
+
+def get_module_names(name: str) -> Optional[List[str]]:
+    """
+    Returns names listed in the ``__all__`` of the module without importing it.
+
+    The source of the module is parsed and ``__all__`` is taken
+    only if it is a literal list (or tuple) of strings, parent packages
+    of the module are imported to find the source.
+
+    Args:
+        name: dotted path of the module
+
+    Returns:
+        names or ``None`` if they can't be found statically
+        (module is imported already, has no source or ``__all__`` is computed)
+
+    Raises:
+        ModuleNotFoundError: if there is no such module
+
+    Examples:
+        >>> get_module_names("colorsys")[:2]
+        ['rgb_to_yiq', 'yiq_to_rgb']
+    """
+    import importlib.util
+
+    if name in sys.modules:
+        return None
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    try:
+        source = spec.loader.get_source(spec.name)
+    except (AttributeError, ImportError):
+        source = None
+    if source is None:
+        return None
+    return _scan_all(source)
+
+
+class ModuleIndex:
+    """
+    Persistent index of the factories of the modules,
+    lets registries to be built from many modules without importing them.
+
+    For every scanned module the index stores names of its classes
+    and functions, names from its ``__all__``, mtime and size of its file
+    and version of its package. Modules are imported and scanned only
+    if they are not in the index yet or their entries are stale,
+    so changed modules are re-scanned incrementally.
+
+    Args:
+        filename: path to the file to load the index from (if it exists)
+            and to save it to, e.g. with ``.json`` extension
+
+    Examples:
+        >>> from hydra_slayer import Registry
+        >>> index = ModuleIndex()
+        >>> r = Registry()
+        >>> r.add_from_module("tests.foobar", index=index)
+        >>> index.factories("tests.foobar")
+        {'foo': 'tests.foobar:foo'}
+    """
+
+    def __init__(self, filename: Optional[str] = None):
+        self.filename = filename
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, Optional[str]] = {}
+        self._changed = False
+        self._hits = 0
+        self._misses = 0
+        if filename is not None:
+            self._load(filename)
+
+    def _load(self, filename: str) -> None:
+        import json
+
+        try:
+            with open(filename, "r") as stream:
+                state = json.load(stream)
+        except (OSError, ValueError):
+            return
+        if isinstance(state, dict) and state.get("format") == INDEX_FORMAT_VERSION:
+            self._entries = state["modules"]
+
+    def _get_version(self, package: str) -> Optional[str]:
+        if package not in self._versions:
+            self._versions[package] = _get_package_version(package)
+        return self._versions[package]
+
+    @staticmethod
+    def _is_up_to_date(entry: Dict[str, Any], version: Optional[str]) -> bool:
+        return (
+            entry["stat"] is not None
+            and _get_file_stat(entry["file"]) == entry["stat"]
+            and entry["version"] == version
+        )
+
+    def _scan(self, module_name: str, version: Optional[str]) -> Dict[str, Any]:
+        module = importlib.import_module(module_name)
+        names = [
+            k
+            for k, v in module.__dict__.items()
+            if isinstance(v, (type, types.FunctionType))  # classes and functions
+        ]
+        names_all = getattr(module, "__all__", None)
+        filename = getattr(module, "__file__", None)
+        return {
+            "file": filename,
+            "stat": _get_file_stat(filename),
+            "package": module_name.split(".")[0],
+            "version": version,
+            "names": names,
+            "all": list(names_all) if names_all is not None else None,
+        }
+
+    def _get_entry(self, module_name: str) -> Dict[str, Any]:
+        # version is read from the distribution metadata before the module is imported,
+        #  so it doesn't depend on the imported modules
+        version = self._get_version(module_name.split(".")[0])
+        entry = self._entries.get(module_name, None)
+        if entry is not None and self._is_up_to_date(entry, version):
+            self._hits += 1
+            return entry
+
+        self._misses += 1
+        entry = self._scan(module_name, version)
+        self._entries[module_name] = entry
+        self._changed = True
+        return entry
+
+    def factories(self, module_name: str, ignore_all: bool = False) -> Dict[str, str]:
+        """
+        Returns factories of the module, scans the module if needed.
+
+        Args:
+            module_name: dotted path of the module
+            ignore_all: if ``True``, ignores ``__all__`` attribute
+                of the module
+
+        Returns:
+            names of the factories and their ``'module:name'`` paths
+
+        Raises:
+            KeyError: if ``__all__`` of the module has names of
+                objects which are not classes or functions
+        """
+        entry = self._get_entry(module_name)
+        names = entry["names"]
+        if not ignore_all and entry["all"] is not None:
+            missing = set(entry["all"]) - set(names)
+            if missing:
+                raise KeyError(f"Module '{module_name}' has no factories {sorted(missing)}")
+            names = entry["all"]
+        return {name: f"{module_name}:{name}" for name in names}
+
+    def save(self, filename: Optional[str] = None) -> None:
+        """
+        Saves the index to the file if it has changed.
+
+        Args:
+            filename: path to the file, ``filename`` of the index by default
+
+        Raises:
+            ValueError: if there is no file to save to
+        """
+        import json
+        import tempfile
+
+        filename = filename or self.filename
+        if filename is None:
+            raise ValueError("Filename of the index is not provided")
+        if not self._changed and os.path.exists(filename):
+            return
+
+        state = {"format": INDEX_FORMAT_VERSION, "modules": self._entries}
+        # write to temporary file and then rename it, so concurrent readers
+        #  never see partially written file
+        dirname = os.path.dirname(filename) or "."
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(dir=dirname, prefix=".index-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as stream:
+                json.dump(state, stream)
+            os.replace(tmp_filename, filename)
+        finally:
+            # the file is renamed on success
+            if os.path.exists(tmp_filename):
+                os.unlink(tmp_filename)
+        self._changed = False
+
+    def info(self) -> CacheInfo:
+        """Returns number of the modules taken from the index (hits) and of the scanned ones."""
+        return CacheInfo(self._hits, self._misses, None, len(self._entries))
+
+    def __contains__(self, module_name: str) -> bool:
+        """Checks if the module is in the index."""
+        return module_name in self._entries
+
+    def __len__(self) -> int:
+        """Returns number of modules in the index."""
+        return len(self._entries)
+
+
+def _locate_factory(path: str) -> Any:
+    """Returns factory by ``'module:name'`` path."""
+    module_name, name = path.split(":")
+    return getattr(importlib.import_module(module_name), name)
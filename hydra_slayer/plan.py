@@ -0,0 +1,1030 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+from collections import ChainMap, deque
+import contextlib
+import functools
+
+from hydra_slayer import functional as F
+from hydra_slayer.factory import Factory
+from hydra_slayer.hooks import BuildHooks, ON_VAR_STORE
+from hydra_slayer.lazy import LazyProxy
+from hydra_slayer.scope import ScopeCache
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+__all__ = ["Plan", "compile"]
+
+_NO_SLOT = -1
+
+
+def _fill_config(template: Any, values: Any) -> Any:
+    """Returns config subtree by its template, leaves of the template are indices of the slots."""
+    if isinstance(template, dict):
+        return {k: _fill_config(v, values) for k, v in template.items()}
+    if isinstance(template, list):
+        return [_fill_config(v, values) for v in template]
+    return values[template]
+
+
+def _get_config_slots(template: Any) -> List[int]:
+    """Returns indices of the slots of the config subtree template."""
+    slots, stack = [], [template]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+        else:
+            slots.append(current)
+    return slots
+
+
+async def _maybe_await(obj: Any) -> Any:
+    # `inspect` is already imported by `asyncio`
+    import inspect
+
+    return await obj if inspect.isawaitable(obj) else obj
+
+
+class Step:
+    """
+    Base class for a single build step of the :py:class:`Plan`.
+
+    Steps read values of their inputs from the slots of the plan and write
+    the result into the ``out`` slot.
+
+    Args:
+        path: path of the config node built by the step,
+            e.g. ``'model.encoder.layers[3]'``
+        out: index of the slot to store result into
+        inputs: indices of the slots with the inputs of the step
+    """
+
+    __slots__ = ("path", "out", "inputs")
+    kind = "step"
+
+    def __init__(self, path: str, out: int, inputs: Tuple[int, ...]):
+        self.path = path
+        self.out = out
+        self.inputs = inputs
+
+    def run(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Executes the step.
+
+        Args:
+            values: slots of the plan
+            vars_dict: storage of the ``_var_`` aliases
+
+        Raises:
+            NotImplementedError: should be implemented by the step types
+        """
+        raise NotImplementedError()
+
+    async def arun(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Executes the step, awaits results of the factory calls.
+
+        Args:
+            values: slots of the plan
+            vars_dict: storage of the ``_var_`` aliases
+        """
+        self.run(values, vars_dict)
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the step."""
+        return f"{type(self).__name__}(path={self.path!r})"
+
+
+class ListStep(Step):
+    """Step that builds a list from its inputs."""
+
+    __slots__ = ("list_type",)
+    kind = "list"
+
+    def __init__(self, path: str, out: int, inputs: Tuple[int, ...], list_type: type = list):
+        super().__init__(path=path, out=out, inputs=inputs)
+        self.list_type = list_type
+
+    def run(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Executes the step."""
+        items = [values[i] for i in self.inputs]
+        values[self.out] = items if self.list_type is list else self.list_type(items)
+
+
+class DictStep(Step):
+    """Step that builds a dict (without ``_target_``) from its inputs."""
+
+    __slots__ = ("keys", "dict_type")
+    kind = "dict"
+
+    def __init__(
+        self,
+        path: str,
+        out: int,
+        inputs: Tuple[int, ...],
+        keys: Tuple[Any, ...],
+        dict_type: type = dict,
+    ):
+        super().__init__(path=path, out=out, inputs=inputs)
+        self.keys = keys
+        self.dict_type = dict_type
+
+    def build(self, values: List[Any]) -> Dict[Any, Any]:
+        """Returns dict with values of the inputs."""
+        params = {k: values[i] for k, i in zip(self.keys, self.inputs)}
+        return params if self.dict_type is dict else self.dict_type(params)
+
+    def run(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Executes the step."""
+        values[self.out] = self.build(values)
+
+
+class CallStep(Step):
+    """
+    Step that creates an instance by calling the factory.
+
+    Args:
+        path: path of the config node built by the step
+        out: index of the slot to store result into
+        inputs: indices of the slots with the keyword arguments of the factory
+        keys: names of the keyword arguments of the factory
+        name: name of the factory (value of the ``_target_`` key)
+        factory: resolved factory, if ``None`` the factory will be resolved
+            by ``get_factory_func`` on every call
+        get_factory_func: function that returns factory by its name
+        name_input: index of the slot with the name of the factory, used only
+            if the name is not a constant (e.g. built by another step)
+        var_params: names of var-positional and var-keyword parameters
+            of the factory, inspected from the factory signature if not provided
+        lazy: if ``True``, the step creates :py:class:`.lazy.LazyProxy`
+            which calls the factory on the first access
+        scopes: if provided, the instance is created (or taken)
+            in the scope of the factory, see :py:class:`.scope.ScopeCache`
+        hooks: if provided, callbacks of the call events (and of the resolve
+            events, if the factory is resolved by the step),
+            see :py:class:`.hooks.BuildHooks`
+        config: template of the config subtree of the node (with shared params),
+            leaves of the template are indices of the slots, used to identify
+            the instance in the ``scopes``, see :py:meth:`.scope.ScopeCache.call`
+    """
+
+    __slots__ = (
+        "keys",
+        "name",
+        "factory",
+        "get_factory_func",
+        "name_input",
+        "var_positional",
+        "var_keyword",
+        "lazy",
+        "scopes",
+        "hooks",
+        "config",
+    )
+    kind = "call"
+
+    def __init__(
+        self,
+        path: str,
+        out: int,
+        inputs: Tuple[int, ...],
+        keys: Tuple[str, ...],
+        name: Any,
+        factory: Optional[Factory],
+        get_factory_func: Callable,
+        name_input: int = _NO_SLOT,
+        var_params: Optional[Tuple[Optional[str], Optional[str]]] = None,
+        lazy: bool = False,
+        scopes: Optional[ScopeCache] = None,
+        hooks: Optional[BuildHooks] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(path=path, out=out, inputs=inputs)
+        self.keys = keys
+        self.lazy = lazy
+        self.scopes = scopes
+        self.hooks = hooks
+        self.config = config
+        self.name = name
+        self.factory = factory
+        self.get_factory_func = get_factory_func
+        self.name_input = name_input
+        if var_params is None:
+            var_params = F._get_var_params(factory) if factory is not None else (None, None)
+        self.var_positional, self.var_keyword = var_params
+
+    def prepare(self, values: List[Any]) -> Tuple[Any, Factory, Tuple, Dict[str, Any]]:
+        """Returns name of the factory, the factory and arguments to call it with."""
+        kwargs = {k: values[i] for k, i in zip(self.keys, self.inputs)}
+
+        name, factory = self.name, self.factory
+        var_positional, var_keyword = self.var_positional, self.var_keyword
+        if factory is None:
+            if self.name_input != _NO_SLOT:
+                name = values[self.name_input]
+            if self.hooks is None:
+                factory = self.get_factory_func(name)
+            else:
+                factory = self.hooks.resolve(self.get_factory_func, name, self.path)
+            var_positional, var_keyword = F._get_var_params(factory)
+
+        if var_keyword is not None and var_keyword in kwargs:
+            kwargs.update(kwargs.pop(var_keyword))
+        args = tuple(kwargs.pop(var_positional, ())) if var_positional is not None else ()
+        return name, factory, args, kwargs
+
+    def _create(
+        self, name: Any, factory: Factory, args: Tuple, kwargs: Dict[str, Any], values: List[Any]
+    ) -> Any:
+        create = self.scopes.call if self.scopes is not None else F._call_unscoped
+        if (
+            self.scopes is not None
+            and self.config is not None
+            and self.scopes._is_scoped(factory, kwargs)
+        ):
+            config = _fill_config(self.config, values)
+            create = functools.partial(self.scopes.call, config=config)
+        if self.hooks is not None:
+            return self.hooks.call(create, name, factory, args=args, kwargs=kwargs, path=self.path)
+        return create(factory=factory, args=args, kwargs=kwargs)
+
+    def call(self, values: List[Any]) -> Any:
+        """Returns the result of the factory call."""
+        name, factory, args, kwargs = self.prepare(values)
+        try:
+            return self._create(name, factory, args=args, kwargs=kwargs, values=values)
+        except Exception as e:
+            raise RuntimeError(f"Factory '{name}' call failed: args={args} kwargs={kwargs}") from e
+
+    async def acall(self, values: List[Any]) -> Any:
+        """Returns the result of the factory call, awaits it if it is awaitable."""
+        name, factory, args, kwargs = self.prepare(values)
+        try:
+            instance = self._create(name, factory, args=args, kwargs=kwargs, values=values)
+            return await _maybe_await(instance)
+        except Exception as e:
+            raise RuntimeError(f"Factory '{name}' call failed: args={args} kwargs={kwargs}") from e
+
+    def run(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Executes the step."""
+        if self.lazy:
+            # keep only the inputs of the step, not all the values of the plan
+            slots = (*self.inputs, self.name_input)
+            if self.config is not None:
+                slots = (*slots, *_get_config_slots(self.config))
+            inputs = {i: values[i] for i in slots}
+            values[self.out] = LazyProxy(functools.partial(self.call, inputs), name=self.name)
+        else:
+            values[self.out] = self.call(values)
+
+    async def arun(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Executes the step, awaits result of the factory call."""
+        if self.lazy:
+            self.run(values, vars_dict)
+        else:
+            values[self.out] = await self.acall(values)
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the step."""
+        return f"{type(self).__name__}(path={self.path!r}, name={self.name!r})"
+
+
+class VarStep(Step):
+    """
+    Step that handles a config node with ``_var_`` alias.
+
+    If the alias was not defined yet, the node is built by ``define`` step
+    and stored with the alias, otherwise the stored object (or its attribute,
+    or result of its method call) is used.
+
+    Args:
+        path: path of the config node built by the step
+        out: index of the slot to store result into
+        inputs: indices of the slots with the keyword arguments of the node
+        keys: names of the keyword arguments of the node
+        alias: name of the alias
+        attribute_name: name of the attribute of the aliased object to get
+        define: step to build the node if the alias was not defined yet
+        exclusive_error: message of the error to raise if the alias
+            was already defined, but the node has ``_target_`` key
+        hooks: if provided, callbacks of the alias store events,
+            see :py:class:`.hooks.BuildHooks`
+    """
+
+    __slots__ = ("keys", "alias", "attribute_name", "define", "exclusive_error", "hooks")
+    kind = "var"
+
+    def __init__(
+        self,
+        path: str,
+        out: int,
+        inputs: Tuple[int, ...],
+        keys: Tuple[str, ...],
+        alias: str,
+        attribute_name: Optional[str],
+        define: Step,
+        exclusive_error: Optional[str] = None,
+        hooks: Optional[BuildHooks] = None,
+    ):
+        super().__init__(path=path, out=out, inputs=inputs)
+        self.keys = keys
+        self.alias = alias
+        self.attribute_name = attribute_name
+        self.define = define
+        self.exclusive_error = exclusive_error
+        self.hooks = hooks
+
+    def store(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Stores the object built by ``define`` step by alias."""
+        vars_dict[self.alias] = values[self.out]
+        if self.hooks is not None:
+            self.hooks.emit(ON_VAR_STORE, self.path, self.alias, value=values[self.out])
+
+    def get(self, values: List[Any], vars_dict: Dict[str, Any]) -> Any:
+        """Returns already defined object (or its attribute) by alias."""
+        if self.exclusive_error is not None:
+            raise ValueError(self.exclusive_error)
+
+        obj = vars_dict[self.alias]
+        if self.attribute_name is not None:
+            obj_or_callable = getattr(obj, self.attribute_name)
+            if callable(obj_or_callable):
+                kwargs = {k: values[i] for k, i in zip(self.keys, self.inputs)}
+                args, kwargs = F._extract_positional_keyword_vars(obj_or_callable, kwargs=kwargs)
+                obj = obj_or_callable(*args, **kwargs)
+            else:
+                obj = obj_or_callable
+        return obj
+
+    async def arun(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Executes the step, awaits results of the factory or method calls."""
+        if self.alias in vars_dict:
+            values[self.out] = await _maybe_await(self.get(values, vars_dict))
+        else:
+            await self.define.arun(values, vars_dict)
+            self.store(values, vars_dict)
+
+    def run(self, values: List[Any], vars_dict: Dict[str, Any]) -> None:
+        """Executes the step."""
+        if self.alias in vars_dict:
+            values[self.out] = self.get(values, vars_dict)
+        else:
+            self.define.run(values, vars_dict)
+            self.store(values, vars_dict)
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the step."""
+        return f"{type(self).__name__}(path={self.path!r}, alias={self.alias!r})"
+
+
+class Plan:
+    """
+    Compiled config, a flat ordered list of build steps.
+
+    All the config walking, factories resolution and signatures inspection
+    is done once by :py:func:`compile`, so calling the plan only runs the
+    factories. Every call of the plan builds new objects.
+
+    Args:
+        steps: build steps in order of execution
+        slots: initial values of the slots (constants of the config)
+        root: index of the slot with the result
+        paths: mapping of the overridable config leaves to their slots
+        vars_dict: storage of the ``_var_`` aliases to use on every call,
+            if ``None``, new storage is used for each call
+        persist_vars: if ``False``, aliases defined by the call are dropped
+            after the call, aliases of the ``vars_dict`` are still available,
+            otherwise they are stored to the ``vars_dict`` after the call succeeds
+    """
+
+    def __init__(
+        self,
+        steps: Tuple[Step, ...],
+        slots: List[Any],
+        root: int,
+        paths: Mapping[str, int],
+        vars_dict: Optional[Dict[str, Any]] = None,
+        persist_vars: bool = True,
+    ):
+        self._steps = tuple(steps)
+        self._slots = slots
+        self._root = root
+        self._paths = dict(paths)
+        self._vars_dict = vars_dict
+        self._persist_vars = persist_vars
+
+    @property
+    def steps(self) -> Tuple[Step, ...]:
+        """Build steps in order of execution."""
+        return self._steps
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        """Overridable config leaves (by path) and their values."""
+        return {path: self._slots[slot] for path, slot in self._paths.items()}
+
+    def _init_vars(self) -> MutableMapping[str, Any]:
+        if self._vars_dict is None:
+            return {}
+        return ChainMap({}, self._vars_dict)
+
+    def _store_vars(self, vars_dict: MutableMapping[str, Any]) -> None:
+        # aliases are stored after the call, so bounded storage can't evict them during it
+        if self._vars_dict is not None and self._persist_vars:
+            self._vars_dict.update(vars_dict.maps[0])
+
+    def _init_values(self, overrides: Mapping[str, Any]) -> List[Any]:
+        values = list(self._slots)
+        for path, value in overrides.items():
+            slot = self._paths.get(path, None)
+            if slot is None:
+                raise LookupError(f"Plan has no parameter '{path}' to override")
+            values[slot] = value
+        return values
+
+    def run(
+        self, overrides: Optional[Mapping[str, Any]] = None, executor: Optional["Executor"] = None
+    ) -> Any:
+        """Runs the plan.
+
+        Args:
+            overrides: new values of the config leaves by path, e.g.
+                ``{"optimizer.lr": 0.1, "model.layers[0].dim": 8}``,
+                the new values are used as is (without instantiation)
+            executor: executor (e.g. ``ThreadPoolExecutor``) to call factories of
+                independent config subtrees in parallel, if ``None`` factories
+                are called one by one
+
+        Returns:
+            result of the config build
+
+        Raises:
+            LookupError: if there is no overridable config leaf with given path
+        """  # noqa: DAR402
+        values = self._init_values(overrides or {})
+        vars_dict = self._init_vars()
+        if executor is not None:
+            _run_parallel(self._steps, values, vars_dict, executor=executor)
+        else:
+            for step in self._steps:
+                step.run(values, vars_dict)
+        self._store_vars(vars_dict)
+        return values[self._root]
+
+    def _run_with_vars(
+        self, overrides: Mapping[str, Any], vars_dict: MutableMapping[str, Any]
+    ) -> Any:
+        """Runs the plan with the storage of the aliases of the build (e.g. of a registry)."""
+        values = self._init_values(overrides)
+        for step in self._steps:
+            step.run(values, vars_dict)
+        return values[self._root]
+
+    async def arun(self, overrides: Optional[Mapping[str, Any]] = None) -> Any:
+        """Runs the plan in the event loop.
+
+        Coroutine functions are awaited, as well as any other awaitable
+        results of the factories (or methods called with ``_var_``).
+        Independent config subtrees are built concurrently,
+        ``_var_`` aliases are defined before they are used.
+
+        Args:
+            overrides: new values of the config leaves by path,
+                see :py:meth:`run`
+
+        Returns:
+            result of the config build with all awaitables awaited
+        """
+        values = self._init_values(overrides or {})
+        vars_dict = self._init_vars()
+        await _run_async(self._steps, values, vars_dict)
+        self._store_vars(vars_dict)
+        return values[self._root]
+
+    def __call__(self, **overrides: Any) -> Any:
+        """Runs the plan, see :py:meth:`run`.
+
+        Args:
+            **overrides: new values of the config leaves by path, e.g.
+                ``plan(**{"optimizer.lr": 0.1, "model.layers[0].dim": 8})``
+
+        Returns:
+            result of the config build
+        """
+        return self.run(overrides)
+
+    def __len__(self) -> int:
+        """Returns number of build steps."""
+        return len(self._steps)
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the plan."""
+        return f"{type(self).__name__}(steps={len(self._steps)})"
+
+
+def _get_dependencies(steps: Tuple[Step, ...], vars_dict: Dict[str, Any]) -> List[List[int]]:
+    """Returns indices of the steps which must be completed before each step."""
+    producers = {step.out: i for i, step in enumerate(steps)}
+    # alias -> index of the step which defines it, `None` for already defined aliases
+    definitions = dict.fromkeys(vars_dict)
+
+    dependencies = []
+    for i, step in enumerate(steps):
+        step_dependencies = [producers[slot] for slot in step.inputs if slot in producers]
+        if isinstance(step, VarStep):
+            if step.alias not in definitions:
+                definitions[step.alias] = i
+            elif definitions[step.alias] is not None:
+                step_dependencies.append(definitions[step.alias])
+        dependencies.append(step_dependencies)
+    return dependencies
+
+
+def _run_parallel(
+    steps: Tuple[Step, ...], values: List[Any], vars_dict: Dict[str, Any], executor: "Executor"
+) -> None:
+    """Runs steps as soon as their dependencies are ready, factories are called by executor."""
+    # `concurrent.futures` is heavy to import, so import it only if needed
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    dependencies = _get_dependencies(steps, vars_dict)
+    num_pending = [len(d) for d in dependencies]
+    dependents = [[] for _ in steps]
+    for i, step_dependencies in enumerate(dependencies):
+        for j in step_dependencies:
+            dependents[j].append(i)
+
+    ready = deque(i for i, n in enumerate(num_pending) if n == 0)
+    running = {}
+
+    def _complete(index: int) -> None:
+        for i in dependents[index]:
+            num_pending[i] -= 1
+            if num_pending[i] == 0:
+                ready.append(i)
+
+    try:
+        while ready or running:
+            while ready:
+                i = ready.popleft()
+                step = steps[i]
+                if isinstance(step, (CallStep, VarStep)):
+                    running[executor.submit(step.run, values, vars_dict)] = i
+                else:
+                    # building of lists and dicts is cheaper than scheduling
+                    step.run(values, vars_dict)
+                    _complete(i)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+                _complete(running.pop(future))
+    except BaseException:
+        # do not leave factories running after the build has failed
+        for future in running:
+            future.cancel()
+        wait(running)
+        raise
+
+
+async def _run_async(
+    steps: Tuple[Step, ...], values: List[Any], vars_dict: Dict[str, Any]
+) -> None:
+    """Runs every step as a task which waits for the tasks of its dependencies."""
+    # `asyncio` is heavy to import, so import it only if needed
+    import asyncio
+
+    dependencies = _get_dependencies(steps, vars_dict)
+    tasks = []
+
+    async def _run_step(index: int) -> None:
+        if dependencies[index]:
+            await asyncio.gather(*(tasks[i] for i in dependencies[index]))
+        await steps[index].arun(values, vars_dict)
+
+    # dependencies always precede the step, so all of them are created
+    #  before any task starts
+    tasks.extend(asyncio.ensure_future(_run_step(i)) for i in range(len(steps)))
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+@contextlib.contextmanager
+def _get_executor(executor: Optional["Executor"], max_workers: Optional[int]):
+    """Yields executor to use, creates thread pool if only ``max_workers`` is provided."""
+    if executor is not None or max_workers is None:
+        yield executor
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        yield pool
+
+
+class _Compiler:
+    def __init__(
+        self,
+        factory_key: str,
+        get_factory_func: Callable,
+        shared_params: Dict[str, Any],
+        var_key: str,
+        attrs_delimiter: str,
+        lazy_key: str = F.DEFAULT_LAZY_KEY,
+        lazy: bool = False,
+        scopes: Optional[ScopeCache] = None,
+        hooks: Optional[BuildHooks] = None,
+    ):
+        self.factory_key = factory_key
+        self.get_factory_func = get_factory_func
+        self.var_key = var_key
+        self.attrs_delimiter = attrs_delimiter
+        self.lazy_key = lazy_key
+        self.lazy = lazy
+        self.scopes = scopes
+        self.hooks = hooks
+
+        self.steps: List[Step] = []
+        self.slots: List[Any] = []
+        self.paths: Dict[str, int] = {}
+        self.consts = set()
+        self.consumed = set()
+        # shared params are not built and can't be overridden
+        self.shared = {k: self.add_const(v) for k, v in shared_params.items()}
+
+    def add_const(self, value: Any, path: Optional[str] = None) -> int:
+        self.slots.append(value)
+        slot = len(self.slots) - 1
+        self.consts.add(slot)
+        if path is not None:
+            self.paths[path] = slot
+        return slot
+
+    def add_step(self, step_cls: type, path: str, inputs: Tuple[int, ...], **kwargs) -> Step:
+        self.slots.append(None)
+        step = step_cls(path=path, out=len(self.slots) - 1, inputs=inputs, **kwargs)
+        self.steps.append(step)
+        return step
+
+    def compile_node(self, node: Any, path: str) -> int:
+        # post-order traversal with explicit stack, so configs of any depth are supported
+        outputs = []
+        # templates of the config subtrees to identify scoped instances by,
+        #  ``None`` if the subtree has aliases
+        templates = []
+        stack = [(node, path, False)]
+        while stack:
+            node, path, expanded = stack.pop()
+            if not isinstance(node, (dict, list)):
+                outputs.append(self.add_const(node, path))
+                templates.append(outputs[-1])
+                continue
+
+            keys = list(node.keys() if isinstance(node, dict) else range(len(node)))
+            if not expanded:
+                stack.append((node, path, True))
+                stack.extend((node[k], F._join_path(path, k), False) for k in reversed(keys))
+                continue
+
+            inputs = tuple(outputs[len(outputs) - len(keys) :])
+            del outputs[len(outputs) - len(keys) :]
+            children = templates[len(templates) - len(keys) :]
+            del templates[len(templates) - len(keys) :]
+            template = None
+            if all(t is not None for t in children):
+                if isinstance(node, list):
+                    template = children
+                elif self.var_key not in node:
+                    template = dict(zip(keys, children))
+            if isinstance(node, list):
+                out = self.add_step(ListStep, path, inputs, list_type=type(node)).out
+            else:
+                params = dict(zip(keys, inputs))
+                out = self.compile_dict(params, path, dict_type=type(node), template=template)
+            outputs.append(out)
+            templates.append(template)
+        return outputs[0]
+
+    def const_value(self, slot: int, key: str, path: str) -> Any:
+        if slot not in self.consts:
+            raise TypeError(f"`{key}` of '{path}' must be a constant to compile the config")
+        # the value is consumed on compilation, so it can't be overridden
+        self.consumed.add(slot)
+        return self.slots[slot]
+
+    def make_call(
+        self,
+        kwargs: Dict[str, int],
+        path: str,
+        lazy: bool,
+        lazy_lookup: bool,
+        template: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        kwargs = dict(kwargs)
+        name_slot = kwargs.pop(self.factory_key)
+        if self.scopes is None or template is None or self.var_key in self.shared:
+            config = None
+        else:
+            # shared params are constants, so their slots are the leaves of the template
+            config = {**self.shared, **template}
+        call_kwargs = {
+            "keys": tuple(kwargs),
+            "get_factory_func": self.get_factory_func,
+            "lazy": bool(lazy),
+            "scopes": self.scopes,
+            "hooks": self.hooks,
+            "config": config,
+        }
+
+        if name_slot not in self.consts:
+            call_kwargs.update(name=None, factory=None, name_input=name_slot)
+            return {**call_kwargs, "inputs": (*kwargs.values(), name_slot)}
+
+        name = self.const_value(name_slot, self.factory_key, path)
+        if name is None:
+            raise TypeError(
+                f"get_instance() missing at least 1 required argument: '{self.factory_key}'"
+            )
+        if lazy:
+            # the factory is not even resolved until the first access
+            call_kwargs.update(name=name, factory=None)
+            return {**call_kwargs, "inputs": tuple(kwargs.values())}
+        try:
+            if self.hooks is None:
+                factory = self.get_factory_func(name)
+            else:
+                factory = self.hooks.resolve(
+                    self.get_factory_func, name, path, report_error=not lazy_lookup
+                )
+        except LookupError:
+            # factory of the node with alias might be not required at all
+            if not lazy_lookup:
+                raise
+            factory = None
+        call_kwargs.update(name=name, factory=factory)
+        return {**call_kwargs, "inputs": tuple(kwargs.values())}
+
+    def compile_dict(
+        self,
+        params: Dict[Any, int],
+        path: str,
+        dict_type: type = dict,
+        template: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        # use additional dict to handle 'multiple values for keyword argument'
+        kwargs = {**self.shared, **params}
+
+        params.pop(self.var_key, None)
+        params.pop(self.lazy_key, None)
+        lazy_slot = kwargs.pop(self.lazy_key, None)
+        lazy = self.lazy if lazy_slot is None else self.const_value(lazy_slot, self.lazy_key, path)
+        alias_slot = kwargs.pop(self.var_key, None)
+        alias = "" if alias_slot is None else self.const_value(alias_slot, self.var_key, path)
+        alias, attribute_name = (
+            alias.split(self.attrs_delimiter) if self.attrs_delimiter in alias else (alias, None)
+        )
+
+        has_factory = self.factory_key in kwargs
+        if not alias:
+            if has_factory:
+                step_kwargs = self.make_call(
+                    kwargs, path, lazy=lazy, lazy_lookup=False, template=template
+                )
+                return self.add_step(CallStep, path, **step_kwargs).out
+            inputs, keys = tuple(params.values()), tuple(params)
+            return self.add_step(DictStep, path, inputs, keys=keys, dict_type=dict_type).out
+
+        # steps are created by hand as `define` step shares output slot with `var` step
+        self.slots.append(None)
+        out = len(self.slots) - 1
+        if has_factory:
+            call_kwargs = self.make_call(kwargs, path, lazy=lazy, lazy_lookup=True)
+            define = CallStep(path=path, out=out, **call_kwargs)
+            exclusive_error = (
+                f"`{self.factory_key}` and `{self.var_key}` (in get mode) keywords are exclusive"
+            )
+        else:
+            define = DictStep(
+                path=path,
+                out=out,
+                inputs=tuple(params.values()),
+                keys=tuple(params),
+                dict_type=dict_type,
+            )
+            exclusive_error = None
+        step = VarStep(
+            path=path,
+            out=out,
+            inputs=tuple(kwargs.values()),
+            keys=tuple(kwargs),
+            alias=alias,
+            attribute_name=attribute_name,
+            define=define,
+            exclusive_error=exclusive_error,
+            hooks=self.hooks,
+        )
+        self.steps.append(step)
+        return out
+
+    def compile(  # noqa: A003
+        self,
+        config: Dict[str, Any],
+        vars_dict: Optional[Dict[str, Any]],
+        persist_vars: bool = True,
+    ) -> Plan:
+        root = self.compile_node(config, "")
+        paths = {p: s for p, s in self.paths.items() if s not in self.consumed}
+        return Plan(
+            steps=self.steps,
+            slots=self.slots,
+            root=root,
+            paths=paths,
+            vars_dict=vars_dict,
+            persist_vars=persist_vars,
+        )
+
+
+def _split_config(config: Any) -> Tuple[Optional[Tuple], Dict[str, Any]]:
+    """Returns structure of the config and its leaves by path, see :py:class:`_Compiler`."""
+    # structure is types and keys of the dicts and lists of the config,
+    #  ``None`` if paths of the leaves are ambiguous
+    structure, leaves, num_leaves = [], {}, 0
+    # the same traversal as of the compiler, so the paths are the same
+    stack = [(config, "")]
+    while stack:
+        node, path = stack.pop()
+        if not isinstance(node, (dict, list)):
+            structure.append(None)
+            leaves[path] = node
+            num_leaves += 1
+            continue
+        keys = tuple(node.keys() if isinstance(node, dict) else range(len(node)))
+        structure.append((type(node), keys))
+        stack.extend((node[k], F._join_path(path, k)) for k in reversed(keys))
+    # e.g. ``{"a.b": 1, "a": {"b": 2}}``
+    return (tuple(structure) if len(leaves) == num_leaves else None), leaves
+
+
+def _compile(
+    factory_key: str,
+    get_factory_func: Callable,
+    config: Dict[str, Any],
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    vars_dict: Optional[Dict[str, Any]],
+    cache_dir: Optional[str] = None,
+    lazy_key: str = F.DEFAULT_LAZY_KEY,
+    lazy: bool = False,
+    scopes: Optional[ScopeCache] = None,
+    persist_vars: bool = True,
+    hooks: Optional[BuildHooks] = None,
+) -> Plan:
+    if cache_dir is not None:
+        # import only if needed, as it requires `json` and `hashlib`
+        from hydra_slayer.plan_cache import compile_cached
+
+        return compile_cached(
+            factory_key=factory_key,
+            get_factory_func=get_factory_func,
+            config=config,
+            shared_params=shared_params,
+            var_key=var_key,
+            attrs_delimiter=attrs_delimiter,
+            vars_dict=vars_dict,
+            cache_dir=cache_dir,
+            lazy_key=lazy_key,
+            lazy=lazy,
+            scopes=scopes,
+            persist_vars=persist_vars,
+            hooks=hooks,
+        )
+
+    compiler = _Compiler(
+        factory_key=factory_key,
+        get_factory_func=get_factory_func,
+        shared_params=shared_params,
+        var_key=var_key,
+        attrs_delimiter=attrs_delimiter,
+        lazy_key=lazy_key,
+        lazy=lazy,
+        scopes=scopes,
+        hooks=hooks,
+    )
+    return compiler.compile(config, vars_dict=vars_dict, persist_vars=persist_vars)
+
+
+def _get_from_params(
+    factory_key: str,
+    get_factory_func: Callable,
+    params: Dict[str, Any],
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    vars_dict: Dict[str, Any],
+    executor: Optional["Executor"] = None,
+    max_workers: Optional[int] = None,
+    lazy_key: str = F.DEFAULT_LAZY_KEY,
+    lazy: bool = False,
+    scopes: Optional[ScopeCache] = None,
+    hooks: Optional[BuildHooks] = None,
+) -> Any:
+    """Compiles config and runs the plan at once, backend of ``get_from_params`` options."""
+    plan = _compile(
+        factory_key=factory_key,
+        get_factory_func=get_factory_func,
+        config=params,
+        shared_params=shared_params,
+        var_key=var_key,
+        attrs_delimiter=attrs_delimiter,
+        vars_dict=vars_dict,
+        lazy_key=lazy_key,
+        lazy=lazy,
+        scopes=scopes,
+        hooks=hooks,
+    )
+    with _get_executor(executor, max_workers) as executor:
+        return plan.run(executor=executor)
+
+
+async def _aget_from_params(
+    factory_key: str,
+    get_factory_func: Callable,
+    params: Dict[str, Any],
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    vars_dict: Dict[str, Any],
+    lazy_key: str = F.DEFAULT_LAZY_KEY,
+    scopes: Optional[ScopeCache] = None,
+    hooks: Optional[BuildHooks] = None,
+) -> Any:
+    """Compiles config and runs the plan at once in the event loop."""
+    plan = _compile(
+        factory_key=factory_key,
+        get_factory_func=get_factory_func,
+        config=params,
+        shared_params=shared_params,
+        var_key=var_key,
+        attrs_delimiter=attrs_delimiter,
+        vars_dict=vars_dict,
+        lazy_key=lazy_key,
+        scopes=scopes,
+        hooks=hooks,
+    )
+    return await plan.arun()
+
+
+def compile(  # noqa: A001
+    config: Dict[str, Any],
+    shared_params: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+) -> Plan:
+    """
+    Compiles config into a :py:class:`Plan`, which creates instances
+    like :py:func:`.functional.get_from_params` would do.
+
+    Args:
+        config: config to compile
+        shared_params: params to pass on all levels in case of
+            recursive creation
+        cache_dir: directory to store compiled plans in, if the plan
+            for the config was already stored (e.g. by another process)
+            it will be loaded instead of compiling the config again,
+            stale plans are rebuilt, see :py:mod:`.plan_cache`
+
+    Returns:
+        compiled plan
+
+    Examples:
+        >>> plan = compile({"_target_": "tests.foobar.foo", "_mode_": "call", "a": 1, "b": 2})
+        >>> plan()
+        {'a': 1, 'b': 2}
+        >>> plan(b=3)
+        {'a': 1, 'b': 3}
+    """
+    return _compile(
+        factory_key=F.DEFAULT_FACTORY_KEY,
+        get_factory_func=F.get_factory,
+        config=config,
+        shared_params=shared_params or {},
+        var_key=F.DEFAULT_VAR_KEY,
+        attrs_delimiter=F.DEFAULT_ATTRS_DELIMITER,
+        vars_dict=None,
+        cache_dir=cache_dir,
+    )
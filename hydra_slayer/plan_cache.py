@@ -0,0 +1,440 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import warnings
+
+from hydra_slayer import functional as F, plan as P
+from hydra_slayer.factory import Factory
+from hydra_slayer.hooks import BuildHooks
+from hydra_slayer.module_index import _get_module_mtime, _get_package_version
+from hydra_slayer.resolver import locate
+from hydra_slayer.scope import ScopeCache
+
+__all__ = ["load_plan", "save_plan", "plan_cache_file"]
+
+# should be increased on any change of the file format or of the steps semantics
+PLAN_FORMAT_VERSION = 4
+
+
+def _get_dotted_path(obj: Any) -> Optional[str]:
+    """Returns ``'module:qualname'`` path of the object if it can be imported back."""
+    module, qualname = getattr(obj, "__module__", None), getattr(obj, "__qualname__", None)
+    if not isinstance(module, str) or not isinstance(qualname, str) or "<" in qualname:
+        return None
+
+    try:
+        resolved = _locate_dotted_path(f"{module}:{qualname}")
+    except Exception:
+        return None
+    return f"{module}:{qualname}" if resolved is obj or resolved == obj else None
+
+
+def _locate_dotted_path(path: str) -> Any:
+    module_name, qualname = path.split(":")
+    obj = locate(module_name)
+    if obj is None:
+        raise LookupError(f"No module with name '{module_name}'")
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+# types of constants which are restored from the file as is
+_PLAIN_TYPES = (str, bytes, int, float, complex, bool, type(None))
+# types of values which are stored as json values
+_JSON_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_plain_constant(obj: Any) -> bool:
+    """Checks that object is the same (or equal) after storing and loading."""
+    if type(obj) in _PLAIN_TYPES:
+        return True
+    if type(obj) in (tuple, frozenset):
+        return all(_is_plain_constant(v) for v in obj)
+    # classes and functions are stored by reference
+    return _get_dotted_path(obj) is not None
+
+
+def _encode(obj: Any) -> Any:
+    """Returns json value of the object, values of other types are ``[type, payload]`` lists."""
+    if type(obj) in _JSON_TYPES:
+        return obj
+    if type(obj) in (tuple, list):
+        return [type(obj).__name__, [_encode(v) for v in obj]]
+    if type(obj) is dict:
+        # order of the keys is kept, as order of the calls depends on it
+        return ["dict", [[_encode(k), _encode(v)] for k, v in obj.items()]]
+    if type(obj) in (frozenset, set):
+        # order of the items differs between the processes
+        items = sorted((_encode(v) for v in obj), key=lambda v: json.dumps(v, sort_keys=True))
+        return [type(obj).__name__, items]
+    if type(obj) is bytes:
+        return ["bytes", obj.hex()]
+    if type(obj) is complex:
+        return ["complex", [obj.real, obj.imag]]
+    path = _get_dotted_path(obj)
+    if path is None:
+        raise TypeError(f"Object '{obj!r}' can't be stored")
+    return ["ref", path]
+
+
+def _decode(value: Any) -> Any:
+    """Returns object by its json value, see :py:func:`_encode`."""
+    if not isinstance(value, list):
+        return value
+    kind, payload = value
+    if kind in ("tuple", "list", "frozenset", "set"):
+        types = {"tuple": tuple, "list": list, "frozenset": frozenset, "set": set}
+        return types[kind](_decode(v) for v in payload)
+    if kind == "dict":
+        return {_decode(k): _decode(v) for k, v in payload}
+    if kind == "bytes":
+        return bytes.fromhex(payload)
+    if kind == "complex":
+        return complex(*payload)
+    if kind == "ref":
+        # factories and classes are imported by dotted path, nothing else is executed
+        return _locate_dotted_path(payload)
+    raise ValueError(f"Unknown value type: {kind}")
+
+
+def _config_key(
+    factory_key: str,
+    config: Dict[str, Any],
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    lazy_key: str,
+    lazy: bool,
+) -> str:
+    payload = (
+        PLAN_FORMAT_VERSION,
+        sys.version_info[:2],
+        factory_key,
+        var_key,
+        attrs_delimiter,
+        lazy_key,
+        lazy,
+        config,
+        shared_params,
+    )
+    # canonical dump, so the key is the same in any process
+    data = json.dumps(_encode(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _get_dependencies(factories: List[Factory]) -> Dict[str, Any]:
+    """Returns versions of the packages and mtimes of the modules of the factories."""
+    modules = {getattr(f, "__module__", None) for f in factories}
+    modules = sorted(m for m in modules if isinstance(m, str))
+
+    packages = {m.split(".")[0] for m in modules}
+    files = {m: getattr(sys.modules.get(m, None), "__file__", None) for m in modules}
+    return {
+        "packages": {p: _get_package_version(p) for p in sorted(packages)},
+        "modules": {m: (f, _get_module_mtime(f)) for m, f in files.items()},
+    }
+
+
+def _is_up_to_date(dependencies: Dict[str, Any]) -> bool:
+    for package, version in dependencies["packages"].items():
+        if _get_package_version(package) != version:
+            return False
+    for filename, mtime in dependencies["modules"].values():
+        if _get_module_mtime(filename) != mtime:
+            return False
+    return True
+
+
+def _iter_call_steps(steps: Tuple[P.Step, ...]):
+    for step in steps:
+        if isinstance(step, P.VarStep):
+            step = step.define
+        if isinstance(step, P.CallStep):
+            yield step
+
+
+def _step_to_record(step: P.Step) -> Tuple:
+    common = (step.kind, step.path, step.out, step.inputs)
+    if isinstance(step, P.ListStep):
+        return (*common, step.list_type)
+    if isinstance(step, P.DictStep):
+        return (*common, step.keys, step.dict_type)
+    if isinstance(step, P.CallStep):
+        factory_path = _get_dotted_path(step.factory) if step.factory is not None else None
+        if step.factory is not None and factory_path is None and not isinstance(step.name, str):
+            raise TypeError(f"Factory of '{step.path}' can't be stored by name or dotted path")
+        var_params = (step.var_positional, step.var_keyword)
+        return (
+            *common,
+            step.keys,
+            step.name,
+            factory_path,
+            step.name_input,
+            var_params,
+            step.lazy,
+            step.config,
+        )
+    if isinstance(step, P.VarStep):
+        define = _step_to_record(step.define)
+        return (*common, step.keys, step.alias, step.attribute_name, define, step.exclusive_error)
+    raise TypeError(f"Unknown step type: {type(step)}")
+
+
+def _step_from_record(
+    record: Tuple,
+    get_factory_func: Callable,
+    factories: Dict[str, Factory],
+    scopes: Optional[ScopeCache] = None,
+    hooks: Optional[BuildHooks] = None,
+) -> P.Step:
+    kind, path, out, inputs, *rest = record
+    if kind == P.ListStep.kind:
+        (list_type,) = rest
+        return P.ListStep(path=path, out=out, inputs=inputs, list_type=list_type)
+    if kind == P.DictStep.kind:
+        keys, dict_type = rest
+        return P.DictStep(path=path, out=out, inputs=inputs, keys=keys, dict_type=dict_type)
+    if kind == P.CallStep.kind:
+        keys, name, factory_path, name_input, var_params, lazy, config = rest
+        factory = None
+        if factory_path is not None:
+            if factory_path not in factories:
+                factories[factory_path] = _locate_dotted_path(factory_path)
+            factory = factories[factory_path]
+            if isinstance(name, str) and name_input == P._NO_SLOT:
+                # the name might be resolved to another factory now, e.g. by another registry
+                resolved = get_factory_func(name)
+                if resolved is not factory and resolved != factory:
+                    raise LookupError(f"Factory '{name}' is resolved to {resolved!r} now")
+        elif name_input == P._NO_SLOT and not lazy:
+            try:
+                factory = get_factory_func(name)
+            except LookupError:
+                # factory of the node with alias might be not required at all
+                pass
+        return P.CallStep(
+            path=path,
+            out=out,
+            inputs=inputs,
+            keys=keys,
+            name=name,
+            factory=factory,
+            get_factory_func=get_factory_func,
+            name_input=name_input,
+            var_params=var_params if factory is not None else None,
+            lazy=lazy,
+            scopes=scopes,
+            hooks=hooks,
+            config=config,
+        )
+    if kind == P.VarStep.kind:
+        keys, alias, attribute_name, define, exclusive_error = rest
+        return P.VarStep(
+            path=path,
+            out=out,
+            inputs=inputs,
+            keys=keys,
+            alias=alias,
+            attribute_name=attribute_name,
+            define=_step_from_record(
+                define, get_factory_func, factories, scopes=scopes, hooks=hooks
+            ),
+            exclusive_error=exclusive_error,
+            hooks=hooks,
+        )
+    raise TypeError(f"Unknown step kind: {kind}")
+
+
+def plan_cache_file(cache_dir: str, key: str) -> str:
+    """Returns path to the file of the plan with given config key."""
+    return os.path.join(cache_dir, f"plan-{key[:32]}.json")
+
+
+def save_plan(plan: P.Plan, filename: str, key: str) -> None:
+    """
+    Saves plan to the file.
+
+    Plan is stored as json: factories as dotted paths (or by the names
+    from the config if they can't be imported by dotted path) and steps
+    as flat records, so loading the file never runs code of the file.
+
+    Args:
+        plan: plan to save
+        filename: path to the file
+        key: key of the config the plan was compiled from
+
+    Raises:
+        TypeError: if plan can't be stored, e.g. it has factory which
+            is neither importable nor registered by name or
+            config constants which can't be restored as is
+    """
+    # slots of the steps outputs are empty, so only constants are checked
+    for value in plan._slots:
+        if not _is_plain_constant(value):
+            raise TypeError(f"Constant '{value!r}' can't be stored")
+
+    factories = [s.factory for s in _iter_call_steps(plan.steps) if s.factory is not None]
+    state = {
+        "format": PLAN_FORMAT_VERSION,
+        "key": key,
+        "dependencies": _get_dependencies(factories),
+        "steps": [_step_to_record(step) for step in plan.steps],
+        "slots": plan._slots,
+        "root": plan._root,
+        "paths": plan._paths,
+    }
+    try:
+        data = json.dumps({k: _encode(v) for k, v in state.items()}, sort_keys=True)
+    except Exception as e:
+        raise TypeError(f"Plan can't be stored: {e}") from e
+
+    # write to temporary file and then rename it, so concurrent readers
+    #  never see partially written file
+    dirname = os.path.dirname(filename) or "."
+    os.makedirs(dirname, exist_ok=True)
+    fd, tmp_filename = tempfile.mkstemp(dir=dirname, prefix=".plan-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as stream:
+            stream.write(data)
+        os.replace(tmp_filename, filename)
+    finally:
+        # the file is renamed on success
+        if os.path.exists(tmp_filename):
+            os.unlink(tmp_filename)
+
+
+def load_plan(
+    filename: str,
+    key: str,
+    get_factory_func: Callable,
+    vars_dict: Optional[Dict[str, Any]] = None,
+    scopes: Optional[ScopeCache] = None,
+    persist_vars: bool = True,
+    hooks: Optional[BuildHooks] = None,
+) -> Optional[P.Plan]:
+    """
+    Loads plan from the file.
+
+    Args:
+        filename: path to the file
+        key: key of the config the plan is expected to be compiled from
+        get_factory_func: function that returns factory by its name
+        vars_dict: storage of the ``_var_`` aliases to use by the plan
+        scopes: cache of the scoped instances to use by the plan,
+            see :py:class:`.scope.ScopeCache`
+        persist_vars: if ``False``, aliases defined by the plan call
+            are dropped after the call, see :py:class:`.plan.Plan`
+        hooks: callbacks of the build events to use by the plan,
+            see :py:class:`.hooks.BuildHooks`
+
+    Returns:
+        loaded plan or ``None`` if the file is missing or stale
+        (config, package versions or factories modules have changed,
+        or factory names are resolved to other factories)
+    """
+    try:
+        with open(filename, "r", encoding="utf-8") as stream:
+            state = json.load(stream)
+    except Exception:
+        return None
+
+    if (
+        not isinstance(state, dict)
+        or state.get("format") != PLAN_FORMAT_VERSION
+        or state.get("key") != key
+    ):
+        return None
+
+    factories = {}
+    try:
+        if not _is_up_to_date(_decode(state["dependencies"])):
+            return None
+        # referenced classes and functions are imported on decoding
+        state = {k: _decode(v) for k, v in state.items()}
+        steps = [
+            _step_from_record(r, get_factory_func, factories, scopes=scopes, hooks=hooks)
+            for r in state["steps"]
+        ]
+    except Exception:
+        # the file is corrupted, or factory was moved, renamed, is not registered anymore
+        #  or is registered by another one
+        return None
+    return P.Plan(
+        steps=steps,
+        slots=state["slots"],
+        root=state["root"],
+        paths=state["paths"],
+        vars_dict=vars_dict,
+        persist_vars=persist_vars,
+    )
+
+
+def compile_cached(
+    factory_key: str,
+    get_factory_func: Callable,
+    config: Dict[str, Any],
+    shared_params: Dict[str, Any],
+    var_key: str,
+    attrs_delimiter: str,
+    vars_dict: Optional[Dict[str, Any]],
+    cache_dir: str,
+    lazy_key: str = F.DEFAULT_LAZY_KEY,
+    lazy: bool = False,
+    scopes: Optional[ScopeCache] = None,
+    persist_vars: bool = True,
+    hooks: Optional[BuildHooks] = None,
+) -> P.Plan:
+    """Loads compiled plan from the ``cache_dir`` or compiles and saves it."""
+    # warnings point to the caller of `plan.compile()` or `Registry.compile()`
+    #  which call the function by `plan._compile()`
+    compile_kwargs = {
+        "factory_key": factory_key,
+        "get_factory_func": get_factory_func,
+        "config": config,
+        "shared_params": shared_params,
+        "var_key": var_key,
+        "attrs_delimiter": attrs_delimiter,
+        "vars_dict": vars_dict,
+        "lazy_key": lazy_key,
+        "lazy": lazy,
+        "scopes": scopes,
+        "persist_vars": persist_vars,
+        "hooks": hooks,
+    }
+    try:
+        key = _config_key(
+            factory_key=factory_key,
+            config=config,
+            shared_params=shared_params,
+            var_key=var_key,
+            attrs_delimiter=attrs_delimiter,
+            lazy_key=lazy_key,
+            lazy=lazy,
+        )
+    except Exception as e:
+        warnings.warn(f"Compiled plan was not cached: {e}", stacklevel=4)
+        return P._compile(**compile_kwargs)
+
+    filename = plan_cache_file(cache_dir, key)
+    plan = load_plan(
+        filename,
+        key=key,
+        get_factory_func=get_factory_func,
+        vars_dict=vars_dict,
+        scopes=scopes,
+        persist_vars=persist_vars,
+        hooks=hooks,
+    )
+    if plan is not None:
+        return plan
+
+    plan = P._compile(**compile_kwargs)
+    try:
+        save_plan(plan, filename, key=key)
+    except (OSError, TypeError) as e:
+        warnings.warn(f"Compiled plan was not cached: {e}", stacklevel=4)
+    return plan
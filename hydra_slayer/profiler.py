@@ -0,0 +1,276 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import namedtuple
+import os
+import threading
+import time
+
+from hydra_slayer import functional as F, plan as P
+from hydra_slayer.hooks import BuildHooks
+from hydra_slayer.scope import ScopeCache
+
+__all__ = ["BuildProfiler", "NodeProfile"]
+
+# times are in seconds, ``total`` is the sum of all the other times
+NodeProfile = namedtuple(
+    "NodeProfile", ["path", "kind", "name", "resolve", "signature", "call", "children", "total"]
+)
+
+_SORT_KEYS = ("total", "resolve", "signature", "call", "children")
+_ROOT_PATH = "<root>"
+
+
+def _factory_name(name: Any) -> str:
+    if name is None or isinstance(name, str):
+        return name or ""
+    return getattr(name, "__qualname__", repr(name))
+
+
+def _step_name(step: P.Step) -> str:
+    if isinstance(step, P.VarStep):
+        return _step_name(step.define) if isinstance(step.define, P.CallStep) else ""
+    return _factory_name(step.name) if isinstance(step, P.CallStep) else ""
+
+
+def _step_inputs(step: P.Step) -> Tuple[int, ...]:
+    if isinstance(step, P.VarStep):
+        return (*step.define.inputs, *step.inputs)
+    return step.inputs
+
+
+def _format_table(
+    header: Tuple[str, ...], rows: List[Tuple[str, ...]], num_text_columns: int
+) -> str:
+    """Returns table with aligned columns, text columns are aligned left, numbers - right."""
+    widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header))]
+    lines = [
+        "  ".join(
+            value.ljust(width) if i < num_text_columns else value.rjust(width)
+            for i, (value, width) in enumerate(zip(row, widths))
+        ).rstrip()
+        for row in (header, *rows)
+    ]
+    return "\n".join(lines)
+
+
+class _ProfilingCompiler(P._Compiler):
+    """Compiler which measures resolution and inspection of the factories of every node."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # path -> (start, factory is resolved, signature is inspected)
+        self.timings: Dict[str, Tuple[float, float, float]] = {}
+
+    def make_call(
+        self,
+        kwargs: Dict[str, int],
+        path: str,
+        lazy: bool,
+        lazy_lookup: bool,
+        template: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        start = time.perf_counter()
+        call_kwargs = super().make_call(
+            kwargs, path, lazy=lazy, lazy_lookup=lazy_lookup, template=template
+        )
+        resolved = time.perf_counter()
+        # lazy factories and factories with non-constant names are resolved on call
+        if call_kwargs["factory"] is not None:
+            # inspect signature here, so the step doesn't do it on creation
+            call_kwargs["var_params"] = F._get_var_params(call_kwargs["factory"])
+            self.timings[path] = (start, resolved, time.perf_counter())
+        return call_kwargs
+
+
+class BuildProfiler:
+    """
+    Per-node profiler of the config builds.
+
+    For every node of the config (by its path, e.g. ``model.layers[3]``)
+    the profiler records the name of the factory, time to resolve
+    the factory, to inspect its signature, to call it and to build
+    the children of the node. Profiles of several builds are accumulated.
+
+    Note:
+        Profiled configs are built by compiled plan (see :py:func:`.plan.compile`),
+        the result is the same as of the usual build. Factories with
+        non-constant names are resolved on every call, so their resolution
+        is included in the call time, call time of the lazy nodes
+        is the time to create :py:class:`.lazy.LazyProxy`.
+
+    Examples:
+        >>> from hydra_slayer import get_from_params
+        >>> profiler = BuildProfiler()
+        >>> bar = {"_target_": "tests.foobar.bar"}
+        >>> config = {"_target_": "tests.foobar.foo", "a": bar, "b": 2}
+        >>> get_from_params(**config, shared_params={"_mode_": "call"}, profiler=profiler)
+        {'a': None, 'b': 2}
+        >>> [(node.path, node.name) for node in profiler.nodes]
+        [('a', 'tests.foobar.bar'), ('', 'tests.foobar.foo')]
+    """
+
+    def __init__(self):
+        self._nodes: List[NodeProfile] = []
+        self._events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def nodes(self) -> Tuple[NodeProfile, ...]:
+        """Profiles of the built nodes, children precede their parents."""
+        return tuple(self._nodes)
+
+    def _event(
+        self, name: str, category: str, start: float, end: float, **args: Any
+    ) -> Dict[str, Any]:
+        # chrome trace format uses microseconds
+        return {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+
+    def _build(
+        self,
+        factory_key: str,
+        get_factory_func: Callable,
+        params: Dict[str, Any],
+        shared_params: Dict[str, Any],
+        var_key: str,
+        attrs_delimiter: str,
+        vars_dict: Dict[str, Any],
+        lazy_key: str = F.DEFAULT_LAZY_KEY,
+        lazy: bool = False,
+        scopes: Optional[ScopeCache] = None,
+        hooks: Optional[BuildHooks] = None,
+    ) -> Any:
+        """Builds the config step by step and records the timings of the nodes."""
+        compile_start = time.perf_counter()
+        compiler = _ProfilingCompiler(
+            factory_key=factory_key,
+            get_factory_func=get_factory_func,
+            shared_params=shared_params,
+            var_key=var_key,
+            attrs_delimiter=attrs_delimiter,
+            lazy_key=lazy_key,
+            lazy=lazy,
+            scopes=scopes,
+            hooks=hooks,
+        )
+        plan = compiler.compile(params, vars_dict=vars_dict)
+        compile_end = time.perf_counter()
+
+        values = plan._init_values({})
+        vars_dict = plan._init_vars()
+        # out slot -> (total time, start of the subtree)
+        subtrees: Dict[int, Tuple[float, float]] = {}
+        nodes, events = [], []
+        for step in plan.steps:
+            start = time.perf_counter()
+            step.run(values, vars_dict)
+            end = time.perf_counter()
+
+            children = [subtrees.pop(i) for i in _step_inputs(step) if i in subtrees]
+            timings = compiler.timings.get(step.path, None)
+            resolve_start, resolved, inspected = timings or (0.0, 0.0, 0.0)
+            resolve, signature, call = resolved - resolve_start, inspected - resolved, end - start
+            children_time = sum(total for total, _ in children)
+            node = NodeProfile(
+                path=step.path,
+                kind=step.kind,
+                name=_step_name(step),
+                resolve=resolve,
+                signature=signature,
+                call=call,
+                children=children_time,
+                total=resolve + signature + call + children_time,
+            )
+            # node spans the builds of its children
+            first_start = min([start, *(s for _, s in children)])
+            subtrees[step.out] = (node.total, first_start)
+            nodes.append(node)
+
+            path, name = step.path or _ROOT_PATH, node.name
+            events.append(self._event(name or path, "build", first_start, end, path=path))
+            if timings is not None:
+                events.append(self._event(name, "resolve", resolve_start, resolved, path=path))
+                events.append(self._event(name, "signature", resolved, inspected, path=path))
+        build_end = time.perf_counter()
+
+        events.append(self._event("compile", "build", compile_start, compile_end))
+        events.append(self._event("run", "build", compile_end, build_end))
+        with self._lock:
+            self._nodes.extend(nodes)
+            self._events.extend(events)
+        return values[plan._root]
+
+    def summary(self, limit: Optional[int] = None, sort_by: str = "total") -> str:
+        """
+        Returns text table of the node profiles, the slowest nodes first.
+
+        Args:
+            limit: maximum number of nodes to show, all of them by default
+            sort_by: time to sort nodes by, one of ``'total'``, ``'resolve'``,
+                ``'signature'``, ``'call'`` or ``'children'``
+
+        Returns:
+            table with times in milliseconds
+
+        Raises:
+            ValueError: if ``sort_by`` is unknown
+        """
+        if sort_by not in _SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort_by}', expected one of {_SORT_KEYS}")
+        nodes = sorted(self.nodes, key=lambda node: getattr(node, sort_by), reverse=True)
+        nodes = nodes[:limit]
+
+        header = ("path", "kind", "factory", *(f"{k} (ms)" for k in _SORT_KEYS[1:]), "total (ms)")
+        rows = [
+            (
+                node.path or _ROOT_PATH,
+                node.kind,
+                node.name,
+                *(f"{getattr(node, k) * 1e3:.3f}" for k in (*_SORT_KEYS[1:], "total")),
+            )
+            for node in nodes
+        ]
+        return _format_table(header, rows, num_text_columns=3)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Returns the profiles in Chrome trace event format.
+
+        Nodes are complete events (``'X'`` phase) which span the builds
+        of their children, so the trace shows the config tree,
+        resolution and signature inspection of the factories
+        are events of ``'resolve'`` and ``'signature'`` categories.
+
+        Returns:
+            trace, can be saved as json and opened by Perfetto UI
+            or ``chrome://tracing``
+        """
+        with self._lock:
+            events = list(self._events)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, filename: str) -> None:
+        """
+        Saves the profiles to the file in Chrome trace event format.
+
+        Args:
+            filename: path to the file, e.g. with ``.json`` extension
+        """
+        import json
+
+        with open(filename, "w") as stream:
+            json.dump(self.to_chrome_trace(), stream)
+
+    def clear(self) -> None:
+        """Removes all the recorded profiles."""
+        with self._lock:
+            self._nodes.clear()
+            self._events.clear()
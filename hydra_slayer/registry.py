@@ -1,15 +1,55 @@
-from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
-from collections import abc
-import inspect
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+from collections import abc, ChainMap, namedtuple
+import contextlib
+import contextvars
+import importlib
+import threading
+import types
 import warnings
 
-from hydra_slayer import functional as F
+from hydra_slayer import functional as F, plan as P
+from hydra_slayer.cache import _is_same
 from hydra_slayer.factory import Factory
+from hydra_slayer.hooks import BuildHooks
+from hydra_slayer.imports import _import_report, ImportReport
+from hydra_slayer.memo import BuildMemo
+from hydra_slayer.module_index import _locate_factory, get_module_names, ModuleIndex
+from hydra_slayer.scope import DEFAULT_SCOPE_KEY, ScopeCache
+from hydra_slayer.variables import VarStore
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from hydra_slayer.memory import MemoryTracker
+    from hydra_slayer.profiler import BuildProfiler
 
 __all__ = ["Registry"]
 
 LateAddCallback = Callable[["Registry"], None]
 
+# callback and names (or prefixes of the names) of the factories it registers,
+#  callbacks without names and prefixes may register any factory
+_LateAdd = namedtuple("_LateAdd", ["callback", "names", "prefixes"])
+
+# id of the registry -> aliases shared by the builds of the current context,
+#  mappings are replaced (never mutated), ``None`` if there are no scopes
+_VARS_SCOPES: contextvars.ContextVar = contextvars.ContextVar(
+    "hydra_slayer_vars_scopes", default=None
+)
+
 
 class Registry(abc.MutableMapping):
     """
@@ -21,6 +61,16 @@ class Registry(abc.MutableMapping):
             and then refer to that item and reuse it multiple times
         attrs_delimiter: delimiter to use for separation of alias and
             attribute of an instance to get
+        lazy_key: key to use to mark objects to be created lazily
+        scope_key: key to use to set scope of the objects,
+            see :py:class:`.scope.ScopeCache`
+        persist_vars: if ``True``, ``_var_`` aliases defined by the builds
+            are stored in the registry (after the build succeeds)
+            and can be used by the next builds,
+            otherwise aliases live only during the build
+            (aliases stored in :py:attr:`variables` are available anyway)
+        vars_store: storage of the persistent aliases, e.g. bounded
+            or weak one, see :py:class:`.variables.VarStore`
     """
 
     def __init__(
@@ -28,15 +78,29 @@ class Registry(abc.MutableMapping):
         name_key: str = F.DEFAULT_FACTORY_KEY,
         var_key: str = F.DEFAULT_VAR_KEY,
         attrs_delimiter: str = F.DEFAULT_ATTRS_DELIMITER,
+        lazy_key: str = F.DEFAULT_LAZY_KEY,
+        scope_key: str = DEFAULT_SCOPE_KEY,
+        persist_vars: bool = False,
+        vars_store: Optional[VarStore] = None,
     ):
-        self._late_add_callbacks: List[LateAddCallback] = []
+        # writes replace the callbacks and the factories with new objects (copy-and-swap),
+        #  so reads don't need the lock
+        self._lock = threading.RLock()
+        self._late_add_callbacks: Tuple[_LateAdd, ...] = ()
+        self._late_add_running: List[_LateAdd] = []
 
         self.name_key = name_key
         self._factories: Dict[str, Factory] = {}
 
         self.var_key = var_key
         self.attrs_delimiter = attrs_delimiter
-        self._vars_dict = {}
+        self.lazy_key = lazy_key
+        self.persist_vars = persist_vars
+        self._vars = vars_store if vars_store is not None else VarStore()
+        # singleton and thread-local instances of the registry
+        self.scopes = ScopeCache(scope_key=scope_key)
+        # callbacks of the build events, empty hooks are not passed to the builds
+        self.hooks = BuildHooks()
 
     @staticmethod
     def _get_factory_name(f, provided_name: str = None) -> str:
@@ -48,17 +112,101 @@ class Registry(abc.MutableMapping):
                 raise ValueError("Name for lambda factories must be provided")
         return provided_name
 
-    def _do_late_add(self):
-        if self._late_add_callbacks:
-            for cb in self._late_add_callbacks:
-                cb(self)
-            self._late_add_callbacks = []
+    @property
+    def variables(self) -> VarStore:
+        """Persistent ``_var_`` aliases of the registry, can be inspected and cleared."""
+        return self._vars
+
+    @contextlib.contextmanager
+    def vars_scope(self) -> Iterator[MutableMapping[str, Any]]:
+        """
+        Shares ``_var_`` aliases between the builds of the current context
+        (thread or asyncio task), builds in other contexts don't see them.
+        Aliases are dropped on exit from the scope.
+
+        Yields:
+            aliases of the scope
+
+        Examples:
+            >>> r = Registry()
+            >>> config = {"_var_": "x", "_target_": "tests.foobar.grault", "a": 1}
+            >>> with r.vars_scope():
+            ...     _ = r.get_from_params(**config)
+            ...     r.get_from_params(**{"_var_": "x.a"})
+            1
+        """
+        scopes = _VARS_SCOPES.get() or {}
+        parent = scopes.get(id(self), None)
+        scope = ChainMap({}, parent if parent is not None else self._vars)
+        token = _VARS_SCOPES.set({**scopes, id(self): scope})
+        try:
+            yield scope
+        finally:
+            _VARS_SCOPES.reset(token)
+
+    @contextlib.contextmanager
+    def _build_vars(self) -> Iterator[MutableMapping[str, Any]]:
+        """Returns storage of the ``_var_`` aliases for the build."""
+        scope = (_VARS_SCOPES.get() or {}).get(id(self), None)
+        if scope is not None:
+            yield scope
+            return
+        # aliases of the build are dropped with the build, persistent ones are still available
+        vars_dict = ChainMap({}, self._vars)
+        yield vars_dict
+        if self.persist_vars:
+            # aliases are stored after the build, so bounded store can't evict them during it
+            self._vars.update(vars_dict.maps[0])
+
+    def _run_late_add(self, select: Callable[[_LateAdd], bool]) -> None:
+        while True:
+            entry = next(
+                (
+                    e
+                    for e in self._late_add_callbacks
+                    # callbacks registering factories can query the registry
+                    if select(e) and not any(e is r for r in self._late_add_running)
+                ),
+                None,
+            )
+            if entry is None:
+                return
+
+            self._late_add_running.append(entry)
+            try:
+                entry.callback(self)
+            finally:
+                self._late_add_running.pop()
+            # callback is removed only after it has finished, so other threads wait
+            #  for the lock instead of reading half-populated registry
+            self._late_add_callbacks = tuple(e for e in self._late_add_callbacks if e is not entry)
+
+    def _do_late_add(self, name: Optional[str] = None):
+        if not self._late_add_callbacks:
+            return
+        if name is not None and (not isinstance(name, str) or name in self._factories):
+            # factories passed as objects are not registered by the callbacks
+            return
+
+        with self._lock:
+            if name is None:
+                self._run_late_add(lambda e: True)
+                return
+
+            # callbacks which declared the name are called first, then the undeclared ones
+            self._run_late_add(
+                lambda e: (e.names is not None and name in e.names)
+                or (e.prefixes is not None and name.startswith(e.prefixes))
+            )
+            if name not in self._factories:
+                self._run_late_add(lambda e: e.names is None and e.prefixes is None)
 
     def add(
         self,
         factory: Factory = None,
         *factories: Factory,
         name: str = None,
+        scope: str = None,
         **named_factories: Factory,
     ) -> Factory:
         """
@@ -70,6 +218,9 @@ class Registry(abc.MutableMapping):
             factories: more instances
             name: name to use for the first factory instance,
                 if a single instance is passed
+            scope: default scope of the instances of the factories,
+                ``'singleton'``, ``'prototype'`` or ``'thread'``,
+                see :py:class:`.scope.ScopeCache`
             named_factories: factory and their names as keyword arguments
 
         Returns:
@@ -77,6 +228,7 @@ class Registry(abc.MutableMapping):
 
         Raises:
             ValueError: if multiple factories with a single name are provided
+                or the scope is unknown
             LookupError: if factory with provided name is already registered
         """
         if len(factories) > 0 and name is not None:
@@ -90,63 +242,98 @@ class Registry(abc.MutableMapping):
             named_factories.update(new)
 
         if len(named_factories) == 0:
-            warnings.warn("No factories were provided!")
-
-        for name, f in named_factories.items():
-            # self._factories[name] != f is a workaround for
-            # https://github.com/catalyst-team/catalyst/issues/135
-            if name in self._factories and self._factories[name] != f:
-                raise LookupError(
-                    f"Factory with name '{name}' is already present\n"
-                    f"Already registered: '{self._factories[name]}'\n"
-                    f"New: '{f}'"
-                )
-
-        self._factories.update(named_factories)
+            warnings.warn("No factories were provided!", stacklevel=2)
+
+        with self._lock:
+            factories = self._factories
+            for name, f in named_factories.items():
+                # factories[name] != f is a workaround for
+                # https://github.com/catalyst-team/catalyst/issues/135
+                if name in factories and factories[name] != f:
+                    raise LookupError(
+                        f"Factory with name '{name}' is already present\n"
+                        f"Already registered: '{factories[name]}'\n"
+                        f"New: '{f}'"
+                    )
+
+            if scope is not None:
+                for f in named_factories.values():
+                    self.scopes.set_scope(f, scope)
+            self._factories = {**factories, **named_factories}
 
         return factory
 
-    def late_add(self, cb: LateAddCallback):
+    def late_add(
+        self,
+        cb: LateAddCallback,
+        names: Optional[Iterable[str]] = None,
+        prefixes: Optional[Iterable[str]] = None,
+    ):
         """
         Allows to prevent cycle imports by delaying some imports till next
         registry query.
 
+        If the callback declares names (or prefixes of the names)
+        of the factories it registers, it is called only on lookup
+        of these names or on enumeration of the registry
+        (e.g. ``all()`` or ``len()``), otherwise it is called on the first
+        lookup of a name which is not registered yet.
+
         Args:
             cb: callback receives registry and must call it's methods to
                 register factories
+            names: names of the factories registered by the callback
+            prefixes: prefixes of the names of the factories
+                registered by the callback
+
+        Examples:
+            >>> from tests import foobar
+            >>> r = Registry()
+            >>> r.late_add(lambda r: r.add(foobar.foo, foobar.bar), names=["foo", "bar"])
+            >>> r.late_add(lambda r: r.add(foobar.grault), prefixes=["gr"])
+            >>> r.get("foo") is foobar.foo  # only the first callback is called
+            True
+            >>> r.all()  # enumeration calls all the callbacks
+            ('foo', 'bar', 'grault')
         """
-        self._late_add_callbacks.append(cb)
+        names = frozenset(names) if names is not None else None
+        prefixes = tuple(prefixes) if prefixes is not None else None
+        with self._lock:
+            self._late_add_callbacks = (*self._late_add_callbacks, _LateAdd(cb, names, prefixes))
 
     def add_from_module(
         self,
-        module,
+        module: Union[types.ModuleType, str],
         prefix: Union[str, List[str]] = None,
         ignore_all: bool = False,
+        index: Optional[ModuleIndex] = None,
     ) -> None:
         """
         Adds all factories present in module.
         If ``__all__`` attribute is present, takes ony what mentioned in it.
 
+        Module can be passed by dotted path, then it is imported only
+        on the first lookup of one of its factories (or on enumeration
+        of the registry) if names of the factories can be found without
+        importing (see :py:func:`.module_index.get_module_names`),
+        otherwise it is imported at once. With ``index`` names are taken
+        from the index, so the module is imported only if the index
+        has no up-to-date entry for it.
+
         Args:
-            module: module to scan
+            module: module to scan or its dotted path
             prefix: prefix string for all the module's factories.
                 If prefix is a list, all values will be treated as aliases
             ignore_all: if ``True``, ignores ``__all__`` attribute
                 of the module
+            index: persistent index of the modules factories to use
+                for the module passed by dotted path,
+                see :py:class:`.module_index.ModuleIndex`
 
         Raises:
             TypeError: if prefix is not a list or a string
-        """
-        factories = {
-            k: v for k, v in module.__dict__.items() if inspect.isclass(v) or inspect.isfunction(v)
-        }
-
-        if ignore_all:
-            names_to_add = list(factories.keys())
-        else:
-            # filter by __all__ if present
-            names_to_add = getattr(module, "__all__", list(factories.keys()))
-
+            ModuleNotFoundError: if there is no module with given path
+        """  # noqa: DAR402
         if prefix is None:
             prefix = [""]
         elif isinstance(prefix, str):
@@ -157,6 +344,41 @@ class Registry(abc.MutableMapping):
         else:
             raise TypeError(f"Prefix must be a list or a string, got {type(prefix)}")
 
+        if isinstance(module, str) and index is not None:
+            paths = index.factories(module, ignore_all=ignore_all)
+            if not paths:
+                return
+            # factories are imported by their paths on the first lookup
+            self.late_add(
+                lambda r: r.add(
+                    **{f"{p}{k}": _locate_factory(v) for p in prefix for k, v in paths.items()}
+                ),
+                names=[f"{p}{name}" for p in prefix for name in paths],
+            )
+            return
+        if isinstance(module, str):
+            module_name = module
+            names = None if ignore_all else get_module_names(module_name)
+            if names is not None:
+                self.late_add(
+                    lambda r: r.add_from_module(importlib.import_module(module_name), prefix),
+                    names=[f"{p}{name}" for p in prefix for name in names],
+                )
+                return
+            module = importlib.import_module(module_name)
+
+        factories = {
+            k: v
+            for k, v in module.__dict__.items()
+            if isinstance(v, (type, types.FunctionType))  # classes and functions
+        }
+
+        if ignore_all:
+            names_to_add = list(factories.keys())
+        else:
+            # filter by __all__ if present
+            names_to_add = getattr(module, "__all__", list(factories.keys()))
+
         to_add = {f"{p}{name}": factories[name] for p in prefix for name in names_to_add}
         self.add(**to_add)
 
@@ -171,11 +393,11 @@ class Registry(abc.MutableMapping):
         Returns:
             factory by name
         """
-        self._do_late_add()
-
         if name is None:
             return None
 
+        self._do_late_add(name)
+
         res = self._factories.get(name, None)
         if res is None:
             res = F.get_factory(name)
@@ -200,12 +422,27 @@ class Registry(abc.MutableMapping):
             created instance
         """
         instance = F._get_instance(
-            factory_key=self.name_key, get_factory_func=self.get, args=args, kwargs=kwargs
+            factory_key=self.name_key,
+            get_factory_func=self.get,
+            args=args,
+            kwargs=kwargs,
+            scopes=self.scopes,
+            hooks=self.hooks or None,
         )
         return instance
 
     def get_from_params(
-        self, *, shared_params: Optional[Dict[str, Any]] = None, **kwargs
+        self,
+        *,
+        shared_params: Optional[Dict[str, Any]] = None,
+        executor: Optional["Executor"] = None,
+        max_workers: Optional[int] = None,
+        lazy: bool = False,
+        memo: Optional[BuildMemo] = None,
+        profiler: Optional["BuildProfiler"] = None,
+        hooks: Optional[BuildHooks] = None,
+        memory: Optional["MemoryTracker"] = None,
+        **kwargs,
     ) -> Union[Any, Tuple[Any, Mapping[str, Any]]]:
         """
         Creates instance based in configuration dict with ``instantiation_fn``.
@@ -214,21 +451,360 @@ class Registry(abc.MutableMapping):
         Args:
             shared_params: params to pass on all levels in case of
                 recursive creation
+            executor: thread pool executor to build independent config
+                subtrees in parallel, see :py:func:`.functional.get_from_params`
+            max_workers: if provided (and ``executor`` is not), new thread pool
+                with ``max_workers`` threads is used to build independent
+                config subtrees in parallel
+            lazy: if ``True``, all the objects are created lazily,
+                see :py:func:`.functional.get_from_params`
+            memo: if provided, identical subtrees are built once,
+                see :py:class:`.memo.BuildMemo`
+            profiler: if provided, build times of every config node
+                are recorded by the profiler, see :py:class:`.profiler.BuildProfiler`
+            hooks: callbacks of the build events to call in addition
+                to the :py:attr:`hooks` of the registry
+            memory: if provided, memory allocated by every factory call
+                is recorded by the tracker, see :py:class:`.memory.MemoryTracker`
             **kwargs: keyword arguments to be passed into the factory
 
         Returns:
             result of calling ``instantiate_fn(factory, **sub_kwargs)``
+
+        Raises:
+            ValueError: if ``memo`` is used with ``executor`` or ``max_workers``,
+                or ``profiler`` is used with any of them,
+                or ``memory`` is used with ``executor`` or ``max_workers``
         """
-        instance, _ = F._recursive_get_from_params(
+        if memory is not None:
+            if executor is not None or max_workers is not None:
+                raise ValueError("`memory` can't be used with `executor` or `max_workers`")
+            # memory is measured around the factory calls by the hooks of the tracker
+            with memory._tracing():
+                return self.get_from_params(
+                    shared_params=shared_params,
+                    lazy=lazy,
+                    memo=memo,
+                    profiler=profiler,
+                    hooks=memory._merge_hooks(hooks),
+                    **kwargs,
+                )
+        if hooks:
+            hooks, extra_hooks = BuildHooks(), hooks
+            hooks.update(self.hooks)
+            hooks.update(extra_hooks)
+        else:
+            hooks = self.hooks
+        if memo is not None and (executor is not None or max_workers is not None):
+            raise ValueError("`memo` can't be used with `executor` or `max_workers`")
+        if profiler is not None:
+            if memo is not None or executor is not None or max_workers is not None:
+                raise ValueError(
+                    "`profiler` can't be used with `memo`, `executor` or `max_workers`"
+                )
+            with self._build_vars() as vars_dict:
+                return profiler._build(
+                    factory_key=self.name_key,
+                    get_factory_func=self.get,
+                    params=kwargs,
+                    shared_params=shared_params or {},
+                    var_key=self.var_key,
+                    attrs_delimiter=self.attrs_delimiter,
+                    vars_dict=vars_dict,
+                    lazy_key=self.lazy_key,
+                    lazy=lazy,
+                    scopes=self.scopes,
+                    hooks=hooks or None,
+                )
+        if executor is not None or max_workers is not None:
+            with self._build_vars() as vars_dict:
+                return P._get_from_params(
+                    factory_key=self.name_key,
+                    get_factory_func=self.get,
+                    params=kwargs,
+                    shared_params=shared_params or {},
+                    var_key=self.var_key,
+                    attrs_delimiter=self.attrs_delimiter,
+                    vars_dict=vars_dict,
+                    executor=executor,
+                    max_workers=max_workers,
+                    lazy_key=self.lazy_key,
+                    lazy=lazy,
+                    scopes=self.scopes,
+                    hooks=hooks or None,
+                )
+
+        shared_params = shared_params or {}
+        with self._build_vars() as vars_dict, F._memo_scope(
+            memo, shared_params=shared_params, var_key=self.var_key
+        ):
+            instance, _ = F._iterative_get_from_params(
+                factory_key=self.name_key,
+                get_factory_func=self.get,
+                params=kwargs,
+                shared_params=shared_params,
+                var_key=self.var_key,
+                attrs_delimiter=self.attrs_delimiter,
+                vars_dict=vars_dict,
+                lazy_key=self.lazy_key,
+                lazy=lazy,
+                memo=memo,
+                scopes=self.scopes,
+                hooks=hooks or None,
+            )
+        return instance
+
+    def get_from_params_many(
+        self,
+        configs: Iterable[Dict[str, Any]],
+        *,
+        shared_params: Optional[Dict[str, Any]] = None,
+        lazy: bool = False,
+        memo: Optional[BuildMemo] = None,
+    ) -> Iterator[Any]:
+        """
+        Creates instances for a batch of configs, e.g. for hyperparameter sweeps.
+
+        Configs of the same structure, which differ only in the values
+        of the leaves (e.g. learning rates of a sweep), are compiled once
+        into a :py:class:`.plan.Plan` and the plan is run with the leaves
+        of every config, so the config walking, factories resolution and
+        signatures inspection are done once. Configs are built one by one
+        as the results are consumed, so only one config is built at a time.
+
+        Args:
+            configs: configs to build, can be a generator
+            shared_params: params to pass on all levels in case of
+                recursive creation
+            lazy: if ``True``, all the objects are created lazily,
+                see :py:func:`.functional.get_from_params`
+            memo: if provided, subtrees which are identical across
+                the configs are built once and their instances are shared,
+                see :py:class:`.memo.BuildMemo`, configs are not compiled then,
+                but factories are still resolved once per batch
+
+        Yields:
+            instance for every config, in the order of the configs
+
+        Examples:
+            >>> r = Registry()
+            >>> configs = ({"_target_": "tests.foobar.foo", "a": 1, "b": lr} for lr in (0.1, 0.01))
+            >>> list(r.get_from_params_many(configs, shared_params={"_mode_": "call"}))
+            [{'a': 1, 'b': 0.1}, {'a': 1, 'b': 0.01}]
+        """
+        factories = {}
+
+        def _get_factory(name: Any) -> Optional[Factory]:
+            try:
+                return factories[name]
+            except KeyError:
+                factory = factories[name] = self.get(name)
+                return factory
+            except TypeError:  # unhashable name
+                return self.get(name)
+
+        shared_params = shared_params or {}
+        # structure of the configs -> compiled plan (``None`` if the configs can't be compiled)
+        #  and values of the leaves consumed by the compilation, e.g. names of the factories
+        plans = {}
+
+        def _get_plan(config: Dict[str, Any]) -> Tuple[Optional[P.Plan], Dict[str, Any]]:
+            structure, leaves = P._split_config(config)
+            if structure is None:
+                return None, {}
+
+            plan, consumed = plans.get(structure, (None, None))
+            if consumed is not None and all(_is_same(leaves[p], v) for p, v in consumed.items()):
+                # the config differs only in the values of the overridable leaves
+                return plan, {p: leaves[p] for p in plan._paths} if plan is not None else {}
+
+            try:
+                plan = P._compile(
+                    factory_key=self.name_key,
+                    get_factory_func=_get_factory,
+                    config=config,
+                    shared_params=shared_params,
+                    var_key=self.var_key,
+                    attrs_delimiter=self.attrs_delimiter,
+                    vars_dict=None,
+                    lazy_key=self.lazy_key,
+                    lazy=lazy,
+                    scopes=self.scopes,
+                    hooks=self.hooks or None,
+                )
+            except TypeError:
+                # e.g. alias is built by the config, such configs are built by the traversal
+                plan = None
+            paths = plan._paths if plan is not None else leaves
+            plans[structure] = plan, {p: v for p, v in leaves.items() if p not in paths}
+            return plan, {}
+
+        for config in configs:
+            plan, overrides = _get_plan(config) if memo is None else (None, {})
+            if plan is not None:
+                with self._build_vars() as vars_dict:
+                    instance = plan._run_with_vars(overrides, vars_dict)
+                yield instance
+                continue
+
+            with self._build_vars() as vars_dict, F._memo_scope(
+                memo, shared_params=shared_params, var_key=self.var_key
+            ):
+                instance, _ = F._iterative_get_from_params(
+                    factory_key=self.name_key,
+                    get_factory_func=_get_factory,
+                    params=config,
+                    shared_params=shared_params,
+                    var_key=self.var_key,
+                    attrs_delimiter=self.attrs_delimiter,
+                    vars_dict=vars_dict,
+                    lazy_key=self.lazy_key,
+                    lazy=lazy,
+                    memo=memo,
+                    scopes=self.scopes,
+                    hooks=self.hooks or None,
+                )
+            yield instance
+
+    def iter_from_params(
+        self,
+        *,
+        shared_params: Optional[Dict[str, Any]] = None,
+        lazy: bool = False,
+        memo: Optional[BuildMemo] = None,
+        **kwargs,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Creates instances of the top-level config entries one by one,
+        see :py:func:`.functional.iter_from_params`.
+
+        Args:
+            shared_params: params to pass on all levels in case of
+                recursive creation
+            lazy: if ``True``, all the objects are created lazily,
+                see :py:func:`.functional.get_from_params`
+            memo: if provided, identical subtrees are built once,
+                see :py:class:`.memo.BuildMemo`
+            **kwargs: top-level config entries
+
+        Returns:
+            iterator over keys of the entries and their instances
+
+        Raises:
+            ValueError: if the config has top-level ``name_key`` or ``var_key``
+        """
+        shared_params = shared_params or {}
+        if F._is_single_object(kwargs, shared_params, self.name_key, self.var_key):
+            raise ValueError(
+                F._SINGLE_OBJECT_ERROR.format(factory_key=self.name_key, var_key=self.var_key)
+            )
+        return self._iter_from_params(
+            params=kwargs, shared_params=shared_params, lazy=lazy, memo=memo
+        )
+
+    def _iter_from_params(
+        self,
+        params: Dict[str, Any],
+        shared_params: Dict[str, Any],
+        lazy: bool,
+        memo: Optional[BuildMemo],
+    ) -> Iterator[Tuple[str, Any]]:
+        with self._build_vars() as vars_dict:
+            yield from F._iter_from_params(
+                factory_key=self.name_key,
+                get_factory_func=self.get,
+                params=params,
+                shared_params=shared_params,
+                var_key=self.var_key,
+                attrs_delimiter=self.attrs_delimiter,
+                vars_dict=vars_dict,
+                lazy_key=self.lazy_key,
+                lazy=lazy,
+                memo=memo,
+                scopes=self.scopes,
+                hooks=self.hooks or None,
+            )
+
+    async def aget_from_params(
+        self, *, shared_params: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> Any:
+        """
+        Creates instance based in configuration dict in the event loop,
+        see :py:func:`.functional.aget_from_params`.
+
+        Args:
+            shared_params: params to pass on all levels in case of
+                recursive creation
+            **kwargs: keyword arguments to be passed into the factory
+
+        Returns:
+            result of calling ``instantiate_fn(factory, **sub_kwargs)``
+            with all coroutines awaited
+        """
+        with self._build_vars() as vars_dict:
+            instance = await P._aget_from_params(
+                factory_key=self.name_key,
+                get_factory_func=self.get,
+                params=kwargs,
+                shared_params=shared_params or {},
+                var_key=self.var_key,
+                attrs_delimiter=self.attrs_delimiter,
+                vars_dict=vars_dict,
+                lazy_key=self.lazy_key,
+                scopes=self.scopes,
+                hooks=self.hooks or None,
+            )
+        return instance
+
+    def compile(  # noqa: A003
+        self,
+        config: Dict[str, Any],
+        shared_params: Optional[Dict[str, Any]] = None,
+        cache_dir: Optional[str] = None,
+    ) -> P.Plan:
+        """
+        Compiles config into a :py:class:`.plan.Plan`, which creates instances
+        like :py:meth:`get_from_params` would do.
+
+        Args:
+            config: config to compile
+            shared_params: params to pass on all levels in case of
+                recursive creation
+            cache_dir: directory to store compiled plans in,
+                see :py:func:`.plan.compile`
+
+        Returns:
+            compiled plan
+        """
+        plan = P._compile(
             factory_key=self.name_key,
             get_factory_func=self.get,
-            params=kwargs,
+            config=config,
             shared_params=shared_params or {},
             var_key=self.var_key,
             attrs_delimiter=self.attrs_delimiter,
-            vars_dict=self._vars_dict,
+            vars_dict=self._vars,
+            cache_dir=cache_dir,
+            lazy_key=self.lazy_key,
+            scopes=self.scopes,
+            hooks=self.hooks or None,
+            persist_vars=self.persist_vars,
         )
-        return instance
+        return plan
+
+    def import_report(self, config: Dict[str, Any]) -> ImportReport:
+        """
+        Resolves factories of the config (without calling them) by the registry,
+        including late-add callbacks, and measures time and modules imported
+        by every factory, see :py:func:`.imports.import_report`.
+
+        Args:
+            config: config to resolve factories of
+
+        Returns:
+            import costs of the factories
+        """
+        return _import_report(config, factory_key=self.name_key, get_factory_func=self.get)
 
     def all(self) -> Iterable[str]:
         """Returns list with names of all registered items."""
@@ -262,7 +838,7 @@ class Registry(abc.MutableMapping):
 
     def __contains__(self, name: str):
         """Check if a particular name was registered."""
-        self._do_late_add()
+        self._do_late_add(name)
         return self._factories.__contains__(name)
 
     def __setitem__(self, name: str, factory: Factory) -> None:
@@ -271,4 +847,7 @@ class Registry(abc.MutableMapping):
 
     def __delitem__(self, name: str) -> None:
         """Removes a factory by giving name."""
-        self._factories.pop(name)
+        with self._lock:
+            factories = dict(self._factories)
+            del factories[name]
+            self._factories = factories
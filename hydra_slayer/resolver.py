@@ -0,0 +1,66 @@
+from typing import Any, Optional
+import builtins
+import importlib
+import sys
+
+__all__ = ["locate"]
+
+
+def _import_module(name: str) -> Optional[Any]:
+    """Imports module by name, returns ``None`` if there is no such module."""
+    module = sys.modules.get(name, None)
+    if module is not None:
+        return module
+
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        # the module itself is missing (and not one of its imports)
+        if e.name == name and name not in sys.modules:
+            return None
+        raise
+
+
+def locate(path: str) -> Optional[Any]:
+    """Locates an object by its dotted path, importing modules as needed.
+
+    Lightweight replacement for :py:func:`pydoc.locate`: the longest importable
+    prefix of the path is imported as a module and the rest of the path is
+    looked up as (nested) attributes, names without importable prefix are
+    looked up in :py:mod:`builtins`.
+
+    Args:
+        path: dotted path to the object, e.g. ``'pkg.module.Class.attr'``
+
+    Returns:
+        located object or ``None`` if nothing was found
+
+    Raises:
+        Exception: any error raised while importing a module that exists
+            (unlike :py:func:`pydoc.locate`, errors are not wrapped)
+
+    Examples:
+        >>> locate("int")
+        <class 'int'>
+        >>> locate("collections.OrderedDict.fromkeys")  # doctest: +ELLIPSIS
+        <built-in method fromkeys of type object at ...>
+        >>> locate("collections.NoSuchThing") is None
+        True
+    """  # noqa: DAR402
+    parts = [part for part in path.split(".") if part]
+
+    obj, n = None, 0
+    while n < len(parts):
+        module = _import_module(".".join(parts[: n + 1]))
+        if module is None:
+            break
+        obj, n = module, n + 1
+
+    if obj is None:
+        obj = builtins
+    for part in parts[n:]:
+        try:
+            obj = getattr(obj, part)
+        except AttributeError:
+            return None
+    return obj
@@ -0,0 +1,308 @@
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+import itertools
+import threading
+
+from hydra_slayer.cache import CacheInfo
+from hydra_slayer.factory import Factory, metafactory_factory
+from hydra_slayer.lazy import LazyProxy
+
+__all__ = ["ScopeCache", "SINGLETON", "PROTOTYPE", "THREAD"]
+
+SINGLETON = "singleton"
+PROTOTYPE = "prototype"
+THREAD = "thread"
+DEFAULT_SCOPE_KEY = "_scope_"
+
+DisposeCallback = Callable[[Any], None]
+
+_SCOPES = (SINGLETON, PROTOTYPE, THREAD)
+_NOT_FOUND = object()
+
+
+class ScopeCache:
+    """
+    Cache of the instances created in ``singleton`` and ``thread`` scopes.
+
+    Scope of the instance is set by the ``'_scope_'`` key of the config node
+    or by the default scope of the factory (see :py:meth:`set_scope`):
+
+        * ``prototype`` - new instance is created on every request (default)
+        * ``singleton`` - one instance is created per cache (e.g. per registry)
+        * ``thread`` - one instance is created per cache and thread
+
+    Instances are identified by the factory and canonicalized arguments
+    (order of the keyword arguments doesn't matter, ``1`` and ``True`` are
+    different values, objects which can't be hashed are compared by identity).
+    Instances built from the config are identified by the canonicalized
+    config subtree as well, so arguments built from the nested configs
+    (which are new objects on every build) don't prevent reuse.
+    Each instance is created exactly once, even if requested from several
+    threads at the same time.
+
+    Args:
+        scope_key: key to use to set the scope of the config node
+        dispose: callback called with the instance when it is evicted
+            from the cache, for factories without own callback
+
+    Examples:
+        >>> from hydra_slayer import Registry
+        >>> r = Registry()
+        >>> config = {"_target_": "tests.foobar.grault", "_scope_": "singleton", "a": "localhost"}
+        >>> r.get_from_params(**config) is r.get_from_params(**config)
+        True
+        >>> r.scopes.info()
+        CacheInfo(hits=1, misses=1, maxsize=None, currsize=1)
+    """
+
+    def __init__(self, scope_key: str = DEFAULT_SCOPE_KEY, dispose: DisposeCallback = None):
+        self.scope_key = scope_key
+        self.dispose = dispose
+        # id of the factory -> (factory, scope, dispose), factories are stored to keep ids unique
+        self._factories: Dict[int, Tuple[Factory, str, Optional[DisposeCallback]]] = {}
+        # key -> (instance, factory, arguments), arguments are stored to keep ids unique
+        self._objects: Dict[Hashable, Tuple[Any, Factory, Any]] = {}
+        # key of the config subtree -> (key of the instance, objects pinned by the config key)
+        self._config_keys: Dict[Hashable, Tuple[Hashable, List[Any]]] = {}
+        self._creation_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        # ids of the threads can be reused, so every thread gets its own number
+        self._local = threading.local()
+        self._thread_numbers = itertools.count()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _check_scope(scope: str) -> None:
+        if scope not in _SCOPES:
+            raise ValueError(f"Unknown scope '{scope}', expected one of {_SCOPES}")
+
+    def set_scope(
+        self, factory: Factory, scope: str, dispose: Optional[DisposeCallback] = None
+    ) -> None:
+        """
+        Sets default scope of the factory.
+
+        Args:
+            factory: factory to set scope for
+            scope: ``'singleton'``, ``'prototype'`` or ``'thread'``
+            dispose: callback called with the instance of the factory
+                when it is evicted from the cache
+
+        Raises:
+            ValueError: if the scope is unknown
+        """  # noqa: DAR402
+        self._check_scope(scope)
+        with self._lock:
+            self._factories[id(factory)] = (factory, scope, dispose)
+
+    def get_scope(self, factory: Factory) -> str:
+        """Returns default scope of the factory."""
+        entry = self._factories.get(id(factory), None)
+        return entry[1] if entry is not None else PROTOTYPE
+
+    def _may_be_scoped(self, kwargs: Mapping[str, Any]) -> bool:
+        """Checks if the instance can be cached, without resolving the factory."""
+        if self.scope_key in kwargs:
+            return kwargs[self.scope_key] != PROTOTYPE
+        return bool(self._factories)
+
+    def _is_scoped(self, factory: Factory, kwargs: Mapping[str, Any]) -> bool:
+        """Checks if the instance of the factory is cached, so its config is needed."""
+        scope = kwargs[self.scope_key] if self.scope_key in kwargs else self.get_scope(factory)
+        return scope != PROTOTYPE
+
+    def _thread_number(self) -> int:
+        number = getattr(self._local, "number", None)
+        if number is None:
+            number = self._local.number = next(self._thread_numbers)
+        return number
+
+    def _key(self, value: Any, pinned: List[Any]) -> Hashable:
+        if type(value) in (list, tuple):
+            return type(value), tuple(self._key(v, pinned) for v in value)
+        if type(value) is dict:
+            return dict, frozenset((k, self._key(v, pinned)) for k, v in value.items())
+        try:
+            # hash of the proxy would create the proxied object
+            if type(value) is not LazyProxy:
+                hash(value)
+                return type(value), value
+        except TypeError:
+            pass
+        # keep the object alive while its id is used by the key
+        pinned.append(value)
+        return "id", id(value)
+
+    def _config_key(
+        self, scope: str, factory: Factory, config: Dict[str, Any], pinned: List[Any]
+    ) -> Hashable:
+        owner = self._thread_number() if scope == THREAD else None
+        return scope, owner, self._key(factory, pinned), self._key(config, pinned)
+
+    def _lookup(self, factory: Factory, config: Dict[str, Any]) -> Any:
+        """Returns instance built from the config subtree, so the subtree is not built again."""
+        scope = config[self.scope_key] if self.scope_key in config else self.get_scope(factory)
+        if scope not in (SINGLETON, THREAD):
+            # unknown scope is reported by the build
+            return _NOT_FOUND
+
+        config_key = self._config_key(scope, factory, config, [])
+        with self._lock:
+            found = self._config_keys.get(config_key, None)
+            entry = self._objects.get(found[0], None) if found is not None else None
+            if entry is None:
+                return _NOT_FOUND
+            self._hits += 1
+        return entry[0]
+
+    def call(
+        self,
+        factory: Factory,
+        args: Tuple,
+        kwargs: Mapping[str, Any],
+        config: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Returns instance of the factory in its scope, creates it if needed.
+
+        Args:
+            factory: factory to call
+            args: positional arguments of the factory
+            kwargs: keyword arguments of the factory, ``scope_key``
+                sets scope of the instance
+            config: config subtree (with shared params and without aliases)
+                the arguments are built from, if provided, the instance
+                is identified by the subtree as well
+
+        Returns:
+            cached or created instance
+
+        Raises:
+            ValueError: if the scope is unknown or the factory returns
+                awaitable in ``singleton`` or ``thread`` scope
+        """
+        scope = self.get_scope(factory)
+        if self.scope_key in kwargs:
+            kwargs = dict(kwargs)
+            scope = kwargs.pop(self.scope_key)
+            self._check_scope(scope)
+        if scope == PROTOTYPE:
+            return metafactory_factory(factory=factory, args=args, kwargs=kwargs)
+
+        config_key = None
+        if config is not None:
+            config_pinned = [factory]
+            config_key = self._config_key(scope, factory, config, config_pinned)
+            with self._lock:
+                found = self._config_keys.get(config_key, None)
+                entry = self._objects.get(found[0], None) if found is not None else None
+                if entry is not None:
+                    self._hits += 1
+                    return entry[0]
+
+        pinned = [factory]
+        owner = self._thread_number() if scope == THREAD else None
+        key = scope, owner, self._key(factory, pinned), self._key((args, kwargs), pinned)
+
+        entry = self._objects.get(key, None)
+        if entry is None:
+            with self._lock:
+                lock = self._creation_locks.setdefault(key, threading.Lock())
+            with lock:
+                entry = self._objects.get(key, None)
+                if entry is None:
+                    try:
+                        instance = metafactory_factory(factory=factory, args=args, kwargs=kwargs)
+                        if hasattr(instance, "__await__"):
+                            if hasattr(instance, "close"):
+                                instance.close()
+                            raise ValueError(
+                                f"Awaitable can't be cached in '{scope}' scope, "
+                                f"use '{PROTOTYPE}' scope for the coroutine functions"
+                            )
+                        with self._lock:
+                            self._objects[key] = (instance, factory, pinned)
+                            if config_key is not None:
+                                self._config_keys[config_key] = (key, config_pinned)
+                            self._misses += 1
+                        return instance
+                    finally:
+                        with self._lock:
+                            self._creation_locks.pop(key, None)
+
+        with self._lock:
+            # the instance was created by another build, e.g. with another config
+            if config_key is not None and key in self._objects:
+                self._config_keys[config_key] = (key, config_pinned)
+            self._hits += 1
+        return entry[0]
+
+    def _dispose(self, entries: List[Tuple[Any, Factory, Any]]) -> None:
+        disposed = set()
+        for instance, factory, _ in entries:
+            # the same instance can be cached by several keys (e.g. in several scopes)
+            if id(instance) in disposed:
+                continue
+            disposed.add(id(instance))
+            factory_entry = self._factories.get(id(factory), None)
+            dispose = factory_entry[2] if factory_entry is not None else None
+            dispose = dispose or self.dispose
+            if dispose is not None:
+                dispose(instance)
+
+    def _evict(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        with self._lock:
+            keys = [k for k, entry in self._objects.items() if predicate(k, entry[0])]
+            entries = [self._objects.pop(k) for k in keys]
+            evicted = set(keys)
+            for config_key in [k for k, v in self._config_keys.items() if v[0] in evicted]:
+                del self._config_keys[config_key]
+        # instances are disposed outside of the lock, so callbacks can use the cache
+        self._dispose(entries)
+        return len(entries)
+
+    def evict(self, instance: Any) -> bool:
+        """
+        Removes the instance from the cache and disposes it.
+
+        Args:
+            instance: instance to remove
+
+        Returns:
+            ``True`` if the instance was cached
+        """
+        return self._evict(lambda key, obj: obj is instance) > 0
+
+    def clear_thread(self) -> int:
+        """
+        Removes instances of the ``thread`` scope created by the current thread,
+        should be called by the thread before it exits.
+
+        Returns:
+            number of removed instances
+        """
+        owner = self._thread_number()
+        return self._evict(lambda key, obj: key[0] == THREAD and key[1] == owner)
+
+    def clear(self) -> int:
+        """
+        Removes and disposes all the instances, resets statistics.
+
+        Returns:
+            number of removed instances
+        """
+        removed = self._evict(lambda key, obj: True)
+        self._hits = self._misses = 0
+        return removed
+
+    def info(self) -> CacheInfo:
+        """Returns number of the reused (hits) and of the created (misses) instances."""
+        return CacheInfo(self._hits, self._misses, None, len(self._objects))
+
+    def __contains__(self, instance: Any) -> bool:
+        """Checks if the instance is cached."""
+        return any(entry[0] is instance for entry in list(self._objects.values()))
+
+    def __len__(self) -> int:
+        """Returns number of cached instances."""
+        return len(self._objects)
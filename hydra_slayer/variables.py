@@ -0,0 +1,97 @@
+from typing import Any, Iterator, Optional
+from collections import abc, OrderedDict
+import threading
+import weakref
+
+__all__ = ["VarStore"]
+
+
+class _WeakRef(weakref.ref):
+    """Weak reference created by the store, so user's weak references are stored as is."""
+
+    __slots__ = ()
+
+
+class VarStore(abc.MutableMapping):
+    """
+    Bounded storage of the persistent ``_var_`` aliases.
+
+    Aliases are evicted in least recently used order
+    if there are more than ``maxsize`` of them. In ``weak`` mode objects
+    are referenced weakly (if possible), so aliases don't keep
+    the objects alive and disappear with them.
+
+    Args:
+        maxsize: maximum number of aliases to store, ``None`` means unbounded
+        weak: if ``True``, objects are stored by weak references,
+            objects which can't be referenced weakly (e.g. ``dict`` or ``int``)
+            are stored as is
+
+    Examples:
+        >>> store = VarStore(maxsize=2)
+        >>> store["a"], store["b"], store["c"] = 1, 2, 3
+        >>> list(store)
+        ['b', 'c']
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, weak: bool = False):
+        self.maxsize = maxsize
+        self.weak = weak
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getitem__(self, alias: str) -> Any:
+        """Returns object by alias, marks the alias as recently used."""
+        with self._lock:
+            obj = self._data[alias]
+            if type(obj) is _WeakRef:
+                obj = obj()
+                if obj is None:
+                    del self._data[alias]
+                    raise KeyError(alias)
+            self._data.move_to_end(alias)
+            return obj
+
+    def __setitem__(self, alias: str, obj: Any) -> None:
+        """Stores object by alias, evicts the least recently used aliases if needed."""
+        if self.weak:
+            try:
+                obj = _WeakRef(obj)
+            except TypeError:
+                pass
+        with self._lock:
+            self._data[alias] = obj
+            self._data.move_to_end(alias)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def __delitem__(self, alias: str) -> None:
+        """Removes the alias."""
+        with self._lock:
+            del self._data[alias]
+
+    def _prune(self) -> None:
+        with self._lock:
+            for alias in [k for k, v in self._data.items() if type(v) is _WeakRef and v() is None]:
+                del self._data[alias]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the aliases of the alive objects, from the least recently used."""
+        self._prune()
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        """Returns number of the aliases of the alive objects."""
+        self._prune()
+        return len(self._data)
+
+    def __contains__(self, alias: object) -> bool:
+        """Checks if there is alive object with the alias, doesn't mark the alias as used."""
+        with self._lock:
+            obj = self._data.get(alias, None)
+            return alias in self._data and (type(obj) is not _WeakRef or obj() is not None)
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the store."""
+        return f"VarStore(aliases={list(self)}, maxsize={self.maxsize}, weak={self.weak})"
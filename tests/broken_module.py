@@ -0,0 +1,2 @@
+# flake8: noqa
+import hydra_slayer_missing_dependency  # imitates a module with missing dependency
@@ -1,5 +1,6 @@
 # flake8: noqa
 from typing import Any
+import asyncio
 
 __all__ = ["foo"]
 
@@ -51,3 +52,16 @@ class fred:
     @classmethod
     def get_from_params(cls, a):
         return cls(a)
+
+
+def xyzzy(barrier, a=None):
+    # can be called only concurrently with other `barrier.parties - 1` calls
+    barrier.wait(timeout=5)
+    return a
+
+
+async def plugh(callback, a=None):
+    callback(("start", a))
+    await asyncio.sleep(0)
+    callback(("end", a))
+    return a
@@ -0,0 +1,142 @@
+# flake8: noqa
+import sys
+import types
+
+import pytest
+
+from hydra_slayer import functional as F
+from hydra_slayer.cache import CacheInfo, ResolutionCache
+from . import foobar
+
+
+class Patched:
+    pass
+
+
+class _Resolver:
+    def __init__(self, objects):
+        self.objects = objects
+        self.calls = []
+
+    def __call__(self, name):
+        self.calls.append(name)
+        return self.objects.get(name, None)
+
+
+def test_cache_hits_and_misses():
+    cache = ResolutionCache(maxsize=8)
+    resolve = _Resolver({"int": int})
+
+    assert cache.get("int", resolve) is int
+    assert cache.get("int", resolve) is int
+    assert resolve.calls == ["int"]
+    assert cache.info() == CacheInfo(hits=1, misses=1, maxsize=8, currsize=1)
+
+
+def test_cache_negative_lookups():
+    cache = ResolutionCache(maxsize=8)
+    resolve = _Resolver({})
+
+    assert cache.get("tests.foobar.corge", resolve) is None
+    assert cache.get("tests.foobar.corge", resolve) is None
+    assert resolve.calls == ["tests.foobar.corge"]
+
+
+def test_cache_lru_eviction():
+    cache = ResolutionCache(maxsize=2)
+    resolve = _Resolver({"int": int, "str": str, "float": float})
+
+    cache.get("int", resolve)
+    cache.get("str", resolve)
+    cache.get("int", resolve)  # "str" is the least recently used now
+    cache.get("float", resolve)
+
+    assert "int" in cache and "float" in cache and "str" not in cache
+    assert len(cache) == 2
+
+
+def test_cache_invalidated_on_sys_modules_change():
+    cache = ResolutionCache(maxsize=8)
+    name = "tests._cache_dynamic_module"
+    module = types.ModuleType(name)
+    module.answer = lambda: 42
+    resolve = _Resolver({f"{name}.answer": module.answer})
+
+    # module is not imported yet
+    resolve.objects.clear()
+    assert cache.get(f"{name}.answer", resolve) is None
+
+    sys.modules[name] = module
+    try:
+        resolve.objects[f"{name}.answer"] = module.answer
+        assert cache.get(f"{name}.answer", resolve) is module.answer
+        assert cache.get(f"{name}.answer", resolve) is module.answer
+        assert len(resolve.calls) == 2
+    finally:
+        del sys.modules[name]
+
+    # module was removed, so the entry is stale
+    resolve.objects.clear()
+    assert cache.get(f"{name}.answer", resolve) is None
+    assert len(resolve.calls) == 3
+
+
+def test_cache_negative_lookups_revalidated():
+    cache = ResolutionCache(maxsize=8)
+    name, other = "tests._cache_dynamic_module", "tests._cache_other_module"
+    module = types.ModuleType(name)
+    resolve = _Resolver({})
+
+    sys.modules[other] = types.ModuleType(other)
+    assert cache.get(f"{name}.answer", resolve) is None
+    # the number of imported modules is the same, but the name is resolvable now
+    del sys.modules[other]
+    sys.modules[name] = module
+    try:
+        resolve.objects[f"{name}.answer"] = None
+        assert cache.get(f"{name}.answer", resolve) is None
+        assert cache.get(f"{name}.answer", resolve) is None
+        assert len(resolve.calls) == 2
+
+        # the object was added to the module
+        module.answer = resolve.objects[f"{name}.answer"] = lambda: 42
+        assert cache.get(f"{name}.answer", resolve) is module.answer
+        assert len(resolve.calls) == 3
+    finally:
+        del sys.modules[name]
+
+
+def test_cache_clear():
+    cache = ResolutionCache(maxsize=8)
+    resolve = _Resolver({"int": int})
+
+    cache.get("int", resolve)
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.info() == CacheInfo(hits=0, misses=0, maxsize=8, currsize=0)
+
+
+def test_cache_disabled():
+    cache = ResolutionCache(maxsize=0)
+    resolve = _Resolver({"int": int})
+
+    assert cache.get("int", resolve) is int
+    assert cache.get("int", resolve) is int
+    assert len(resolve.calls) == 2 and len(cache) == 0
+
+
+def test_cache_revalidates_patched_objects(monkeypatch):
+    F.clear_factory_cache()
+    assert F.get_factory("tests.foobar.grault") is foobar.grault
+    monkeypatch.setattr(foobar, "grault", Patched)
+    assert F.get_factory("tests.foobar.grault") is Patched
+    res = F.get_from_params(**{"_target_": "tests.foobar.grault"})
+    assert isinstance(res, Patched)
+
+    monkeypatch.undo()
+    assert F.get_factory("tests.foobar.grault") is foobar.grault
+    # bound methods are new objects on every access, but are still cached
+    F.get_factory("collections.OrderedDict.fromkeys")
+    F.get_factory("collections.OrderedDict.fromkeys")
+    assert F.factory_cache_info().hits >= 1
@@ -1,8 +1,20 @@
 # flake8: noqa
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import sys
+import threading
+import tracemalloc
+import warnings
+import weakref
+
 import pytest
 
+from benchmarks.reference import recursive_get_from_params
 from hydra_slayer import functional as F
 from hydra_slayer.factory import call_meta_factory
+from hydra_slayer.lazy import is_built, LazyProxy, materialize
+from hydra_slayer.memo import BuildMemo
 from . import foobar
 
 
@@ -28,6 +40,64 @@ def test_fail_get_factory():
         F.get_factory("tests.foobar.corge")()
 
 
+def test_get_factory_cache():
+    F.clear_factory_cache()
+
+    F.get_factory("tests.foobar.foo")
+    F.get_factory("tests.foobar.foo")
+    info = F.factory_cache_info()
+    assert info.hits == 1 and info.misses == 1 and info.currsize == 1
+
+    # failed lookups are cached too
+    for _ in range(2):
+        with pytest.raises(LookupError):
+            F.get_factory("tests.foobar.corge")
+    info = F.factory_cache_info()
+    assert info.hits == 2 and info.misses == 2 and info.currsize == 2
+
+    F.clear_factory_cache()
+    assert F.factory_cache_info().currsize == 0
+
+
+def test_var_params_cache():
+    args, kwargs = F._extract_positional_keyword_vars(foobar.qux, {"argss": (1, 2), "b": 3})
+    assert args == (1, 2) and kwargs == {"b": 3}
+    assert F._var_params_cache[foobar.qux] == ("argss", None)
+
+    # bound methods share parameters with the underlying function
+    obj = foobar.grault()
+    F._extract_positional_keyword_vars(obj.waldo, {})
+    assert foobar.grault.waldo in F._var_params_cache
+
+
+def test_var_params_cache_weak_keys():
+    class Quux:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    F._extract_positional_keyword_vars(Quux, {})
+    num_cached = len(F._var_params_cache)
+
+    del Quux
+    gc.collect()
+    assert len(F._var_params_cache) == num_cached - 1
+
+
+def test_no_signature_warns_once_per_factory():
+    class Int(int):
+        pass
+
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter("always")
+        for _ in range(3):
+            F.get_instance(Int, 1)
+
+    assert len(record) == 1
+    assert "No signature found" in str(record[0].message)
+    # the warning points to the code which builds the object
+    assert record[0].filename == __file__
+
+
 def test_instantiations():
     res = F.get_instance("tests.foobar.foo", 1, 2)()
     assert res == {"a": 1, "b": 2}
@@ -380,3 +450,343 @@ def test_fail_get_from_params_on_exclusive_keywords():
             },
             shared_params={"_meta_factory_": call_meta_factory},
         )
+
+
+def test_fail_get_from_params_with_scope():
+    config = {"_target_": "tests.foobar.grault", "_scope_": "singleton", "a": 1}
+    with pytest.raises(RuntimeError, match="grault") as exc_info:
+        F.get_from_params(**config)
+    assert "supported by Registry only" in str(exc_info.value.__cause__)
+
+    with pytest.raises(RuntimeError, match="grault"):
+        F.get_from_params(**config, lazy=True)()
+    with pytest.raises(RuntimeError, match="grault"):
+        F.get_instance("tests.foobar.grault", a=1, _scope_="prototype")
+
+
+def test_get_from_params_parallel():
+    config = {
+        "_target_": "tests.foobar.foo",
+        "a": {
+            "c": [{"_target_": "tests.foobar.foo", "a": 1, "b": 2, "_var_": "x"}],
+            "d": {"_target_": "tests.foobar.foo", "a": {"_var_": "x"}, "b": {"b": 3}},
+        },
+        "b": {"e": {"_target_": "tests.foobar.qux", "argss": [1, 2], "b": {"_var_": "x"}}},
+    }
+    expected = F.get_from_params(**config, shared_params={"_mode_": "call"})
+
+    res = F.get_from_params(**config, shared_params={"_mode_": "call"}, max_workers=4)
+    assert res == expected
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        res = F.get_from_params(**config, shared_params={"_mode_": "call"}, executor=executor)
+    assert res == expected
+
+
+def test_get_from_params_parallel_builds_subtrees_concurrently():
+    barrier = threading.Barrier(3)
+    res = F.get_from_params(
+        **{
+            "a": {"_target_": "tests.foobar.xyzzy", "barrier": barrier, "a": 1},
+            "b": [{"_target_": "tests.foobar.xyzzy", "barrier": barrier, "a": 2}],
+            "c": {"d": {"_target_": "tests.foobar.xyzzy", "barrier": barrier, "a": 3}},
+        },
+        shared_params={"_mode_": "call"},
+        max_workers=3,
+    )
+    assert res == {"a": 1, "b": [2], "c": {"d": 3}}
+
+
+def test_get_from_params_parallel_respects_vars():
+    res = F.get_from_params(
+        **{
+            "a": {"_var_": "x", "_target_": "tests.foobar.grault", "a": 1, "b": 2},
+            "b": {"_var_": "x"},
+            "c": [{"_var_": "x.waldo"}, {"_var_": "x.b"}],
+        },
+        max_workers=4,
+    )
+    assert isinstance(res["a"], foobar.grault) and res["b"] is res["a"]
+    assert res["c"] == [{"a": 1, "b": 2}, 2]
+
+
+def test_fail_get_from_params_parallel():
+    error_msg = "Factory '.+' call failed: args=.+ kwargs=.+"
+    with pytest.raises(RuntimeError, match=error_msg):
+        F.get_from_params(
+            **{
+                "a": {"_target_": "tests.foobar.grault", "b": 1.0},
+                "b": {"_target_": "tests.foobar.grault", "b": 1},
+            },
+            max_workers=2,
+        )
+
+
+def test_aget_from_params():
+    config = {
+        "_target_": "tests.foobar.foo",
+        "a": {"_target_": "tests.foobar.plugh", "callback": id, "a": 1, "_var_": "x"},
+        "b": [{"_var_": "x"}, {"_target_": "tests.foobar.grault", "a": {"_var_": "x"}}],
+    }
+    res = asyncio.run(F.aget_from_params(**config, shared_params={"_mode_": "call"}))
+    assert res["a"] == 1 and res["b"][0] == 1
+    assert isinstance(res["b"][1], foobar.grault) and res["b"][1].a == 1
+
+
+def test_aget_from_params_builds_subtrees_concurrently():
+    log = []
+    plugh = {"_target_": "tests.foobar.plugh", "callback": log.append}
+    res = asyncio.run(
+        F.aget_from_params(
+            **{
+                "a": {**plugh, "a": 1},
+                "b": [{**plugh, "a": 2}],
+                "c": {"_var_": "y", **plugh, "a": 3},
+                "d": {**plugh, "a": {"_var_": "y"}},
+            },
+            shared_params={"_mode_": "call"},
+        )
+    )
+    assert res == {"a": 1, "b": [2], "c": 3, "d": 3}
+    # independent subtrees are started before any of them is finished,
+    #  `d` waits for the `y` alias to be defined
+    assert {a for _, a in log[:3]} == {1, 2, 3} and all(e == "start" for e, _ in log[:3])
+    starts = [i for i, event in enumerate(log) if event == ("start", 3)]
+    assert len(starts) == 2 and starts[0] < log.index(("end", 3)) < starts[1]
+
+
+def test_fail_aget_from_params():
+    error_msg = "Factory '.+' call failed: args=.+ kwargs=.+"
+    with pytest.raises(RuntimeError, match=error_msg):
+        asyncio.run(
+            F.aget_from_params(
+                **{
+                    "a": {"_target_": "tests.foobar.plugh", "callback": id, "a": 1},
+                    "b": {"_target_": "tests.foobar.grault", "b": 1.0},
+                },
+                shared_params={"_mode_": "call"},
+            )
+        )
+
+
+def test_get_from_params_lazy():
+    config = {
+        "a": {"_target_": "tests.foobar.grault", "a": 1, "b": 2},
+        "b": {"_target_": "tests.foobar.no_such_factory"},
+        "c": {"_target_": "tests.foobar.foo", "a": 1, "b": 2, "_lazy_": False},
+    }
+    res = F.get_from_params(**config, shared_params={"_mode_": "call"}, lazy=True)
+
+    # factories are not even resolved before the first access
+    assert type(res["a"]) is LazyProxy and not is_built(res["a"])
+    assert type(res["b"]) is LazyProxy
+    assert res["c"] == {"a": 1, "b": 2} and type(res["c"]) is dict
+
+    assert res["a"].waldo() == {"a": 1, "b": 2} and isinstance(res["a"], foobar.grault)
+    with pytest.raises(LookupError):
+        materialize(res["b"])
+
+
+def test_get_from_params_lazy_node():
+    res = F.get_from_params(
+        **{
+            "a": {"_target_": "tests.foobar.grault", "_lazy_": True, "b": 1.0},
+            "b": {"_var_": "x", "_target_": "tests.foobar.grault", "_lazy_": True, "a": 1},
+            "c": {"_var_": "x.a"},
+            "d": {"_lazy_": True, "e": 1},
+        }
+    )
+    # errors are raised on the first access (and on the next ones)
+    assert type(res["a"]) is LazyProxy
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="Factory '.+' call failed"):
+            res["a"].a
+
+    # aliases store proxies, attributes of the aliases are accessed on build
+    assert type(res["b"]) is LazyProxy and is_built(res["b"])
+    assert res["c"] == 1
+    assert res["d"] == {"e": 1}
+
+
+def test_get_from_params_lazy_keeps_arguments_lazy():
+    res = F.get_from_params(
+        **{
+            "_target_": "tests.foobar.foo",
+            "a": {"_target_": "tests.foobar.grault", "a": 1},
+            "b": {"_target_": "tests.foobar.grault", "a": 2},
+        },
+        shared_params={"_mode_": "call"},
+        lazy=True,
+    )
+    assert type(res) is LazyProxy and res["b"].a == 2
+    # arguments of the lazy object are passed as proxies
+    assert type(res["a"]) is LazyProxy and not is_built(res["a"])
+
+
+def test_get_from_params_lazy_parallel():
+    res = F.get_from_params(
+        **{"a": {"_target_": "tests.foobar.grault"}, "b": {"_target_": "tests.foobar.grault"}},
+        max_workers=2,
+        lazy=True,
+    )
+    assert type(res["a"]) is LazyProxy and not is_built(res["a"])
+    assert res["a"].b == 2 and isinstance(res["b"], foobar.grault)
+
+
+def test_get_from_params_passes_plain_subtrees_by_reference():
+    labels = {f"label_{i}": i for i in range(100)}
+    files = [f"file_{i}.txt" for i in range(100)]
+    config = {
+        "dataset": {"_target_": "tests.foobar.foo", "a": labels, "b": files, "_mode_": "call"},
+        "meta": {"labels": labels, "nested": [files, {"x": 1}]},
+    }
+    res = F.get_from_params(**config)
+
+    assert res["dataset"]["a"] is labels and res["dataset"]["b"] is files
+    assert res["meta"] is config["meta"]
+    # config is not modified
+    assert config["dataset"]["_target_"] == "tests.foobar.foo"
+
+    res = F.get_from_params(**{"a": [files, {"_target_": "tests.foobar.bar"}], "b": labels})
+    assert res["a"][0] is files and res["b"] is labels
+
+
+def test_get_from_params_does_not_copy_payloads():
+    labels = {f"label_{i}": i for i in range(100_000)}
+    config = {"_target_": "tests.foobar.foo", "a": {"labels": labels}, "b": [labels]}
+
+    tracemalloc.start()
+    try:
+        F.get_from_params(**config, shared_params={"_mode_": "call"})
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # a copy of the labels dict takes several megabytes
+    assert peak < 100_000
+
+
+def _build(engine, config, shared_params=None):
+    instance, vars_dict = engine(
+        factory_key=F.DEFAULT_FACTORY_KEY,
+        get_factory_func=F.get_factory,
+        params=config,
+        shared_params=shared_params or {},
+        var_key=F.DEFAULT_VAR_KEY,
+        attrs_delimiter=F.DEFAULT_ATTRS_DELIMITER,
+        vars_dict={},
+    )
+    return instance, vars_dict
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"a": 1, "b": [2, {"c": [3, [4]]}]},
+        {
+            "_target_": "tests.foobar.baz",
+            "args": [
+                {"_target_": "tests.foobar.foo", "a": {"_var_": "x", "b": [1]}, "b": [[2]]},
+                {"_target_": "tests.foobar.foo", "a": {"_var_": "x"}, "b": {"c": [3]}},
+                [{"_var_": "y", "_target_": "tests.foobar.foo", "a": 4, "b": 5}, {"_var_": "y"}],
+                {"_target_": "tests.foobar.foo", "a": 5, "b": {"_target_": "tests.foobar.bar"}},
+            ],
+        },
+        [{"_target_": "tests.foobar.foo", "a": 1, "b": [2]}, {"_target_": "tests.foobar.bar"}],
+    ],
+)
+def test_iterative_get_from_params_same_as_recursive(config):
+    def _meta_factory(factory, args, kwargs):
+        # records order of the factory calls, the original traversal passes args as list
+        calls.append((factory.__name__, tuple(args), kwargs))
+        return factory(*args, **kwargs)
+
+    shared_params = {"_meta_factory_": _meta_factory}
+    calls = []
+    expected = _build(recursive_get_from_params, config, shared_params)
+    expected_calls, calls = calls, []
+
+    assert _build(F._iterative_get_from_params, config, shared_params) == expected
+    assert calls == expected_calls
+
+
+def test_get_from_params_deep_config():
+    depth = 2 * sys.getrecursionlimit()
+    config = {"_target_": "tests.foobar.foo", "a": 0, "b": None, "_mode_": "call"}
+    for i in range(1, depth):
+        config = {"_target_": "tests.foobar.foo", "a": i, "b": [config], "_mode_": "call"}
+
+    for kwargs in ({}, {"memo": BuildMemo()}, {"max_workers": 2}):
+        res = F.get_from_params(**config, **kwargs)
+        for i in reversed(range(1, depth)):
+            assert res["a"] == i
+            res = res["b"][0]
+        assert res == {"a": 0, "b": None}
+
+
+class _Payload:
+    """Raw config value which can be tracked by weak reference."""
+
+
+def _payload_size(payload, size):
+    return size
+
+
+def test_iter_from_params():
+    def _meta_factory(factory, args, kwargs):
+        built.append(kwargs.get("b"))
+        return factory(*args, **kwargs)
+
+    config = {
+        "e0": {
+            "_target_": "tests.foobar.foo",
+            "a": {"_var_": "x", "_target_": "tests.foobar.bar"},
+            "b": 0,
+        },
+        "e1": {"_target_": "tests.foobar.foo", "a": {"_var_": "x"}, "b": 1},
+        "e2": {"_target_": "tests.foobar.foo", "a": {"_var_": "x"}, "b": 2},
+        "e3": [1, 2],
+    }
+    built = []
+    results = F.iter_from_params(**config, shared_params={"_meta_factory_": _meta_factory})
+
+    key, res = next(results)
+    # entries are built on demand
+    assert key == "e0" and built == [None, 0]
+    rest = dict(results)
+    assert list(rest) == ["e1", "e2", "e3"] and built == [None, 0, 1, 2]
+    # aliases are shared between the entries
+    assert rest["e1"]["a"] is rest["e2"]["a"] is res["a"]
+    assert rest["e3"] == [1, 2]
+
+
+def test_iter_from_params_releases_config():
+    payloads = [_Payload() for _ in range(3)]
+    refs = [weakref.ref(p) for p in payloads]
+    config = {
+        f"e{i}": {
+            "_target_": "tests.test_functional._payload_size",
+            "_mode_": "call",
+            "payload": p,
+            "size": i,
+        }
+        for i, p in enumerate(payloads)
+    }
+    results = F.iter_from_params(**config)
+    del payloads, config
+
+    assert next(results) == ("e0", 0)
+    gc.collect()
+    assert refs[0]() is None and refs[1]() is not None and refs[2]() is not None
+
+    assert list(results) == [("e1", 1), ("e2", 2)]
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+
+
+def test_fail_iter_from_params_with_top_level_target():
+    # the config is checked on the call, not on the first iteration
+    with pytest.raises(ValueError):
+        F.iter_from_params(_target_="tests.foobar.foo", a=1, b=2)
+    with pytest.raises(ValueError):
+        F.iter_from_params(a=1, shared_params={"_target_": "tests.foobar.foo"})
@@ -0,0 +1,181 @@
+# flake8: noqa
+import asyncio
+
+import pytest
+
+from hydra_slayer import functional as F
+from hydra_slayer.hooks import BuildHooks
+from hydra_slayer.lazy import materialize
+from hydra_slayer.registry import Registry
+from . import foobar
+
+
+def _fail(a):
+    raise ValueError(a)
+
+
+def _recorder():
+    events, hooks = [], BuildHooks()
+    for event in ("before_resolve", "after_resolve", "before_call", "after_call", "on_var_store"):
+        hooks.add(event, lambda e: events.append((e.event, e.path, e.name)))
+    return events, hooks
+
+
+def _config():
+    return {
+        "model": {
+            "_target_": "tests.foobar.foo",
+            "a": {"_target_": "tests.foobar.quux", "_var_": "head"},
+            "b": [{"_var_": "head"}, {"_target_": "tests.foobar.bar"}],
+        },
+    }
+
+
+def _expected():
+    return [
+        ("before_resolve", "model.a", "tests.foobar.quux"),
+        ("after_resolve", "model.a", "tests.foobar.quux"),
+        ("before_call", "model.a", "tests.foobar.quux"),
+        ("after_call", "model.a", "tests.foobar.quux"),
+        ("on_var_store", "model.a", "head"),
+        ("before_resolve", "model.b[1]", "tests.foobar.bar"),
+        ("after_resolve", "model.b[1]", "tests.foobar.bar"),
+        ("before_call", "model.b[1]", "tests.foobar.bar"),
+        ("after_call", "model.b[1]", "tests.foobar.bar"),
+        ("before_resolve", "model", "tests.foobar.foo"),
+        ("after_resolve", "model", "tests.foobar.foo"),
+        ("before_call", "model", "tests.foobar.foo"),
+        ("after_call", "model", "tests.foobar.foo"),
+    ]
+
+
+def _iterative(config, hooks):
+    return F.get_from_params(**config, shared_params={"_mode_": "call"}, hooks=hooks)
+
+
+def _plan(config, hooks):
+    return F.get_from_params(
+        **config, shared_params={"_mode_": "call"}, hooks=hooks, max_workers=1
+    )
+
+
+@pytest.mark.parametrize("build", [_iterative, _plan])
+def test_events(build):
+    events, hooks = _recorder()
+    res = build(_config(), hooks)
+
+    assert res["model"]["b"] == [{"a": 1, "b": 2}, None]
+    if build is _plan:
+        # factories are resolved on compilation
+        expected = _expected()
+        for resolve in (True, False):
+            assert [e for e in events if ("resolve" in e[0]) == resolve] == [
+                e for e in expected if ("resolve" in e[0]) == resolve
+            ]
+    else:
+        assert events == _expected()
+
+
+def test_event_payload():
+    records, hooks = [], BuildHooks()
+    hooks.add("after_resolve", records.append)
+    hooks.add("after_call", records.append)
+    hooks.add("on_var_store", records.append)
+
+    res = F.get_from_params(**_config(), shared_params={"_mode_": "call"}, hooks=hooks)
+    resolved, called, stored = records[:3]
+    assert resolved.factory is foobar.quux and resolved.value is None
+    assert called.factory is foobar.quux and called.value == {"a": 1, "b": 2}
+    assert stored.value is res["model"]["a"] and stored.factory is None
+    assert all(r.duration >= 0 for r in (resolved, called)) and stored.duration is None
+
+
+def test_errors():
+    errors, hooks = [], BuildHooks()
+    hooks.add("on_error", errors.append)
+
+    config = {"model": {"_target_": "tests.test_hooks._fail", "a": 1, "_mode_": "call"}}
+    with pytest.raises(RuntimeError):
+        F.get_from_params(**config, hooks=hooks)
+    (error,) = errors
+    assert (error.path, error.name, error.factory) == ("model", "tests.test_hooks._fail", _fail)
+    assert isinstance(error.value, ValueError) and error.duration >= 0
+
+    errors.clear()
+    with pytest.raises(LookupError):
+        F.get_from_params(**{"model": {"_target_": "tests.foobar.missing"}}, hooks=hooks)
+    (error,) = errors
+    assert (error.path, error.factory) == ("model", None)
+    assert isinstance(error.value, LookupError)
+
+
+def test_lazy_events():
+    events, hooks = _recorder()
+    config = _config()
+    res = F.get_from_params(**config, shared_params={"_mode_": "call"}, hooks=hooks, lazy=True)
+    assert events == [("on_var_store", "model.a", "head")]
+
+    # factories are resolved and called on the first access
+    res = materialize(res)
+    assert events[1:] == _expected()[-4:]
+    del events[:]
+    materialize(res["model"]["a"])
+    assert events == _expected()[:4]
+
+
+def test_iter_from_params_events():
+    events, hooks = _recorder()
+    bar = {"_target_": "tests.foobar.bar"}
+    config = {"first": bar, "second": [bar]}
+    for _ in F.iter_from_params(**config, hooks=hooks):
+        pass
+    assert [e[1] for e in events if e[0] == "after_call"] == ["first", "second[0]"]
+
+
+def test_registry_hooks():
+    r = Registry()
+    r.add(foobar.foo, foobar.bar, foobar.quux)
+    names = []
+    r.hooks.add("after_call", lambda e: names.append(e.name))
+    config = {"_target_": "foo", "a": {"_target_": "bar"}, "b": {"_target_": "quux"}}
+
+    r.get_from_params(**config, shared_params={"_mode_": "call"})
+    assert names == ["bar", "quux", "foo"]
+
+    names.clear()
+    r.compile(config, shared_params={"_mode_": "call"})()
+    assert names == ["bar", "quux", "foo"]
+
+    names.clear()
+    asyncio.run(r.aget_from_params(**config, shared_params={"_mode_": "call"}))
+    assert sorted(names) == ["bar", "foo", "quux"]
+
+    names.clear()
+    r.get_instance("bar", _mode_="call")
+    assert names == ["bar"]
+
+
+def test_hook_fails_build():
+    def _hook(event):
+        raise KeyError(event.path)
+
+    hooks = BuildHooks()
+    hooks.add("before_call", _hook)
+    with pytest.raises(RuntimeError):
+        F.get_from_params(**_config(), shared_params={"_mode_": "call"}, hooks=hooks)
+
+
+def test_add_remove():
+    hooks = BuildHooks()
+    assert not hooks
+
+    hooks.add("after_call", print)
+    hooks.add("after_call", repr)
+    assert len(hooks) == 2
+    hooks.remove("after_call", print)
+    assert len(hooks) == 1
+
+    with pytest.raises(ValueError):
+        hooks.remove("after_call", print)
+    with pytest.raises(ValueError):
+        hooks.add("after_build", print)
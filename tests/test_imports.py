@@ -0,0 +1,58 @@
+# flake8: noqa
+import sys
+
+from hydra_slayer.functional import clear_factory_cache
+from hydra_slayer.imports import import_report
+from hydra_slayer.registry import Registry
+from . import foobar
+
+
+def _config():
+    return {
+        "model": {
+            "_target_": "tests.foobar.foo",
+            "a": {"_target_": "colorsys.rgb_to_hsv", "_lazy_": True},
+            "b": [{"_target_": "tests.foobar.missing"}, {"_target_": "tests.foobar.foo"}],
+        },
+    }
+
+
+def test_import_report():
+    sys.modules.pop("colorsys", None)
+    clear_factory_cache()
+
+    report = import_report(_config())
+    costs = {target.name: target for target in report.targets}
+    assert list(costs) == [t.name for t in sorted(report.targets, key=lambda t: -t.duration)]
+    assert set(costs) == {"tests.foobar.foo", "colorsys.rgb_to_hsv", "tests.foobar.missing"}
+
+    foo, colorsys, missing = (
+        costs["tests.foobar.foo"],
+        costs["colorsys.rgb_to_hsv"],
+        costs["tests.foobar.missing"],
+    )
+    assert foo.paths == ("model", "model.b[1]") and foo.modules == () and foo.error is None
+    # nothing is instantiated, even lazy nodes
+    assert colorsys.paths == ("model.a",) and colorsys.modules == ("colorsys",)
+    assert isinstance(missing.error, LookupError) and missing.paths == ("model.b[0]",)
+    assert report.modules == ("colorsys",) and report.duration >= colorsys.duration
+
+    lines = report.summary().splitlines()
+    assert lines[0].split()[:3] == ["factory", "paths", "packages"]
+    assert len(lines) == 4 and "LookupError" in report.summary()
+    assert len(report.summary(limit=1).splitlines()) == 2
+
+
+def test_registry_import_report():
+    calls = []
+
+    def _late_add(r):
+        calls.append(1)
+        r.add(foobar.foo)
+
+    r = Registry(name_key="_factory_")
+    r.late_add(_late_add, names=["foo"])
+    report = r.import_report({"a": {"_factory_": "foo"}, "b": {"_target_": "int"}})
+    (target,) = report.targets
+    assert (target.name, target.paths, target.error) == ("foo", ("a",), None)
+    assert calls == [1]
@@ -0,0 +1,113 @@
+# flake8: noqa
+import pytest
+
+from hydra_slayer.incremental import build_graph, rebuild
+from . import foobar
+
+CONFIG = {
+    "db": {"_var_": "db", "_target_": "tests.foobar.grault", "a": "localhost", "b": 5432},
+    "cache": {"_target_": "tests.foobar.grault", "a": {"_var_": "db"}},
+    "model": {
+        "_target_": "tests.foobar.foo",
+        "_mode_": "call",
+        "a": {"_target_": "tests.foobar.grault", "a": [1, 2]},
+        "b": {"lr": 0.1},
+    },
+}
+
+
+def _with(config, path, value):
+    """Returns copy of the config with the value replaced by path."""
+    if len(path) == 1:
+        return {**config, path[0]: value}
+    return {**config, path[0]: _with(config[path[0]], path[1:], value)}
+
+
+def test_build_graph():
+    graph = build_graph(CONFIG)
+    res = graph.result
+
+    assert isinstance(res["db"], foobar.grault) and res["cache"].a is res["db"]
+    assert res["model"]["b"] == {"lr": 0.1} and res["model"]["a"].a == [1, 2]
+    assert graph.objects["model.a"] is res["model"]["a"]
+    assert set(graph.rebuilt) == {
+        "db",
+        "cache.a",
+        "cache",
+        "model.a",
+        "model.a.a",
+        "model.b",
+        "model",
+        "",
+    }
+
+
+def test_rebuild_unchanged_config():
+    graph = build_graph(CONFIG)
+    disposed = []
+    new_graph = rebuild(graph, CONFIG, dispose=lambda path, obj: disposed.append(path))
+
+    assert new_graph.rebuilt == [] and new_graph.result is graph.result
+    assert disposed == []
+
+
+def test_rebuild_changed_leaf():
+    graph = build_graph(CONFIG)
+    disposed = []
+    new_config = _with(CONFIG, ["model", "b", "lr"], 0.01)
+    new_graph = rebuild(graph, new_config, dispose=lambda path, obj: disposed.append((path, obj)))
+
+    old, new = graph.result, new_graph.result
+    assert new["model"]["b"] == {"lr": 0.01}
+    assert new["db"] is old["db"] and new["cache"] is old["cache"]
+    assert new["model"]["a"] is old["model"]["a"]
+    assert new_graph.rebuilt == ["model.b", "model", ""]
+    # `foo` returns dict, so the old model is disposed
+    assert disposed == [("model", old["model"])]
+
+
+def test_rebuild_changed_var_dependency():
+    graph = build_graph(CONFIG)
+    disposed = []
+    new_config = _with(CONFIG, ["db", "b"], 5433)
+    new_graph = rebuild(graph, new_config, dispose=lambda path, obj: disposed.append((path, obj)))
+
+    old, new = graph.result, new_graph.result
+    assert new["db"] is not old["db"] and new["db"].b == 5433
+    # cache references the db by alias, so it is rebuilt as well
+    assert new["cache"] is not old["cache"] and new["cache"].a is new["db"]
+    assert new["model"] is old["model"]
+    assert disposed == [("db", old["db"]), ("cache", old["cache"])]
+
+
+def test_rebuild_changed_factory_and_shared_params():
+    graph = build_graph(CONFIG)
+    new_graph = rebuild(graph, _with(CONFIG, ["model", "a", "_target_"], "tests.foobar.fred"))
+    assert isinstance(new_graph.result["model"]["a"], foobar.fred)
+    assert new_graph.result["db"] is graph.result["db"]
+
+    new_graph = rebuild(graph, CONFIG, shared_params={"b": 1})
+    assert new_graph.result["db"] is not graph.result["db"]
+    assert new_graph.result["model"]["b"] is graph.result["model"]["b"]
+
+
+def test_rebuild_removed_nodes():
+    graph = build_graph(CONFIG)
+    disposed = []
+    new_config = {k: v for k, v in CONFIG.items() if k != "cache"}
+    new_graph = rebuild(graph, new_config, dispose=lambda path, obj: disposed.append(path))
+
+    assert "cache" not in new_graph.result and new_graph.result["db"] is graph.result["db"]
+    assert disposed == ["cache"]
+
+
+def test_fail_rebuild_keeps_previous_graph():
+    graph = build_graph(CONFIG)
+    disposed = []
+    new_config = _with(CONFIG, ["db", "b"], 1.0)
+    with pytest.raises(RuntimeError):
+        rebuild(graph, new_config, dispose=lambda path, obj: disposed.append(path))
+    assert disposed == []
+
+    new_graph = rebuild(graph, CONFIG)
+    assert new_graph.result is graph.result
@@ -0,0 +1,104 @@
+# flake8: noqa
+import copy
+import pickle
+import threading
+import time
+
+import pytest
+
+from hydra_slayer.lazy import is_built, LazyProxy, materialize
+from . import foobar
+
+
+class _Factory:
+    def __init__(self, obj, delay=0.0):
+        self.obj = obj
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.obj
+
+
+def test_proxy_is_built_on_first_access():
+    factory = _Factory({"a": 1})
+    proxy = LazyProxy(factory, name="foo")
+
+    assert factory.calls == 0 and not is_built(proxy)
+    assert repr(proxy) == "<LazyProxy of 'foo' (not built)>"
+
+    assert proxy["a"] == 1
+    assert proxy == {"a": 1} and isinstance(proxy, dict)
+    assert list(proxy) == ["a"] and len(proxy) == 1 and "a" in proxy
+    assert factory.calls == 1 and is_built(proxy)
+    assert repr(proxy) == "{'a': 1}"
+
+
+def test_proxy_forwards_attributes_and_operators():
+    proxy = LazyProxy(lambda: foobar.grault(a=1, b=2))
+    assert proxy.waldo() == {"a": 1, "b": 2}
+
+    proxy.a = 3
+    assert proxy.a == 3 and isinstance(proxy, foobar.grault)
+    assert type(proxy) is LazyProxy
+
+    number = LazyProxy(lambda: 6)
+    assert number + 1 == 7 and 1 + number == 7 and -number == -6 and number // 4 == 1
+    assert hash(number) == hash(6) and [0, 1, 2][LazyProxy(lambda: 1)] == 1
+    assert LazyProxy(lambda: len)([1, 2]) == 2
+
+
+def test_proxy_copies_and_pickles_the_object():
+    proxy = LazyProxy(lambda: [1, [2]])
+
+    assert type(copy.copy(proxy)) is list and copy.deepcopy(proxy) == [1, [2]]
+    assert pickle.loads(pickle.dumps(proxy)) == [1, [2]]
+
+
+def test_proxy_is_built_once_by_concurrent_threads():
+    factory = _Factory(object(), delay=0.05)
+    proxy = LazyProxy(factory)
+
+    results = []
+
+    def _access():
+        results.append(materialize(proxy))
+
+    threads = [threading.Thread(target=_access) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert factory.calls == 1
+    assert len(results) == 8 and all(r is factory.obj for r in results)
+
+
+def test_proxy_is_built_again_after_failure():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError()
+        return 42
+
+    proxy = LazyProxy(factory)
+    with pytest.raises(ValueError):
+        materialize(proxy)
+    assert not is_built(proxy)
+    assert materialize(proxy) == 42 and len(calls) == 2
+
+
+def test_materialize():
+    proxy = LazyProxy(lambda: 42)
+    res = materialize({"a": [proxy, 1], "b": (proxy,), "c": {"d": 2}})
+    assert res == {"a": [42, 1], "b": (42,), "c": {"d": 2}}
+    assert type(res["a"][0]) is int
+
+    # containers without proxies are not copied
+    config = {"a": [1, 2], "b": {"c": 3}}
+    assert materialize(config) is config
+    assert materialize(1) == 1
@@ -0,0 +1,105 @@
+# flake8: noqa
+import pytest
+
+from hydra_slayer import functional as F
+from hydra_slayer.memo import BuildMemo
+from hydra_slayer.registry import Registry
+from . import foobar
+
+
+def test_get_from_params_memo():
+    norm = {"_target_": "tests.foobar.grault", "a": {"c": [1, 2]}, "b": 2}
+    memo = BuildMemo()
+    res = F.get_from_params(
+        **{
+            "a": norm,
+            "b": [{"b": 2, "a": {"c": [1, 2]}, "_target_": "tests.foobar.grault"}],
+            "c": {"_target_": "tests.foobar.foo", "a": dict(norm), "b": norm},
+        },
+        shared_params={"_mode_": "call"},
+        memo=memo,
+    )
+
+    assert isinstance(res["a"], foobar.grault)
+    assert res["b"][0] is res["a"] and res["c"]["a"] is res["a"] and res["c"]["b"] is res["a"]
+    assert memo.info() == (3, 2, None, 2)
+
+
+def test_get_from_params_memo_different_subtrees():
+    memo = BuildMemo()
+    res = F.get_from_params(
+        **{
+            "a": {"_target_": "tests.foobar.grault", "a": 1},
+            "b": {"_target_": "tests.foobar.grault", "a": True},
+            "c": {"_target_": "tests.foobar.grault", "a": 1.5},
+            "d": {"_target_": "tests.foobar.grault", "a": [1]},
+            "e": {"_target_": "tests.foobar.grault", "a": {1}},
+        },
+        memo=memo,
+    )
+    assert len({id(v) for v in res.values()}) == 5
+    assert memo.info().hits == 0 and len(memo) == 5
+
+
+def test_get_from_params_memo_copy():
+    memo = BuildMemo()
+    res = F.get_from_params(
+        **{
+            "a": {"_target_": "tests.foobar.grault", "a": 1},
+            "b": {"_target_": "tests.foobar.grault", "a": 1, "_copy_": True},
+        },
+        memo=memo,
+    )
+    assert res["a"] is not res["b"] and isinstance(res["b"], foobar.grault)
+    assert res["b"].a == 1 and memo.info().hits == 1
+
+
+def test_get_from_params_memo_skips_vars():
+    memo = BuildMemo()
+    res = F.get_from_params(
+        **{
+            "a": {"_target_": "tests.foobar.grault", "a": {"_var_": "x", "b": 1}},
+            "b": {"_target_": "tests.foobar.grault", "a": {"_var_": "x"}},
+            "c": {"_target_": "tests.foobar.grault", "a": {"_var_": "x"}},
+        },
+        memo=memo,
+    )
+    assert res["b"] is not res["c"] and res["b"].a is res["a"].a
+    assert len(memo) == 0
+
+
+def test_get_from_params_memo_between_builds():
+    memo = BuildMemo()
+    config = {"_target_": "tests.foobar.grault", "a": {"b": [1]}}
+
+    first = F.get_from_params(**config, memo=memo)
+    assert F.get_from_params(**config, memo=memo) is first
+    # objects built with different shared params are different
+    assert F.get_from_params(**config, shared_params={"b": 3}, memo=memo) is not first
+    assert memo.info() == (1, 2, None, 2)
+
+    memo.clear()
+    assert F.get_from_params(**config, memo=memo) is not first
+    assert memo.info() == (0, 1, None, 1)
+
+
+def test_registry_get_from_params_memo():
+    r = Registry()
+    r.add(foobar.grault)
+
+    memo = BuildMemo(copy_key="_copy")
+    res = r.get_from_params(
+        **{
+            "a": {"_target_": "grault", "a": 1},
+            "b": {"_target_": "grault", "a": 1},
+            "c": {"_target_": "grault", "a": 1, "_copy": True},
+        },
+        memo=memo,
+    )
+    assert res["a"] is res["b"] and res["c"] is not res["a"]
+    assert memo.info().hits == 2
+
+
+def test_fail_memo_parallel():
+    with pytest.raises(ValueError):
+        F.get_from_params(_target_="tests.foobar.grault", memo=BuildMemo(), max_workers=2)
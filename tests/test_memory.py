@@ -0,0 +1,135 @@
+# flake8: noqa
+import threading
+import tracemalloc
+
+import pytest
+
+from hydra_slayer.functional import get_from_params
+from hydra_slayer.memory import MemoryTracker
+from hydra_slayer.registry import Registry
+
+MiB = 2 ** 20
+
+
+def _alloc(size):
+    return bytearray(size)
+
+
+def _temp(size):
+    # allocates memory only during the call
+    return len(bytearray(size))
+
+
+def _config():
+    return {
+        "data": {
+            "cache": {"_target_": "tests.test_memory._alloc", "size": 4 * MiB},
+            "transforms": [{"_target_": "tests.test_memory._temp", "size": 2 * MiB}],
+        },
+        "model": {"_target_": "tests.test_memory._alloc", "size": MiB},
+    }
+
+
+def test_nodes():
+    tracker = MemoryTracker()
+    res = get_from_params(**_config(), shared_params={"_mode_": "call"}, memory=tracker)
+    assert len(res["data"]["cache"]) == 4 * MiB and res["data"]["transforms"] == [2 * MiB]
+    assert not tracemalloc.is_tracing()
+
+    nodes = {node.path: node for node in tracker.nodes}
+    assert list(nodes) == ["data.cache", "data.transforms[0]", "model"]
+    assert nodes["model"].name == "tests.test_memory._alloc"
+
+    cache, transform, model = nodes["data.cache"], nodes["data.transforms[0]"], nodes["model"]
+    assert 4 * MiB <= cache.retained < 5 * MiB and cache.peak >= cache.retained
+    assert transform.retained < MiB <= 2 * MiB <= transform.peak < 3 * MiB
+    assert MiB <= model.retained < 2 * MiB
+    assert all(node.rss is None for node in nodes.values())
+
+    lines = tracker.summary().splitlines()
+    assert lines[0].split()[:2] == ["path", "factory"]
+    assert [line.split()[0] for line in lines[1:]] == ["data.cache", "data.transforms[0]", "model"]
+    lines = tracker.summary(limit=1, sort_by="retained").splitlines()
+    assert len(lines) == 2 and lines[1].startswith("data.cache")
+    with pytest.raises(ValueError):
+        tracker.summary(sort_by="path")
+
+    tracker.clear()
+    assert tracker.nodes == ()
+
+
+def test_budget():
+    tracker = MemoryTracker(budget=3 * MiB)
+    with pytest.raises(RuntimeError) as e:
+        get_from_params(**_config(), shared_params={"_mode_": "call"}, memory=tracker)
+    assert isinstance(e.value.__cause__, MemoryError)
+    assert "data.cache" in str(e.value.__cause__)
+    # the build is aborted right after the node
+    assert [node.path for node in tracker.nodes] == ["data.cache"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_started_by_user():
+    tracker = MemoryTracker(rss=True)
+    tracemalloc.start()
+    try:
+        config = {"_target_": "tests.test_memory._alloc", "size": MiB, "_lazy_": True}
+        res = get_from_params(**config, shared_params={"_mode_": "call"}, memory=tracker)
+        assert tracemalloc.is_tracing() and tracker.nodes == ()
+
+        # lazy objects are accounted on the first access if tracing is still on
+        assert len(res) == MiB
+        (node,) = tracker.nodes
+        assert node.path == "" and node.retained >= MiB
+        assert node.rss is None or isinstance(node.rss, int)
+    finally:
+        tracemalloc.stop()
+
+
+def test_threads():
+    tracker = MemoryTracker()
+    started, finished = threading.Event(), threading.Event()
+
+    def wait(size):
+        started.set()
+        assert finished.wait(timeout=10)
+        return bytearray(size)
+
+    results = []
+    config = {"_target_": wait, "_mode_": "call", "size": MiB}
+    thread = threading.Thread(
+        target=lambda: results.append(get_from_params(**config, memory=tracker))
+    )
+    thread.start()
+    assert started.wait(timeout=10)
+    # the build finishes while the call of the other thread is in progress
+    get_from_params(**_config(), shared_params={"_mode_": "call"}, memory=tracker)
+    finished.set()
+    thread.join()
+
+    assert len(results[0]) == MiB
+    assert [node.path for node in tracker.nodes] == [
+        "data.cache",
+        "data.transforms[0]",
+        "model",
+        "",
+    ]
+    assert tracker.nodes[-1].retained >= MiB
+    assert not tracemalloc.is_tracing()
+
+
+def test_registry_memory():
+    r = Registry()
+    r.add(_alloc, _temp)
+    names = []
+    r.hooks.add("after_call", lambda e: names.append(e.name))
+
+    tracker = MemoryTracker()
+    config = {"a": {"_target_": "_alloc", "size": MiB}, "b": {"_target_": "_temp", "size": MiB}}
+    r.get_from_params(**config, shared_params={"_mode_": "call"}, memory=tracker)
+    assert [node.name for node in tracker.nodes] == names == ["_alloc", "_temp"]
+
+    with pytest.raises(ValueError):
+        r.get_from_params(**config, memory=tracker, max_workers=2)
+    with pytest.raises(ValueError):
+        get_from_params(**config, memory=tracker, max_workers=2)
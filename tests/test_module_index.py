@@ -0,0 +1,139 @@
+# flake8: noqa
+import ast
+import sys
+
+import pytest
+
+from hydra_slayer import module_index
+from hydra_slayer.module_index import _scan_all, get_module_names, ModuleIndex
+from hydra_slayer.registry import Registry
+from . import foobar
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("__all__ = ['a', 'b']", ["a", "b"]),
+        ("__all__ = ('a',) + ['b']\n__all__ += ['c']", ["a", "b", "c"]),
+        ("__all__: list = ['a']\ndef b(): pass", ["a"]),
+        ("def a(): pass", None),
+        ("__all__ = [name for name in ['a']]", None),
+        ("__all__ = ['a']\n__all__.extend(['b'])", None),
+        ("__all__ = ['a']\nif True:\n    __all__ = []", None),
+    ],
+)
+def test_scan_all(source, expected):
+    assert _scan_all(source) == expected
+
+
+def test_scan_all_python37_strings(monkeypatch):
+    class Str(ast.AST):
+        # string literal node of python 3.7
+        _fields = ("s",)
+
+    monkeypatch.setattr(ast, "Str", Str, raising=False)
+    monkeypatch.setattr(sys, "version_info", (3, 7, 17))
+    names = ast.List(elts=[Str(s="foo"), Str(s="bar")], ctx=ast.Load())
+    assert module_index._literal_names(names) == ["foo", "bar"]
+    assert module_index._literal_names(ast.List(elts=[Str(s="foo"), ast.Name(id="bar")])) is None
+
+
+def test_get_module_names():
+    # the module is imported already, so its names are taken from the module itself
+    assert get_module_names("tests.foobar") is None
+    assert get_module_names("tests.broken_module") is None
+
+    with pytest.raises(ModuleNotFoundError):
+        get_module_names("tests.missing_module")
+
+
+def _write_module(path, name, source):
+    (path / f"{name}.py").write_text(source)
+    sys.modules.pop(name, None)
+
+
+@pytest.fixture()
+def modules(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    _write_module(tmp_path, "hydra_slayer_index_a", "__all__ = ['A']\nclass A:\n    pass\n")
+    _write_module(tmp_path, "hydra_slayer_index_b", "def b():\n    pass\nc = 1\n")
+    yield tmp_path
+    for name in ("hydra_slayer_index_a", "hydra_slayer_index_b"):
+        sys.modules.pop(name, None)
+
+
+def test_module_index(modules):
+    filename = str(modules / "index" / "registry.json")
+    index = ModuleIndex(filename)
+    assert index.factories("hydra_slayer_index_a") == {"A": "hydra_slayer_index_a:A"}
+    assert index.factories("hydra_slayer_index_b") == {"b": "hydra_slayer_index_b:b"}
+    assert index.info().misses == 2
+    index.save()
+
+    for name in ("hydra_slayer_index_a", "hydra_slayer_index_b"):
+        sys.modules.pop(name)
+    index = ModuleIndex(filename)
+    r = Registry()
+    r.add_from_module("hydra_slayer_index_a", prefix="a.", index=index)
+    r.add_from_module("hydra_slayer_index_b", index=index)
+    # the registry is built without imports
+    assert index.info() == (2, 0, None, 2)
+    assert "hydra_slayer_index_a" not in sys.modules and "hydra_slayer_index_b" not in sys.modules
+
+    assert r.get("b") is sys.modules["hydra_slayer_index_b"].b
+    assert "hydra_slayer_index_a" not in sys.modules
+    assert r.all() == ("b", "a.A")
+
+
+def test_module_index_rescans_changed_modules(modules, monkeypatch):
+    filename = str(modules / "registry.json")
+    index = ModuleIndex(filename)
+    index.factories("hydra_slayer_index_a")
+    index.factories("hydra_slayer_index_b")
+    index.save()
+
+    _write_module(modules, "hydra_slayer_index_b", "def b():\n    pass\ndef c():\n    pass\n")
+    index = ModuleIndex(filename)
+    assert index.factories("hydra_slayer_index_a") == {"A": "hydra_slayer_index_a:A"}
+    assert list(index.factories("hydra_slayer_index_b")) == ["b", "c"]
+    assert index.info().hits == 1 and index.info().misses == 1
+
+    # new version of the package makes the entry stale as well
+    monkeypatch.setattr(module_index, "_get_package_version", lambda package: "42.0")
+    index = ModuleIndex(filename)
+    index.factories("hydra_slayer_index_a")
+    assert index.info().misses == 1
+
+
+def test_package_version_by_distribution(monkeypatch):
+    monkeypatch.setattr(
+        module_index, "_get_package_distributions", lambda: {"slayer_yaml": ["pytest"]}
+    )
+    # version of the distribution of the import package
+    assert module_index._get_package_version("slayer_yaml") == pytest.__version__
+
+    # version doesn't depend on the imported modules
+    monkeypatch.setitem(sys.modules, "slayer_fake", type(sys)("slayer_fake"))
+    sys.modules["slayer_fake"].__version__ = "1.0"
+    assert module_index._get_package_version("slayer_fake") is None
+
+
+def test_module_index_broken_file(modules):
+    filename = modules / "registry.json"
+    filename.write_text("{broken")
+    index = ModuleIndex(str(filename))
+    assert len(index) == 0
+
+    index.factories("hydra_slayer_index_a")
+    index.save()
+    assert "hydra_slayer_index_a" in ModuleIndex(str(filename))
+
+    with pytest.raises(ValueError):
+        ModuleIndex().save()
+
+
+def test_fail_module_index_with_constants_in_all(modules):
+    source = "__all__ = ['b', 'c']\ndef b():\n    pass\nc = 1\n"
+    _write_module(modules, "hydra_slayer_index_b", source)
+    with pytest.raises(KeyError):
+        ModuleIndex().factories("hydra_slayer_index_b")
@@ -0,0 +1,200 @@
+# flake8: noqa
+import pytest
+
+from hydra_slayer import functional as F, plan as P
+from hydra_slayer.factory import call_meta_factory
+from hydra_slayer.lazy import is_built, LazyProxy
+from hydra_slayer.registry import Registry
+from . import foobar
+
+CONFIGS = [
+    ({}, None),
+    ({"a": 1, "b": [2, {"c": 3}]}, None),
+    ({"_target_": "tests.foobar.foo", "a": 1, "b": 2}, {"_mode_": "call"}),
+    (
+        {
+            "_target_": "tests.foobar.foo",
+            "a": {"_target_": "tests.foobar.foo", "a": 1},
+            "b": [[{"_target_": "tests.foobar.foo", "a": 2, "b": 3}]],
+        },
+        {"b": 2, "_meta_factory_": call_meta_factory},
+    ),
+    (
+        {
+            "_target_": "tests.foobar.foo",
+            "a": 1,
+            "b": 2,
+            "_meta_factory_": {"_target_": "hydra_slayer.call_meta_factory"},
+        },
+        None,
+    ),
+    ({"_target_": "tests.foobar.qux", "argss": [1, 2, 3], "b": 4, "_mode_": "call"}, None),
+    (
+        {"_target_": "tests.foobar.quux", "a": 1, "kwargs": {"c": 3, "a": 5}, "_mode_": "call"},
+        None,
+    ),
+    (
+        {
+            "a": {"_var_": "x", "_target_": "tests.foobar.foo", "a": 1, "b": 2},
+            "b": {"_target_": "tests.foobar.foo", "a": {"_var_": "x"}, "b": 3},
+        },
+        {"_mode_": "call"},
+    ),
+    ({"a": {"_var_": "x", "a": 1}, "b": {"_var_": "x"}}, None),
+    (
+        {
+            "a": {"_var_": "x", "_target_": "tests.foobar.grault", "_mode_": "call", "a": 3},
+            "b": {"_var_": "x.b"},
+            "c": {"_var_": "x.waldo"},
+            "d": {"_var_": "x.garply", "a": 1, "b": 2},
+        },
+        None,
+    ),
+    (
+        {
+            "a": {"_var_": "x", "_target_": "tests.foobar.grault", "_lazy_": True, "a": 1},
+            "b": {"_var_": "x.waldo", "_lazy_": True},
+            "c": {"_lazy_": True, "d": 2},
+        },
+        None,
+    ),
+]
+
+
+@pytest.mark.parametrize("config,shared_params", CONFIGS)
+def test_plan_same_as_get_from_params(config, shared_params):
+    def _replace_instances(obj):
+        if isinstance(obj, foobar.grault):
+            return ("grault", obj.a, obj.b)
+        if isinstance(obj, dict):
+            return {k: _replace_instances(v) for k, v in obj.items()}
+        return obj
+
+    expected = _replace_instances(F.get_from_params(**config, shared_params=shared_params))
+
+    plan = P.compile(config, shared_params=shared_params)
+    assert _replace_instances(plan()) == expected
+    # plan can be called multiple times
+    assert _replace_instances(plan()) == expected
+
+
+def test_plan_steps():
+    plan = P.compile(
+        {
+            "a": [{"_target_": "tests.foobar.foo", "a": 1, "b": 2}],
+            "b": {"_var_": "x", "c": 3},
+        }
+    )
+
+    assert [(s.kind, s.path) for s in plan.steps] == [
+        ("call", "a[0]"),
+        ("list", "a"),
+        ("var", "b"),
+        ("dict", ""),
+    ]
+    assert plan.steps[0].factory is foobar.foo
+    assert plan.parameters == {"a[0].a": 1, "a[0].b": 2, "b.c": 3}
+
+
+def test_plan_creates_new_objects():
+    plan = P.compile({"a": {"b": [1, 2]}, "c": {"_target_": "tests.foobar.grault"}})
+
+    res1, res2 = plan(), plan()
+    assert res1 == {"a": {"b": [1, 2]}, "c": res1["c"]}
+    assert res1["a"] is not res2["a"] and res1["a"]["b"] is not res2["a"]["b"]
+    assert res1["c"] is not res2["c"]
+
+
+def test_plan_overrides():
+    plan = P.compile(
+        {
+            "_target_": "tests.foobar.foo",
+            "a": {"_target_": "tests.foobar.foo", "a": 1, "b": [2, 3]},
+            "b": 4,
+        },
+        shared_params={"_mode_": "call"},
+    )
+
+    assert plan(b=5) == {"a": {"a": 1, "b": [2, 3]}, "b": 5}
+    assert plan(**{"a.a": 6, "a.b[1]": 7}) == {"a": {"a": 6, "b": [2, 7]}, "b": 4}
+    assert plan() == {"a": {"a": 1, "b": [2, 3]}, "b": 4}
+
+    error_msg = "Plan has no parameter '.+' to override"
+    for path in ["c", "a", "_target_", "a._target_", "_mode_"]:
+        with pytest.raises(LookupError, match=error_msg):
+            plan(**{path: 42})
+
+
+def test_plan_dynamic_target():
+    plan = P.compile(
+        {
+            "_target_": {"_target_": "tests.foobar.grault.garply", "_mode_": "partial"},
+            "a": 1,
+            "b": 2,
+            "_mode_": "call",
+        }
+    )
+    assert plan.steps[-1].factory is None
+    assert plan() == {"a": 1, "b": 2}
+
+
+def test_plan_lazy():
+    config = {
+        "a": {"_target_": "tests.foobar.grault", "_lazy_": True, "a": 1},
+        "b": {"_target_": "tests.foobar.no_such_factory", "_lazy_": True},
+    }
+    plan = P.compile(config)
+    # lazy keys are not parameters of the plan
+    assert plan.parameters == {"a.a": 1}
+
+    res = plan(**{"a.a": 2})
+    assert type(res["a"]) is LazyProxy and not is_built(res["a"])
+    assert res["a"].a == 2
+    with pytest.raises(LookupError):
+        res["b"].a
+
+
+def test_fail_compile():
+    error_msg = "No factory with name '.+' was registered"
+    with pytest.raises(LookupError, match=error_msg):
+        P.compile({"_target_": "tests.foobar.corge"})
+
+    error_msg = r"get_instance\(\) missing at least 1 required argument: '.+'"
+    with pytest.raises(TypeError, match=error_msg):
+        P.compile({"_target_": None})
+
+
+def test_fail_plan_call():
+    plan = P.compile({"_target_": "tests.foobar.grault", "b": 1.0})
+    error_msg = "Factory '.+' call failed: args=.+ kwargs=.+"
+    with pytest.raises(RuntimeError, match=error_msg):
+        plan()
+
+    plan = P.compile(
+        {
+            "a": {"_target_": "tests.foobar.foo", "a": 1, "b": 2, "_var_": "x"},
+            "b": {"_target_": "tests.foobar.foo", "a": 3, "b": 4, "_var_": "x"},
+        }
+    )
+    error_msg = r"`.+` and `.+` \(in get mode\) keywords are exclusive"
+    with pytest.raises(ValueError, match=error_msg):
+        plan()
+
+
+def test_registry_compile():
+    r = Registry(persist_vars=True)
+    r.add(foo=foobar.foo)
+
+    plan = r.compile(
+        {"a": {"_target_": "foo", "_var_": "x", "a": 1, "b": 2}}, shared_params={"_mode_": "call"}
+    )
+    assert plan() == {"a": {"a": 1, "b": 2}}
+
+    # registry keeps aliases between calls
+    assert r.get_from_params(**{"_var_": "x"}) == {"a": 1, "b": 2}
+
+
+def test_fail_plan_with_scope():
+    plan = P.compile({"_target_": "tests.foobar.grault", "_scope_": "singleton", "a": 1})
+    with pytest.raises(RuntimeError, match="grault"):
+        plan.run()
@@ -0,0 +1,219 @@
+# flake8: noqa
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from hydra_slayer import plan as P, plan_cache
+from hydra_slayer.lazy import LazyProxy
+from hydra_slayer.registry import Registry
+from . import foobar
+
+CONFIG = {
+    "a": {"_var_": "x", "_target_": "tests.foobar.grault", "_mode_": "call", "a": 3},
+    "b": {"_target_": "tests.foobar.foo", "_mode_": "call", "a": {"_var_": "x.b"}, "b": [1, 2]},
+    "c": {"_target_": "tests.foobar.qux", "argss": [1, 2], "_mode_": "call"},
+}
+EXPECTED = {"b": {"a": 2, "b": [1, 2]}, "c": (1, 2, 2)}
+
+
+def _forbid_compilation(monkeypatch):
+    def _fail(*args, **kwargs):
+        raise AssertionError("config should not be compiled")
+
+    monkeypatch.setattr(P._Compiler, "compile", _fail)
+
+
+def _count_compilations(monkeypatch):
+    calls = []
+    compile_ = P._Compiler.compile
+
+    def _compile(*args, **kwargs):
+        calls.append(1)
+        return compile_(*args, **kwargs)
+
+    monkeypatch.setattr(P._Compiler, "compile", _compile)
+    return calls
+
+
+def _files(cache_dir):
+    return sorted(f for f in os.listdir(cache_dir) if f.endswith(".json"))
+
+
+def test_compile_cached(tmp_path, monkeypatch):
+    plan = P.compile(CONFIG, cache_dir=str(tmp_path))
+    res = plan()
+    assert {k: res[k] for k in ("b", "c")} == EXPECTED
+    assert len(_files(tmp_path)) == 1
+
+    _forbid_compilation(monkeypatch)
+    loaded = P.compile(CONFIG, cache_dir=str(tmp_path))
+    res = loaded()
+    assert {k: res[k] for k in ("b", "c")} == EXPECTED
+    assert isinstance(res["a"], foobar.grault)
+    assert [(s.kind, s.path) for s in loaded.steps] == [(s.kind, s.path) for s in plan.steps]
+    assert loaded.parameters == plan.parameters
+    assert loaded(**{"c.argss[1]": 3})["c"] == (1, 3, 2)
+
+
+def test_compile_cached_constants(tmp_path, monkeypatch):
+    config = {
+        "_target_": "tests.foobar.foo",
+        "_mode_": "call",
+        "a": foobar.grault,
+        "b": (1, b"\x00", frozenset({"x", "y"}), 1 + 2j, None),
+    }
+    expected = {"a": foobar.grault, "b": config["b"]}
+    assert P.compile(config, cache_dir=str(tmp_path))() == expected
+    (filename,) = _files(tmp_path)
+    with open(tmp_path / filename) as stream:
+        assert json.load(stream)["format"] == plan_cache.PLAN_FORMAT_VERSION
+
+    _forbid_compilation(monkeypatch)
+    assert P.compile(config, cache_dir=str(tmp_path))() == expected
+
+
+def test_config_key_is_canonical():
+    code = (
+        "from hydra_slayer import plan_cache;"
+        "print(plan_cache._config_key('_target_', {'a': frozenset('abcdef'), 'b': 1},"
+        " {}, '_var_', '.', '_lazy_', False))"
+    )
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    # order of the set items depends on the hash seed
+    assert len(keys) == 1
+
+
+planted = []
+
+
+class _Planted:
+    def __reduce__(self):
+        return planted.append, (1,)
+
+
+def test_compile_cached_does_not_unpickle(tmp_path):
+    P.compile(CONFIG, cache_dir=str(tmp_path))
+    (filename,) = _files(tmp_path)
+    (tmp_path / filename).write_bytes(pickle.dumps(_Planted()))
+
+    res = P.compile(CONFIG, cache_dir=str(tmp_path))()
+    assert {k: res[k] for k in ("b", "c")} == EXPECTED
+    assert planted == []
+
+
+def test_compile_cached_lazy(tmp_path, monkeypatch):
+    config = {"a": {"_target_": "tests.foobar.grault", "_lazy_": True, "a": 1}}
+    P.compile(config, cache_dir=str(tmp_path))
+
+    _forbid_compilation(monkeypatch)
+    res = P.compile(config, cache_dir=str(tmp_path))()
+    assert type(res["a"]) is LazyProxy and res["a"].a == 1
+    assert isinstance(res["a"], foobar.grault)
+
+
+def test_compile_cached_keyed_by_config(tmp_path):
+    P.compile(CONFIG, cache_dir=str(tmp_path))
+    P.compile({**CONFIG, "d": 1}, cache_dir=str(tmp_path))
+    P.compile(CONFIG, shared_params={"e": 1}, cache_dir=str(tmp_path))
+
+    assert len(_files(tmp_path)) == 3
+
+
+def test_compile_cached_rebuilds_on_package_version_change(tmp_path, monkeypatch):
+    P.compile(CONFIG, cache_dir=str(tmp_path))
+
+    monkeypatch.setattr(plan_cache, "_get_package_version", lambda package: "42.0")
+    calls = _count_compilations(monkeypatch)
+    P.compile(CONFIG, cache_dir=str(tmp_path))
+    P.compile(CONFIG, cache_dir=str(tmp_path))
+    # the stale plan was rebuilt once and stored with the new versions
+    assert len(calls) == 1
+
+
+def test_compile_cached_rebuilds_on_module_change(tmp_path, monkeypatch):
+    module_dir = tmp_path / "modules"
+    module_dir.mkdir()
+    module_file = module_dir / "plan_cache_module.py"
+    module_file.write_text("def foo(a):\n    return a\n")
+    monkeypatch.syspath_prepend(str(module_dir))
+
+    config = {"_target_": "plan_cache_module.foo", "_mode_": "call", "a": 1}
+    cache_dir = str(tmp_path / "cache")
+    try:
+        assert P.compile(config, cache_dir=cache_dir)() == 1
+
+        calls = _count_compilations(monkeypatch)
+        P.compile(config, cache_dir=cache_dir)
+        assert len(calls) == 0
+
+        stat = os.stat(module_file)
+        os.utime(module_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        P.compile(config, cache_dir=cache_dir)
+        assert len(calls) == 1
+    finally:
+        sys.modules.pop("plan_cache_module", None)
+
+
+def test_compile_cached_rebuilds_corrupted_file(tmp_path):
+    P.compile(CONFIG, cache_dir=str(tmp_path))
+    (filename,) = _files(tmp_path)
+    (tmp_path / filename).write_bytes(b"not a plan")
+
+    res = P.compile(CONFIG, cache_dir=str(tmp_path))()
+    assert {k: res[k] for k in ("b", "c")} == EXPECTED
+
+
+def test_compile_cached_warns_on_unstorable_plan(tmp_path):
+    with pytest.warns(UserWarning, match="Compiled plan was not cached"):
+        plan = P.compile({"a": 1}, shared_params={"b": lambda: 1}, cache_dir=str(tmp_path))
+
+    assert plan() == {"a": 1}
+    assert _files(tmp_path) == []
+
+
+def test_registry_compile_cached(tmp_path, monkeypatch):
+    r = Registry()
+    r.add(lambda a, b: {"a": a, "b": b}, name="foo")
+    config = {"_target_": "foo", "_mode_": "call", "a": 1, "b": 2}
+
+    assert r.compile(config, cache_dir=str(tmp_path))() == {"a": 1, "b": 2}
+
+    _forbid_compilation(monkeypatch)
+    # lambda is stored by its name in the registry
+    assert r.compile(config, cache_dir=str(tmp_path))() == {"a": 1, "b": 2}
+
+
+def test_registry_compile_cached_checks_names(tmp_path, monkeypatch):
+    config = {"net": {"_target_": "Net", "_mode_": "call", "a": 1}}
+    r1, r2 = Registry(), Registry()
+    r1.add(foobar.grault, name="Net")
+    r2.add(foobar.fred, name="Net")
+
+    assert isinstance(r1.compile(config, cache_dir=str(tmp_path))()["net"], foobar.grault)
+    calls = _count_compilations(monkeypatch)
+    # the same config is compiled again, since the name is resolved to another factory
+    assert isinstance(r2.compile(config, cache_dir=str(tmp_path))()["net"], foobar.fred)
+    assert isinstance(r2.compile(config, cache_dir=str(tmp_path))()["net"], foobar.fred)
+    assert calls == [1]
+
+
+def test_compile_cached_does_not_store_objects(tmp_path):
+    obj = foobar.grault()
+    with pytest.warns(UserWarning, match="Compiled plan was not cached"):
+        plan = P.compile({"a": obj}, cache_dir=str(tmp_path))
+
+    # constants of the config are passed as is
+    assert plan()["a"] is obj
+    assert _files(tmp_path) == []
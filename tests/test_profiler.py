@@ -0,0 +1,127 @@
+# flake8: noqa
+import json
+import time
+
+import pytest
+
+from hydra_slayer.functional import get_from_params
+from hydra_slayer.profiler import BuildProfiler
+from hydra_slayer.registry import Registry
+from . import foobar
+
+
+def _sleep(delay, child=None):
+    time.sleep(delay)
+    return {"delay": delay, "child": child}
+
+
+def _config():
+    return {
+        "_target_": "tests.test_profiler._sleep",
+        "delay": 0.01,
+        "child": {
+            "layers": [
+                {"_target_": "tests.test_profiler._sleep", "delay": 0.0},
+                {"_target_": "tests.test_profiler._sleep", "delay": 0.02, "_var_": "slow"},
+            ],
+            "same": {"_var_": "slow"},
+        },
+    }
+
+
+def _build(profiler, **kwargs):
+    return get_from_params(
+        **_config(), shared_params={"_mode_": "call"}, profiler=profiler, **kwargs
+    )
+
+
+def test_nodes():
+    profiler = BuildProfiler()
+    res = _build(profiler)
+    assert res["child"]["layers"][1] is res["child"]["same"]
+
+    nodes = {node.path: node for node in profiler.nodes}
+    assert list(nodes) == [
+        "child.layers[0]",
+        "child.layers[1]",
+        "child.layers",
+        "child.same",
+        "child",
+        "",
+    ]
+    assert nodes[""].name == nodes["child.layers[0]"].name == "tests.test_profiler._sleep"
+    assert (nodes["child.layers"].kind, nodes["child.layers"].name) == ("list", "")
+    assert (nodes["child.same"].kind, nodes["child.layers[1]"].kind) == ("var", "var")
+
+    assert nodes["child.layers[1]"].call >= 0.02
+    assert nodes[""].call >= 0.01 and nodes[""].children >= 0.02
+    for node in nodes.values():
+        assert node.total == pytest.approx(
+            node.resolve + node.signature + node.call + node.children
+        )
+    assert nodes["child"].children == pytest.approx(
+        nodes["child.layers"].total + nodes["child.same"].total
+    )
+
+    # profiles are accumulated
+    _build(profiler)
+    assert len(profiler.nodes) == 2 * len(nodes)
+    profiler.clear()
+    assert profiler.nodes == () and profiler.to_chrome_trace()["traceEvents"] == []
+
+
+def test_summary():
+    profiler = BuildProfiler()
+    _build(profiler)
+
+    lines = profiler.summary().splitlines()
+    assert lines[0].split()[:3] == ["path", "kind", "factory"]
+    assert [line.split()[0] for line in lines[1:3]] == ["<root>", "child"]
+    assert len(lines) == len(profiler.nodes) + 1
+
+    lines = profiler.summary(limit=1, sort_by="call").splitlines()
+    assert len(lines) == 2 and lines[1].startswith("child.layers[1]")
+
+    with pytest.raises(ValueError):
+        profiler.summary(sort_by="name")
+
+
+def test_chrome_trace(tmp_path):
+    profiler = BuildProfiler()
+    _build(profiler)
+
+    filename = tmp_path / "trace.json"
+    profiler.save_chrome_trace(str(filename))
+    with open(filename) as stream:
+        trace = json.load(stream)
+
+    events = trace["traceEvents"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    builds = {e["args"]["path"]: e for e in events if e["cat"] == "build" and e["args"]}
+    assert set(builds) == {node.path or "<root>" for node in profiler.nodes}
+    # parent spans the builds of the children
+    parent, child = builds["child"], builds["child.layers[1]"]
+    assert parent["ts"] <= child["ts"]
+    assert child["ts"] + child["dur"] <= parent["ts"] + parent["dur"]
+    resolved = {e["args"]["path"] for e in events if e["cat"] == "resolve"}
+    assert resolved == {"<root>", "child.layers[0]", "child.layers[1]"}
+
+
+def test_registry_profiler():
+    r = Registry()
+    r.add(foobar.foo, foobar.bar)
+
+    profiler = BuildProfiler()
+    config = {"_target_": "foo", "a": {"_target_": "bar", "_lazy_": True}, "b": 2}
+    res = r.get_from_params(**config, shared_params={"_mode_": "call"}, profiler=profiler)
+    assert res == {"a": None, "b": 2}
+    assert [(node.path, node.name) for node in profiler.nodes] == [("a", "bar"), ("", "foo")]
+    # lazy factory is not resolved until the first access
+    assert profiler.nodes[0].resolve == profiler.nodes[0].signature == 0
+
+
+def test_profiler_fail():
+    with pytest.raises(ValueError):
+        _build(BuildProfiler(), max_workers=2)
+    with pytest.raises(ValueError):
+        Registry().get_from_params(**_config(), profiler=BuildProfiler(), memo=object())
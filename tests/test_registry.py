@@ -1,8 +1,18 @@
 # flake8: noqa
+import asyncio
+import gc
+import sys
+import threading
+import time
+import weakref
+
 import pytest
 
+from hydra_slayer.lazy import LazyProxy
+from hydra_slayer.memo import BuildMemo
 from hydra_slayer.registry import Registry
-from .foobar import bar, foo
+from hydra_slayer.variables import VarStore
+from .foobar import bar, foo, plugh
 from . import foobar as module
 
 
@@ -179,6 +189,112 @@ def test_late_add():
     assert r.all() == ("foo",)
 
 
+def test_late_add_by_name():
+    calls = []
+
+    def _callback(name, **factories):
+        def callback(registry: Registry) -> None:
+            calls.append(name)
+            registry.add(**factories)
+
+        return callback
+
+    r = Registry()
+    r.add(grault=module.grault)
+    r.late_add(_callback("foo", foo=foo), names=["foo"])
+    r.late_add(_callback("bar", bar_1=bar, bar_2=bar), prefixes=["bar_"])
+    r.late_add(_callback("any", qux=module.qux))
+
+    # registered names and factories don't call the callbacks
+    assert r.get("grault") is module.grault and r.get(bar) is bar
+    assert calls == []
+
+    assert r.get("foo") is foo and calls == ["foo"]
+    assert "bar_2" in r and calls == ["foo", "bar"]
+    # undeclared callbacks are called only for unknown names
+    assert "baz" not in r and calls == ["foo", "bar", "any"]
+    assert len(r) == 5
+
+
+def test_late_add_enumeration():
+    calls = []
+
+    r = Registry()
+    r.late_add(lambda registry: calls.append(1) or registry.add(foo), names=["foo"])
+    r.late_add(lambda registry: calls.append(2) or registry.add(bar), prefixes=["b"])
+
+    assert list(r) == ["foo", "bar"] and calls == [1, 2]
+
+
+def test_late_add_concurrent():
+    calls = []
+
+    def callback(registry: Registry) -> None:
+        calls.append(1)
+        registry.add(foo)
+        # the registry is queried while being populated
+        assert "foo" in registry
+        time.sleep(0.05)
+        registry.add(bar)
+
+    r = Registry()
+    r.late_add(callback)
+
+    results = []
+
+    def _query():
+        results.append("bar" in r and r.get("foo") is foo)
+
+    threads = [threading.Thread(target=_query) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1] and results == [True] * 8
+
+
+def test_late_add_failed_callback_is_retried():
+    calls = []
+
+    def callback(registry: Registry) -> None:
+        calls.append(1)
+        if len(calls) == 1:
+            raise ImportError()
+        registry.add(bar)
+
+    r = Registry()
+    r.late_add(lambda registry: registry.add(foo))
+    r.late_add(callback)
+
+    with pytest.raises(ImportError):
+        r.all()
+    assert r.all() == ("foo", "bar") and len(calls) == 2
+
+
+def test_concurrent_add_and_get():
+    r = Registry()
+    errors = []
+
+    def _add(i):
+        try:
+            for j in range(200):
+                r.add(foo, name=f"foo_{i}_{j}")
+                assert r.get(f"foo_{i}_{j}") is foo
+                del r[f"foo_{i}_{j}"]
+                list(r)
+        except Exception as e:  # noqa: B902
+            errors.append(e)
+
+    threads = [threading.Thread(target=_add, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [] and len(r) == 0
+
+
 def test_add_module():
     r = Registry()
 
@@ -191,6 +307,38 @@ def test_add_module():
         r.get_instance("bar")
 
 
+def test_add_module_by_path(tmp_path, monkeypatch):
+    (tmp_path / "hydra_slayer_lazy_module.py").write_text(
+        "__all__ = ['Heavy'] + ['make']\n"
+        "class Heavy:\n    pass\n"
+        "def make():\n    return Heavy()\n"
+        "def _private():\n    pass\n"
+    )
+    (tmp_path / "hydra_slayer_dynamic_module.py").write_text(
+        "__all__ = [name for name in ['make']]\ndef make():\n    pass\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ("hydra_slayer_lazy_module", "hydra_slayer_dynamic_module"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    r = Registry()
+    r.add_from_module("hydra_slayer_lazy_module", prefix=["a.", "b."])
+    assert "hydra_slayer_lazy_module" not in sys.modules
+    # unrelated lookups don't import the module
+    assert r.get("tests.foobar.foo") is foo and "hydra_slayer_lazy_module" not in sys.modules
+
+    heavy = r.get("b.Heavy")
+    assert heavy is sys.modules["hydra_slayer_lazy_module"].Heavy
+    assert r.all() == ("a.Heavy", "a.make", "b.Heavy", "b.make")
+
+    # names can't be found statically, so the module is imported at once
+    r.add_from_module("hydra_slayer_dynamic_module")
+    assert "hydra_slayer_dynamic_module" in sys.modules and "make" in r
+
+    with pytest.raises(ModuleNotFoundError):
+        r.add_from_module("hydra_slayer_missing_module")
+
+
 def test_add_module_adds_all():
     r = Registry()
 
@@ -442,7 +590,7 @@ def test_get_from_params_var_keyword():
 
 
 def test_get_from_params_vars_dict():
-    r = Registry()
+    r = Registry(persist_vars=True)
 
     r.add(foo)
 
@@ -540,7 +688,7 @@ def test_get_from_params_attrs_keyword():
 
 
 def test_get_from_params_vars_dict():
-    r = Registry()
+    r = Registry(persist_vars=True)
 
     r.add(foo)
 
@@ -564,6 +712,258 @@ def test_get_from_params_vars_dict():
     assert res["b"] == 4
 
 
+def test_get_from_params_parallel():
+    r = Registry(persist_vars=True)
+
+    r.add(foo)
+
+    res = r.get_from_params(
+        **{
+            "a": {"_var_": "x", "_target_": "foo", "a": 1, "b": 2},
+            "b": [{"_target_": "foo", "a": {"_var_": "x"}, "b": 3}],
+        },
+        shared_params={"_mode_": "call"},
+        max_workers=2,
+    )
+    assert res == {"a": {"a": 1, "b": 2}, "b": [{"a": {"a": 1, "b": 2}, "b": 3}]}
+
+    # aliases are stored in the registry as well
+    res = r.get_from_params(**{"a": {"_var_": "x"}}, max_workers=2)
+    assert res == {"a": {"a": 1, "b": 2}}
+
+
+def test_aget_from_params():
+    r = Registry(persist_vars=True)
+
+    r.add(foo, plugh)
+
+    log = []
+    res = asyncio.run(
+        r.aget_from_params(
+            **{
+                "a": {"_var_": "x", "_target_": "plugh", "callback": log.append, "a": 1},
+                "b": [{"_target_": "foo", "a": {"_var_": "x"}, "b": 3}],
+            },
+            shared_params={"_mode_": "call"},
+        )
+    )
+    assert res == {"a": 1, "b": [{"a": 1, "b": 3}]}
+    assert log == [("start", 1), ("end", 1)]
+
+    # aliases are stored in the registry as well
+    res = asyncio.run(r.aget_from_params(**{"a": {"_var_": "x"}}))
+    assert res == {"a": 1}
+
+
+def test_get_from_params_lazy():
+    r = Registry(lazy_key="_lazy")
+
+    r.add(foo)
+
+    res = r.get_from_params(
+        **{
+            "a": {"_target_": "foo", "a": 1, "b": 2, "_lazy": True},
+            "b": {"_target_": "foo", "a": 3, "b": 4},
+        },
+        shared_params={"_mode_": "call"},
+    )
+    assert type(res["a"]) is LazyProxy and res["a"] == {"a": 1, "b": 2}
+    assert type(res["b"]) is dict
+
+    res = r.get_from_params(**{"_target_": "foo", "a": 1, "b": 2, "_mode_": "call"}, lazy=True)
+    assert type(res) is LazyProxy and res["b"] == 2
+
+
+def test_get_from_params_many():
+    r = Registry()
+    r.add(foo, module.grault)
+
+    get_calls = []
+    get = r.get
+
+    def _get(name):
+        get_calls.append(name)
+        return get(name)
+
+    r.get = _get
+
+    def _configs():
+        for lr in (0.1, 0.01, 0.001):
+            configs_calls.append(lr)
+            yield {
+                "model": {"_target_": "grault", "a": [1, 2]},
+                "optimizer": {"_target_": "foo", "a": "sgd", "b": lr},
+            }
+
+    configs_calls = []
+    results = r.get_from_params_many(_configs(), shared_params={"_mode_": "call"})
+    # configs are built on demand
+    assert configs_calls == []
+    first = next(results)
+    assert configs_calls == [0.1] and first["optimizer"] == {"a": "sgd", "b": 0.1}
+
+    rest = list(results)
+    assert [res["optimizer"]["b"] for res in rest] == [0.01, 0.001]
+    assert rest[0]["model"] is not first["model"]
+    # factories are resolved once per batch
+    assert sorted(get_calls) == ["foo", "grault"]
+
+
+def test_get_from_params_many_compiled(monkeypatch):
+    from hydra_slayer import plan as P
+
+    compiled = []
+    compile_ = P._compile
+    monkeypatch.setattr(P, "_compile", lambda **kw: compiled.append(kw["config"]) or compile_(**kw))
+
+    r = Registry()
+    r.add(foo, module.grault)
+    configs = [
+        {"model": {"_target_": "grault", "a": [1, 2]}, "lr": {"_target_": "foo", "a": 1, "b": 0.1}},
+        {"model": {"_target_": "grault", "a": [3, 4]}, "lr": {"_target_": "foo", "a": 2, "b": 0.2}},
+        # the name of the factory is consumed by the compilation
+        {"model": {"_target_": "foo", "a": [5, 6]}, "lr": {"_target_": "grault", "a": 3, "b": 3}},
+        # the structure is different
+        {"model": {"_var_": "model", "_target_": "grault", "a": [7]}, "lr": {"_var_": "model"}},
+        {"model": {"_var_": "model", "_target_": "grault", "a": [8]}, "lr": {"_var_": "model"}},
+    ]
+    configs[2]["model"]["b"] = 0.3
+    results = list(r.get_from_params_many(configs, shared_params={"_mode_": "call"}))
+
+    assert results[0]["lr"] == {"a": 1, "b": 0.1} and results[1]["lr"] == {"a": 2, "b": 0.2}
+    assert results[2]["model"] == {"a": [5, 6], "b": 0.3} and results[2]["lr"].a == 3
+    assert [res["model"].a for res in results[3:]] == [[7], [8]]
+    assert results[3]["lr"] is results[3]["model"] and results[4]["lr"] is results[4]["model"]
+    assert compiled == [configs[0], configs[2], configs[3]]
+
+
+def test_get_from_params_many_shared_instances():
+    r = Registry()
+    r.add(foo, module.grault)
+
+    configs = [
+        {"model": {"_target_": "grault", "a": [1, 2]}, "lr": {"_target_": "foo", "a": 1, "b": lr}}
+        for lr in (0.1, 0.01, 0.001)
+    ]
+    memo = BuildMemo()
+    results = list(r.get_from_params_many(configs, shared_params={"_mode_": "call"}, memo=memo))
+
+    assert results[0]["model"] is results[1]["model"] is results[2]["model"]
+    assert [res["lr"]["b"] for res in results] == [0.1, 0.01, 0.001]
+    assert memo.info().hits == 2
+
+
+def test_iter_from_params():
+    r = Registry()
+    r.add(foo, module.grault)
+
+    config = {
+        "model": {"_var_": "model", "_target_": "grault", "a": [1, 2]},
+        "optimizer": {"_target_": "foo", "a": {"_var_": "model"}, "b": 0.1},
+    }
+    results = r.iter_from_params(**config, shared_params={"_mode_": "call"})
+    key, model = next(results)
+    assert key == "model" and isinstance(model, module.grault)
+    assert list(results) == [("optimizer", {"a": model, "b": 0.1})]
+
+    with pytest.raises(ValueError):
+        r.iter_from_params(_target_="foo", a=1, b=2)
+
+
+def test_get_from_params_vars_scopes():
+    r = Registry()
+    r.add(foo, module.grault)
+
+    res = r.get_from_params(a={"_var_": "x", "_target_": "grault", "a": 1}, b={"_var_": "x"})
+    assert res["a"] is res["b"]
+    # aliases of the build are not stored in the registry by default
+    assert len(r.variables) == 0
+    assert r.get_from_params(a={"_var_": "x"}) == {"a": {}}
+
+    # but persistent ones are available for all the builds
+    r.variables["x"] = res["a"]
+    assert r.get_from_params(a={"_var_": "x"})["a"] is res["a"]
+    assert r.compile({"a": {"_var_": "x.a"}})() == {"a": 1}
+    assert list(r.variables) == ["x"]
+    r.variables.clear()
+    assert "x" not in r.variables
+
+
+def test_vars_scope():
+    r = Registry()
+    r.add(module.grault)
+    results = {}
+
+    def _build(i):
+        with r.vars_scope() as scope:
+            r.get_from_params(**{"_var_": "x", "_target_": "grault", "a": i})
+            time.sleep(0.01)
+            results[i] = (r.get_from_params(**{"_var_": "x.a"}), list(scope))
+
+    threads = [threading.Thread(target=_build, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # aliases of the scope are isolated from other threads and dropped on exit
+    assert results == {i: (i, ["x"]) for i in range(4)}
+    assert len(r.variables) == 0
+
+
+def test_get_from_params_vars_memory():
+    r = Registry()
+    r.add(module.grault)
+
+    refs = []
+    for i in range(100):
+        # e.g. per request builds of the server
+        res = r.get_from_params(
+            model={"_var_": f"model_{i}", "_target_": "grault", "a": [0] * 1000},
+            head={"_var_": f"model_{i}.a"},
+        )
+        refs.append(weakref.ref(res["model"]))
+    del res
+    gc.collect()
+
+    assert len(r.variables) == 0
+    assert sum(ref() is not None for ref in refs) == 0
+
+
+def test_get_from_params_vars_store():
+    r = Registry(persist_vars=True, vars_store=VarStore(maxsize=2))
+    r.add(module.grault)
+
+    for i in range(3):
+        r.get_from_params(**{"_var_": f"model_{i}", "_target_": "grault", "a": i})
+    assert list(r.variables) == ["model_1", "model_2"]
+    assert r.get_from_params(a={"_var_": "model_2.a"}) == {"a": 2}
+
+
+def test_get_from_params_vars_store_evicts_after_build():
+    r = Registry(persist_vars=True, vars_store=VarStore(maxsize=2))
+    r.add(module.grault)
+    config = {
+        **{k: {"_var_": k, "_target_": "grault", "a": k} for k in ("a", "b", "c")},
+        "ref": {"_var_": "a"},
+    }
+
+    res = r.get_from_params(**config)
+    assert res["ref"] is res["a"]
+    assert list(r.variables) == ["b", "c"]
+
+    r.variables.clear()
+    res = r.compile(config)()
+    assert res["ref"] is res["a"]
+    assert list(r.variables) == ["b", "c"]
+
+    # aliases of the failed build are not stored
+    r.variables.clear()
+    with pytest.raises(Exception):
+        r.get_from_params(**config, fail={"_target_": "missing"})
+    assert len(r.variables) == 0
+
+
 def test_all_magic_method():
     r = Registry()
 
@@ -0,0 +1,75 @@
+# flake8: noqa
+import pydoc
+import subprocess
+import sys
+
+import pytest
+
+from hydra_slayer.resolver import locate
+from . import foobar
+
+# `python -X importtime` budget for `import hydra_slayer` (cumulative, in microseconds),
+# it is deliberately generous to stay stable on slow CI runners
+IMPORT_TIME_BUDGET_US = 150_000
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "int",
+        "len",
+        "collections",
+        "collections.abc.Mapping",
+        "collections.OrderedDict.fromkeys",
+        "tests.foobar",
+        "tests.foobar.foo",
+        "tests.foobar.grault.garply",
+        "tests.foobar.corge",
+        "tests.foobar.grault.corge",
+        "no_such_module.foo",
+        "no_such_builtin",
+    ],
+)
+def test_locate_same_as_pydoc(path):
+    assert locate(path) == pydoc.locate(path)
+
+
+def test_locate():
+    assert locate("int") is int
+    assert locate("tests.foobar.foo") is foobar.foo
+    assert locate("tests.foobar.grault.garply") is foobar.grault.garply
+    assert locate("tests.foobar.corge") is None
+
+
+def test_locate_propagates_import_errors():
+    with pytest.raises(ImportError, match="hydra_slayer_missing_dependency"):
+        locate("tests.broken_module.foo")
+
+
+def _run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_does_not_load_heavy_modules():
+    code = "import sys, hydra_slayer; print(' '.join(sorted(sys.modules)))"
+    modules = set(_run_python(code).stdout.split())
+
+    assert "hydra_slayer" in modules
+    assert not {"pydoc", "inspect", "sysconfig", "platform"} & modules
+
+
+def test_import_time_budget():
+    stderr = _run_python("import hydra_slayer", "-X", "importtime").stderr
+
+    # lines look like `import time:  self [us] | cumulative | imported package`
+    cumulative = {
+        line.split("|")[2].strip(): int(line.split("|")[1])
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+    assert cumulative["hydra_slayer"] < IMPORT_TIME_BUDGET_US
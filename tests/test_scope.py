@@ -0,0 +1,183 @@
+# flake8: noqa
+import asyncio
+import threading
+import time
+
+import pytest
+
+from hydra_slayer.registry import Registry
+from hydra_slayer.scope import ScopeCache
+from . import foobar
+
+
+class _Client:
+    def __init__(self, url, options=None, delay=0.0):
+        calls.append(url)
+        time.sleep(delay)
+        self.url = url
+        self.options = options
+
+
+calls = []
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    calls.clear()
+
+
+def _registry(**kwargs) -> Registry:
+    r = Registry()
+    r.add(_Client, name="client", **kwargs)
+    return r
+
+
+def test_singleton_scope():
+    r = _registry()
+
+    config = {"_target_": "client", "_scope_": "singleton", "url": "db", "options": {"a": [1]}}
+    client = r.get_from_params(**config)
+    # the same arguments in other order
+    same = r.get_from_params(options={"a": [1]}, _scope_="singleton", url="db", _target_="client")
+    assert same is client and calls == ["db"]
+
+    assert r.get_from_params(**{**config, "options": {"a": [True]}}) is not client
+    assert r.get_from_params(**{**config, "_scope_": "prototype"}) is not client
+    assert r.get_instance("client", url="db", options={"a": [1]}, _scope_="singleton") is client
+    assert len(r.scopes) == 2 and client in r.scopes
+    assert r.scopes.info().hits == 2
+
+
+def test_factory_scope():
+    r = _registry(scope="singleton")
+
+    res = r.get_from_params(
+        a={"_target_": "client", "url": "db"},
+        b={"_target_": "client", "url": "db"},
+        c={"_target_": "client", "url": "db", "_scope_": "prototype"},
+    )
+    assert res["a"] is res["b"] and res["c"] is not res["a"]
+    assert calls == ["db", "db"]
+
+    with pytest.raises(ValueError):
+        r.add(foobar.foo, scope="session")
+    assert "foo" not in r
+
+
+def test_scopes_with_plan_and_lazy_build():
+    r = _registry(scope="singleton")
+    config = {"a": {"_target_": "client", "url": "db"}, "b": {"_target_": "client", "url": "db"}}
+
+    res = r.get_from_params(**config, max_workers=2)
+    assert res["a"] is res["b"] and r.compile(config)()["a"] is res["a"]
+    assert r.get_from_params(**config, lazy=True)["a"].url == "db"
+    assert calls == ["db"]
+
+
+def test_singleton_with_nested_children():
+    r = _registry()
+    r.add(foobar.grault)
+    config = {
+        "_target_": "client",
+        "_scope_": "singleton",
+        "url": "db",
+        "options": {"_target_": "grault", "a": {"_target_": "client", "url": "child"}},
+    }
+
+    clients = [r.get_from_params(**config) for _ in range(5)]
+    # children are built once, with the singleton
+    assert all(client is clients[0] for client in clients) and calls == ["child", "db"]
+    assert len(r.scopes) == 1 and r.scopes.info().hits == 4
+
+    # plans are keyed by the same config subtree, but build the children
+    assert r.get_from_params(**config, max_workers=2) is clients[0]
+    assert r.compile(config)() is clients[0] and r.compile(config)() is clients[0]
+    assert len(r.scopes) == 1 and calls == ["child", "db"] + ["child"] * 3
+
+    # children with aliases might be other objects, so they are compared by identity
+    with_alias = {**config, "options": {"_var_": "options", "_target_": "grault"}}
+    assert r.get_from_params(**with_alias) is not r.get_from_params(**with_alias)
+
+    assert r.scopes.evict(clients[0])
+    assert r.get_from_params(**config) is not clients[0]
+
+
+def test_thread_scope():
+    r = _registry(scope="thread")
+    config = {"_target_": "client", "url": "db"}
+    results = []
+
+    def _build():
+        results.append((r.get_from_params(**config), r.get_from_params(**config)))
+
+    threads = [threading.Thread(target=_build) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(first is second for first, second in results)
+    assert len({id(first) for first, _ in results}) == 3
+
+
+def test_singleton_is_created_once_by_concurrent_threads():
+    r = _registry(scope="singleton")
+    results = []
+
+    def _build():
+        results.append(r.get_from_params(_target_="client", url="db", delay=0.05))
+
+    threads = [threading.Thread(target=_build) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["db"] and all(res is results[0] for res in results)
+
+
+def test_evict_and_dispose():
+    disposed = []
+    r = _registry()
+    r.scopes.dispose = lambda obj: disposed.append(("default", obj.url))
+    r.add(foobar.grault, scope="singleton")
+    r.scopes.set_scope(foobar.grault, "singleton", dispose=lambda obj: disposed.append(obj.a))
+
+    client = r.get_from_params(_target_="client", url="db", _scope_="singleton")
+    grault = r.get_from_params(_target_="grault", a="cache")
+    assert r.scopes.evict(client) and not r.scopes.evict(client)
+    assert disposed == [("default", "db")]
+    assert r.get_from_params(_target_="client", url="db", _scope_="singleton") is not client
+
+    assert r.scopes.clear() == 2 and len(r.scopes) == 0
+    assert sorted(map(str, disposed)) == ["('default', 'db')", "('default', 'db')", "cache"]
+    assert r.get_from_params(_target_="grault", a="cache") is not grault
+
+
+def test_clear_thread():
+    cache = ScopeCache()
+    cache.set_scope(_Client, "thread")
+    main = cache.call(_Client, (), {"url": "main"})
+    other = []
+
+    def _build():
+        other.append(cache.call(_Client, (), {"url": "other"}))
+        assert cache.clear_thread() == 1
+
+    thread = threading.Thread(target=_build)
+    thread.start()
+    thread.join()
+    assert len(cache) == 1 and main in cache and other[0] not in cache
+
+
+def test_fail_scopes():
+    r = _registry()
+    with pytest.raises(RuntimeError, match="client"):
+        r.get_from_params(_target_="client", url="db", _scope_="session")
+
+    r.add(foobar.plugh, scope="singleton")
+    with pytest.raises(RuntimeError, match="plugh"):
+        r.get_from_params(_target_="plugh", _mode_="call", callback=print)
+    # coroutine functions can be awaited in prototype scope
+    config = {"_target_": "plugh", "_mode_": "call", "_scope_": "prototype", "a": 1}
+    assert asyncio.run(r.get_from_params(**config, callback=lambda _: None)) == 1
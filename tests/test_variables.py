@@ -0,0 +1,33 @@
+# flake8: noqa
+import gc
+import weakref
+
+from hydra_slayer.variables import VarStore
+from . import foobar
+
+
+def test_var_store_lru():
+    store = VarStore(maxsize=2)
+    store["a"], store["b"] = 1, 2
+    assert store["a"] == 1
+    store["c"] = 3
+
+    # `b` is the least recently used alias
+    assert list(store) == ["a", "c"] and "b" not in store and len(store) == 2
+    del store["a"]
+    store.clear()
+    assert len(store) == 0
+
+
+def test_var_store_weak():
+    store = VarStore(weak=True)
+    obj = foobar.grault(a=1)
+    ref = weakref.ref(obj)
+    store["obj"], store["dict"], store["ref"] = obj, {"a": 1}, ref
+
+    assert store["obj"] is obj and store["ref"] is ref
+    del obj
+    gc.collect()
+    assert "obj" not in store and list(store) == ["dict", "ref"]
+    # objects which can't be referenced weakly are kept
+    assert store["dict"] == {"a": 1}